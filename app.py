@@ -1,16 +1,31 @@
+import os
+import time
+from pathlib import Path
+
 import streamlit as st
-import pandas as pd
-import plotly.express as px
-import pydeck as pdk
-
-from spots import SURF_SPOTS
-from weather_api import get_current_by_coords, geocode_city, WeatherAPIError
-from marine_api import get_marine_hourly, MarineAPIError
-from scoring import add_scores, best_hours
-from utils import israel_time_now, time_from_utc_offset, deg_to_compass, wind_relation_to_beach
+
+import http_client
+import metrics
+from catalog import SpotCatalog
+from weather_api import WeatherAPIError
+from marine_api import MarineAPIError
+from scoring import score_forecast, best_hours_forecast, best_sessions_forecast
+from forecast import CompactForecast
+from utils import israel_time_now, time_from_utc_offset, deg_to_compass
 from favorites import load_favorites, toggle_favorite
-from extras_api import get_extras, ExtrasAPIError
-from surfers_api import build_top_surfers, get_wiki_summary, SurferAPIError
+from extras_api import ExtrasAPIError
+from fetcher import fetch_spot
+from disk_cache import ForecastCache
+from memory_cache import BoundedCache, coord_key
+from spatial import SpotIndex
+from geocoder import Geocoder
+from charts import forecast_figure
+from pipeline import Pipeline
+from leaderboard import Leaderboard, fetch_marine_with_timestamps
+from spot_map import CLUSTER_THRESHOLD, SpotMapData, build_deck
+from quota import QuotaManager, quota_manager
+from timeline import Timeline
+from surfers_api import SurferAPIError, build_top_surfers, fetch_surfer_cards, WIKI_CACHE_FILE
 
 
 # -----------------------------
@@ -25,10 +40,12 @@ API_KEY = st.secrets["api_key"]
 # Sidebar (simple)
 # -----------------------------
 st.sidebar.header("Controls")
-mode = st.sidebar.radio("Choose", ["Surf Spots (Map)", "City Search"], index=0)
+mode = st.sidebar.radio("Choose", ["Surf Spots (Map)", "Leaderboard", "City Search"], index=0)
 units = st.sidebar.selectbox("Units", ["metric", "imperial"], index=0)
 level = st.sidebar.selectbox("Surf level", ["Beginner", "Intermediate", "Advanced"], index=1)
 
+debug = st.sidebar.checkbox("🐞 Debug timings", value=False)
+
 st.sidebar.divider()
 st.sidebar.caption(f"🇮🇱 Israel time now: {israel_time_now()}")
 
@@ -36,53 +53,199 @@ st.sidebar.caption(f"🇮🇱 Israel time now: {israel_time_now()}")
 # -----------------------------
 # Helpers
 # -----------------------------
-def marine_to_df(marine_json: dict, beach_facing_deg: float) -> pd.DataFrame:
-    h = marine_json.get("hourly", {})
-    df = pd.DataFrame(
-        {
-            "time": pd.to_datetime(h.get("time", [])),
-            "wave_height": h.get("wave_height", []),
-            "wave_period": h.get("wave_period", []),
-            "wave_dir_deg": h.get("wave_direction", []),
-            "wind_speed": h.get("wind_speed_10m", []),
-            "wind_dir_deg": h.get("wind_direction_10m", []),
-        }
-    )
-    if df.empty:
-        return df
+@st.cache_resource
+def get_forecast_cache() -> ForecastCache:
+    return ForecastCache()
+
+
+def get_quota() -> QuotaManager:
+    # One budget per API key across sessions; current weather is shared per ~11 km cell
+    return quota_manager(API_KEY, store=get_forecast_cache())
+
+
+# Longer series are LTTB-downsampled to this many points per chart row
+CHART_POINT_BUDGET = 500
+
+# Batch results (main.py output) used to color the map by surf score
+SCORES_PATH_ENV = "SURF_SCORES_PATH"
+
+# Nearby coordinates (e.g. repeated city searches) share one cached fetch
+FETCH_GRID_DEG = 0.01
+
+
+@st.cache_resource
+def get_fetch_cache() -> BoundedCache:
+    return BoundedCache(max_entries=200, max_bytes=64 * 1024 * 1024, policy="lru", ttl=600)
+
+
+@st.cache_resource
+def get_stage_cache() -> BoundedCache:
+    # Derived stages; keys include the fetch time, so fresh data never reuses old results
+    return BoundedCache(max_entries=500, max_bytes=128 * 1024 * 1024, policy="lru")
+
+
+def fetch_all(pipe: Pipeline, lat: float, lon: float, units: str, beach_facing_deg: float):
+    """
+    Fetch + parse stages: (current, marine CompactForecast, extras, timings, fetched_at).
+    Only the parsed result is kept in memory (marine in its compact typed form);
+    raw payloads live in the disk cache.
+    """
+    key = coord_key(lat, lon, units, beach_facing_deg, grid=FETCH_GRID_DEG)
+
+    def compute():
+        current, marine, extras, timings = pipe.run(
+            "fetch",
+            lambda: fetch_spot(key[0], key[1], API_KEY, units=units, cache=get_forecast_cache(), quota=get_quota()),
+        )
+        marine_fc = CompactForecast.from_marine_json(marine, beach_facing_deg)
+        return current, marine_fc, extras, timings, time.time()
 
-    df["wave_dir"] = df["wave_dir_deg"].apply(lambda d: deg_to_compass(float(d)) if d is not None else "")
-    df["wind_dir"] = df["wind_dir_deg"].apply(lambda d: deg_to_compass(float(d)) if d is not None else "")
+    return pipe.stage("parse", key, compute, cache=get_fetch_cache())
 
-    def _rel(d):
-        if d is None:
-            return ("", "")
-        rel, color = wind_relation_to_beach(float(d), beach_facing_deg)
-        return rel, color
 
-    rels = df["wind_dir_deg"].apply(_rel)
-    df["wind_relation"] = rels.apply(lambda t: t[0])
-    df["wind_relation_color"] = rels.apply(lambda t: t[1])
+@st.cache_resource
+def get_catalog() -> SpotCatalog:
+    return SpotCatalog.default()
 
-    return df
+
+@st.cache_resource
+def get_geocoder() -> Geocoder:
+    return Geocoder.default(API_KEY, quota=get_quota())
+
+
+@st.cache_resource
+def get_spot_index() -> SpotIndex:
+    return SpotIndex(get_catalog().spots())
+
+
+@st.cache_resource
+def get_map_data(country: str | None = None) -> SpotMapData:
+    # Positions and JSON-ready records are built once per catalog (or country shard), not per
+    # rerun. A sharded catalog only maps the chosen country, so no other shard is read.
+    return SpotMapData(get_catalog().spots(country))
 
 
 @st.cache_data(ttl=600)
-def fetch_all(lat: float, lon: float, units: str):
-    current = get_current_by_coords(lat, lon, API_KEY, units=units)
-    marine = get_marine_hourly(lat, lon)
-    extras = get_extras(lat, lon)
-    return current, marine, extras
+def get_batch_scores(path: str, mtime: float, level: str) -> dict[str, float]:
+    # mtime is part of the cache key: a rewritten results file is picked up on the next run
+    from batch import best_scores, read_results
+
+    return best_scores(read_results(path), level)
+
+
+@st.cache_resource
+def get_leaderboard() -> Leaderboard:
+    # Shared across sessions: results and the worker pool outlive a rerun
+    return Leaderboard()
+
 
+def batch_scores_path() -> Path | None:
+    path = os.environ.get(SCORES_PATH_ENV)
+    return Path(path) if path and Path(path).exists() else None
 
-def spot_names_favorites_first() -> list[str]:
-    all_names = [s["name"] for s in SURF_SPOTS]
+
+def score_frame(marine_fc: CompactForecast, df_base, level: str):
+    scores = score_forecast(marine_fc, level=level)
+    return scores, df_base.assign(surf_score=scores)
+
+
+def render_charts(pipe: Pipeline, score_key, df_scored) -> None:
+    # plotly is only imported (inside charts.py) when the Charts view is open
+    with metrics.timed("render.chart"):
+        fig = pipe.stage(
+            "chart", (score_key, CHART_POINT_BUDGET), lambda: forecast_figure(df_scored, budget=CHART_POINT_BUDGET)
+        )
+        st.plotly_chart(fig, use_container_width=True)
+
+
+def spot_names_favorites_first(country: str | None = None) -> list[str]:
+    all_names = get_catalog().names(country)
+    known = set(all_names)
     favs = load_favorites()
-    fav_first = [n for n in favs if n in all_names]
-    rest = [n for n in all_names if n not in fav_first]
+    fav_first = [n for n in favs if n in known]
+    fav_set = set(fav_first)
+    rest = [n for n in all_names if n not in fav_set]
     return fav_first + rest
 
 
+# Stage results are shared; this run's log shows what ran vs. was reused
+pipe = Pipeline(get_stage_cache())
+metrics_run = metrics.start_run()
+
+
+# -----------------------------
+# Debug panel + metrics export (this run)
+# -----------------------------
+def finish_run() -> None:
+    """
+    Debug panel + metrics export for this run. Runs at the end of the script and
+    before every stop(), so early exits are exported too.
+    """
+    cache_stats = get_forecast_cache().stats()
+    mem_stats = get_fetch_cache().stats()
+    stage_stats = get_stage_cache().stats()
+    http_stats = http_client.get_stats()
+    quota_stats = get_quota().report()
+    geo_stats = get_geocoder().stats()
+    ratios = {
+        "disk_cache_hit_ratio": metrics.hit_ratio(
+            cache_stats["hits"] + cache_stats["stale"], cache_stats["misses"] + cache_stats["expired"]
+        ),
+        "fetch_cache_hit_ratio": metrics.hit_ratio(mem_stats["hits"], mem_stats["misses"]),
+        "stage_cache_hit_ratio": metrics.hit_ratio(stage_stats["hits"], stage_stats["misses"]),
+        "geocode_hit_ratio": geo_stats["hit_rate"],
+    }
+    for name, value in ratios.items():
+        metrics.set_gauge(name, value)
+    metrics.set_gauge("openweather_calls_today", quota_stats["calls_today"])
+    metrics.set_gauge("openweather_calls_saved", quota_stats["calls_saved"])
+    metrics.set_gauge("geocode_lookups", geo_stats["lookups"])
+    metrics.set_gauge("geocode_p50_ms", geo_stats["p50_ms"])
+    metrics.set_gauge("geocode_p99_ms", geo_stats["p99_ms"])
+    metrics.export()
+
+    if debug:
+        with st.sidebar.expander("🐞 This run", expanded=True):
+            st.dataframe(metrics.run_breakdown(metrics_run), use_container_width=True)
+            st.caption(" • ".join(f"{name.replace('_', ' ')}: {value:.0%}" for name, value in ratios.items()))
+            st.caption(
+                f"💾 Disk cache: {cache_stats['hits']} hits • {cache_stats['stale']} stale • "
+                f"{cache_stats['misses']} misses • {cache_stats['expired']} too old to serve • "
+                f"{cache_stats['bytes'] / 1024:.0f} KB"
+            )
+            st.caption(
+                f"🧠 Memory cache: {mem_stats['entries']}/{mem_stats['max_entries']} entries • "
+                f"{mem_stats['bytes'] / 1024:.0f} KB • {mem_stats['evictions']} evictions"
+            )
+            st.caption(
+                f"🧩 Stage cache: {stage_stats['entries']}/{stage_stats['max_entries']} entries • "
+                f"{stage_stats['bytes'] / 1024:.0f}/{stage_stats['max_bytes'] / 1024:.0f} KB • "
+                f"{stage_stats['evictions']} evictions"
+            )
+            st.caption(
+                f"🛡️ HTTP: {http_stats['requests']} requests • {http_stats['retries']} retries • "
+                f"{http_stats['short_circuits']} short-circuits • {http_stats['coalesced']} coalesced"
+            )
+            st.caption(
+                f"🎫 OpenWeather: {quota_stats['calls_today']}/{quota_stats['per_day']} today • "
+                f"{quota_stats['calls_last_minute']}/{quota_stats['per_minute']} last minute • "
+                f"{quota_stats['calls_saved']} calls saved ({quota_stats['cells']} cells for "
+                f"{quota_stats['coordinates']} locations, {quota_stats['degraded']} served stale)"
+            )
+            st.caption(
+                f"🔎 Geocoding: {geo_stats['lookups']} lookups • {geo_stats['gazetteer_hits']} gazetteer • "
+                f"{geo_stats['cache_hits']} cached • {geo_stats['api_calls']} API • "
+                f"p50 {geo_stats['p50_ms']:.2f} ms • p99 {geo_stats['p99_ms']:.2f} ms"
+            )
+            st.markdown("**Pipeline stages**")
+            st.dataframe(pipe.report(), use_container_width=True)
+
+
+def stop() -> None:
+    finish_run()
+    st.stop()
+
+
 # -----------------------------
 # Selection (spot or city)
 # -----------------------------
@@ -93,13 +256,19 @@ beach_facing_deg = 270
 if mode == "Surf Spots (Map)":
     st.subheader("🏖️ Choose a surf spot")
 
-    spot_names = spot_names_favorites_first()
+    catalog = get_catalog()
+    country = None
+    if catalog.sharded:
+        # Only the chosen country's shard is read
+        country = st.selectbox("Country", catalog.countries(), index=0)
+
+    spot_names = spot_names_favorites_first(country)
     if not spot_names:
-        st.error("No surf spots found in spots.py")
-        st.stop()
+        st.error("No surf spots found in the spot catalog")
+        stop()
 
     selected_name = st.selectbox("Spot (favorites first)", spot_names, index=0)
-    chosen = next(s for s in SURF_SPOTS if s["name"] == selected_name)
+    chosen = catalog.get(selected_name, country)
     lat, lon = chosen["lat"], chosen["lon"]
     beach_facing_deg = chosen.get("beach_facing_deg", 270)
 
@@ -112,59 +281,77 @@ if mode == "Surf Spots (Map)":
         st.caption("Favorites are stored locally in favorites.json (may reset on Streamlit Cloud).")
 
     # --- ONE MAP ONLY (favorites as golden dots) ---
-    df_map = pd.DataFrame(SURF_SPOTS)
-    favs = load_favorites()
-
-    df_map["is_selected"] = df_map["name"].eq(selected_name)
-    df_map["is_fav"] = df_map["name"].isin(favs)
-
-    df_map["base_color"] = df_map["is_selected"].apply(
-        lambda x: [255, 0, 0, 220] if x else [0, 120, 255, 170]
-    )
-    df_fav = df_map[df_map["is_fav"]].copy()
-
-    layer_all = pdk.Layer(
-        "ScatterplotLayer",
-        data=df_map,
-        get_position="[lon, lat]",
-        get_radius=260,
-        get_fill_color="base_color",
-        get_line_color="[255,255,255]",
-        line_width_min_pixels=1,
-        pickable=True,
+    favs = tuple(load_favorites())
+    map_data = get_map_data(country)
+    scores_path = batch_scores_path()
+    board = get_leaderboard()
+    m1, m2 = st.columns(2)
+    cluster = m1.checkbox("Cluster distant spots", value=len(map_data) > CLUSTER_THRESHOLD)
+    color_by_score = m2.checkbox(
+        "Color by surf score", value=False, disabled=scores_path is None and not len(board),
+        help=f"Uses the leaderboard once it has run, else batch results (python main.py -o results.json) from ${SCORES_PATH_ENV}",
     )
-
-    layer_favs = pdk.Layer(
-        "ScatterplotLayer",
-        data=df_fav,
-        get_position="[lon, lat]",
-        get_radius=330,
-        get_fill_color="[255, 215, 0, 220]",  # gold
-        get_line_color="[255,255,255]",
-        line_width_min_pixels=1,
-        pickable=False,
+    score_src = None
+    if color_by_score and len(board):
+        score_src = ("leaderboard", board.version, level)
+    elif color_by_score and scores_path is not None:
+        score_src = (str(scores_path), scores_path.stat().st_mtime, level)
+
+    def render_map():
+        scores = None
+        if score_src and score_src[0] == "leaderboard":
+            scores = map_data.score_array(board.scores(level))
+        elif score_src:
+            scores = map_data.score_array(get_batch_scores(*score_src))
+        return build_deck(map_data, selected_name, favs, lat, lon, cluster=cluster, scores=scores)
+
+    with metrics.timed("render.map"):
+        st.pydeck_chart(pipe.stage("map", (country, selected_name, favs, lat, lon, cluster, score_src), render_map))
+    if score_src:
+        st.caption("🗺️ Map legend: 🔴 Selected • 🟡 Favorite • 🟥→🟩 best upcoming score")
+    else:
+        st.caption("🗺️ Map legend: 🔴 Selected • 🟡 Favorite • 🔵 Other")
+
+elif mode == "Leaderboard":
+    st.subheader(f"🏆 Leaderboard — best upcoming score ({level})")
+
+    catalog = get_catalog()
+    all_spots = catalog.spots()
+    board = get_leaderboard()
+    with st.spinner("Scoring every spot..."):
+        with metrics.timed("app.leaderboard"):
+            payloads = fetch_marine_with_timestamps(all_spots, get_forecast_cache())
+            update = board.update(all_spots, payloads)
+
+    table = board.table(level, all_spots)
+    if table.empty:
+        st.error("No marine data could be fetched for the spot catalog.")
+        stop()
+    st.dataframe(table, use_container_width=True, hide_index=True)
+    st.caption(
+        f"♻️ {update['scored']} spots re-scored in {update['score_s'] * 1000:.0f} ms • "
+        f"{update['reused']} reused (forecast unchanged, best hour still ahead)"
+        + (f" • {update['missing']} without data" if update["missing"] else "")
     )
 
-    view_state = pdk.ViewState(latitude=lat, longitude=lon, zoom=9)
-    st.pydeck_chart(
-        pdk.Deck(
-            layers=[layer_all, layer_favs],
-            initial_view_state=view_state,
-            tooltip={"text": "{name}"},
-        )
-    )
-    st.caption("🗺️ Map legend: 🔴 Selected • 🟡 Favorite • 🔵 Other")
+    selected_name = st.selectbox("Show details for", table["spot"].tolist(), index=0)
+    chosen = catalog.get(selected_name)
+    lat, lon = chosen["lat"], chosen["lon"]
+    beach_facing_deg = chosen.get("beach_facing_deg", 270)
 
 else:
     st.subheader("🌍 Search by city (auto-lat/lon)")
 
     city = st.text_input("City", value="Tel Aviv")
+    suggestions = get_geocoder().suggest(city, limit=5)
+    if suggestions:
+        st.caption("🔎 " + " • ".join(f"{p['name']}, {p['country']}" for p in suggestions))
     if st.button("Find city"):
         try:
-            matches = geocode_city(city.strip(), API_KEY, limit=5)
+            matches = get_geocoder().geocode(city.strip(), limit=5)
             if not matches:
                 st.error("No matches found. Try a different spelling.")
-                st.stop()
+                stop()
 
             options = [
                 f"{m.get('name')}, {m.get('state','')} {m.get('country')} (lat={m['lat']:.2f}, lon={m['lon']:.2f})"
@@ -177,16 +364,23 @@ else:
             lat, lon = m["lat"], m["lon"]
 
             st.success(f"Selected: {selected_name}")
+
+            nearby = get_spot_index().nearest(lat, lon, k=3, radius_km=150)
+            if nearby:
+                st.caption(
+                    "🏄 Nearby surf spots: "
+                    + " • ".join(f"{s['name']} ({s['distance_km']:.0f} km)" for s in nearby)
+                )
             st.caption("Tip: For surf scoring, use Surf Spots mode (it includes beach facing direction).")
 
         except Exception as e:
             st.error("Geocoding failed.")
             st.caption(str(e))
-            st.stop()
+            stop()
 
 if lat is None or lon is None:
     st.info("Select a surf spot or search a city to load data.")
-    st.stop()
+    stop()
 
 
 # -----------------------------
@@ -194,32 +388,51 @@ if lat is None or lon is None:
 # -----------------------------
 try:
     with st.spinner("Fetching weather + marine + extras..."):
-        current, marine, extras = fetch_all(lat, lon, units)
+        with metrics.timed("app.fetch_all"):
+            current, marine_fc, extras, fetch_timings, fetched_at = fetch_all(pipe, lat, lon, units, beach_facing_deg)
 except WeatherAPIError as e:
     st.error(f"OpenWeather error: {e}")
-    st.stop()
+    stop()
 except MarineAPIError as e:
     st.error(f"Marine API error: {e}")
-    st.stop()
+    stop()
 except ExtrasAPIError as e:
     st.error(f"Extras API error: {e}")
-    st.stop()
+    stop()
 except Exception as e:
     st.error("Unexpected error")
     st.caption(str(e))
-    st.stop()
+    stop()
+
+st.sidebar.caption(
+    "⏱️ Fetch: "
+    + " • ".join(f"{name} {secs * 1000:.0f} ms" for name, secs in fetch_timings.items())
+)
+
+
+if get_quota().near_exhaustion():
+    st.warning("OpenWeather call budget is nearly used up: showing cached weather where available.")
 
 
 # -----------------------------
 # Marine + scoring (MOVED UP so marine_wind_now exists before UI uses it)
 # -----------------------------
-df_marine = marine_to_df(marine, beach_facing_deg)
-if df_marine.empty:
+if len(marine_fc) == 0:
     st.warning("No marine data available for this location.")
-    st.stop()
+    stop()
+
+# Each stage key carries everything it depends on: changing level re-runs score/rank only
+data_key = (coord_key(lat, lon, units, beach_facing_deg, grid=FETCH_GRID_DEG), fetched_at)
+score_key = (data_key, level)
 
-df_scored = add_scores(df_marine, level=level)
-marine_wind_now = df_scored.iloc[0]["wind_speed"] if not df_scored.empty else "—"
+# Marine, extras and the current observation on one tz-aware hourly index; "now" is a binary search
+timeline = pipe.stage("derive", data_key, lambda: Timeline.build(marine_fc, extras, current))
+df_base = timeline.frame
+scores, df_scored = pipe.stage("score", score_key, lambda: score_frame(marine_fc, df_base, level))
+now_row = timeline.now_position()
+marine_wind_now = timeline.value("wind_speed")
+if marine_wind_now is None:
+    marine_wind_now = "—"
 
 
 # -----------------------------
@@ -242,18 +455,16 @@ icon = current["weather"][0]["icon"]
 wind_speed_now = current["wind"]["speed"]
 wind_dir_now = deg_to_compass(current["wind"].get("deg", 0))
 
-daily = extras.get("daily", {})
-hourly = extras.get("hourly", {})
+sunrise, sunset = timeline.sun()
+sunrise = sunrise or "—"
+sunset = sunset or "—"
 
-sunrise = (daily.get("sunrise") or ["—"])[0]
-sunset = (daily.get("sunset") or ["—"])[0]
-
-uv_now = (hourly.get("uv_index") or [None])[0]
-rad_now = (hourly.get("shortwave_radiation") or [None])[0]  # W/m²
-vis_now = (hourly.get("visibility") or [None])[0]  # meters
-cloud_now = (hourly.get("cloud_cover") or [None])[0]  # %
-prec_now = (hourly.get("precipitation") or [None])[0]  # mm
-t2m_now = (hourly.get("temperature_2m") or [None])[0]  # °C
+uv_now = timeline.value("uv_index")
+rad_now = timeline.value("shortwave_radiation")  # W/m²
+vis_now = timeline.value("visibility")  # meters
+cloud_now = timeline.value("cloud_cover")  # %
+prec_now = timeline.value("precipitation")  # mm
+t2m_now = timeline.value("temperature_2m")  # °C
 
 r1 = st.columns(7)
 r1[0].image(f"https://openweathermap.org/img/wn/{icon}@2x.png", width=70)
@@ -266,46 +477,52 @@ r1[5].metric("🧭 Wind dir", f"{wind_dir_now}")
 r1[6].metric("🌬️ Marine wind", f"{marine_wind_now} {wind_sym}" if marine_wind_now != "—" else "—")
 
 r2 = st.columns(6)
-r2[0].metric("📏 2m Temp", f"{t2m_now}°C" if t2m_now is not None else "—")
-r2[1].metric("☀️ UV", f"{uv_now}" if uv_now is not None else "—")
-r2[2].metric("🔆 Radiation", f"{rad_now} W/m²" if rad_now is not None else "—")
+r2[0].metric("📏 2m Temp", f"{t2m_now:g}°C" if t2m_now is not None else "—")
+r2[1].metric("☀️ UV", f"{uv_now:g}" if uv_now is not None else "—")
+r2[2].metric("🔆 Radiation", f"{rad_now:g} W/m²" if rad_now is not None else "—")
 r2[3].metric("👀 Visibility", f"{int(vis_now / 1000)} km" if vis_now is not None else "—")
-r2[4].metric("☁️ Cloud", f"{cloud_now}%" if cloud_now is not None else "—")
-r2[5].metric("🌧️ Precip", f"{prec_now} mm" if prec_now is not None else "—")
+r2[4].metric("☁️ Cloud", f"{cloud_now:g}%" if cloud_now is not None else "—")
+r2[5].metric("🌧️ Precip", f"{prec_now:g} mm" if prec_now is not None else "—")
 
 st.caption(f"🌅 Sunrise: {sunrise}   |   🌇 Sunset: {sunset}")
 
 
 # -----------------------------
-# Tabs
+# Views (only the selected one runs, so charts cost nothing until opened)
 # -----------------------------
-tab1, tab2, tab3 = st.tabs(["🏄 Best Hours", "📈 Charts", "📋 Tables"])
+view = st.radio(
+    "View", ["🏄 Best Hours", "📈 Charts", "📋 Tables"], horizontal=True, label_visibility="collapsed"
+)
 
-with tab1:
+if view == "🏄 Best Hours":
     st.subheader(f"✅ Recommended hours (level: {level})")
-    st.dataframe(best_hours(df_scored, top_n=6), use_container_width=True)
+    st.dataframe(pipe.stage("rank", (score_key, 6), lambda: best_hours_forecast(marine_fc, scores, top_n=6)), use_container_width=True)
     st.markdown("**Wind relation:** 🟢 Offshore • 🟡 Cross • 🔴 Onshore")
 
-with tab2:
-    cA, cB = st.columns(2)
-    with cA:
-        st.plotly_chart(px.line(df_scored, x="time", y="wave_height", title="🌊 Wave height (m)"),
-                        use_container_width=True)
-    with cB:
-        st.plotly_chart(px.line(df_scored, x="time", y="wave_period", title="⏱️ Wave period (s)"),
-                        use_container_width=True)
-
-    cC, cD = st.columns(2)
-    with cC:
-        st.plotly_chart(px.line(df_scored, x="time", y="wind_speed", title="💨 Wind speed (hourly)"),
-                        use_container_width=True)
-    with cD:
-        st.plotly_chart(px.line(df_scored, x="time", y="surf_score", title="🏄 Surf score (0-100)"),
-                        use_container_width=True)
-
-with tab3:
-    show = df_scored.head(48).copy()
-    show["relation"] = show["wind_relation_color"] + " " + show["wind_relation"]
+    st.subheader("🌊 Best sessions")
+    s1, s2, s3 = st.columns(3)
+    session_hours = s1.slider("Session length (hours)", 2, 4, 3)
+    session_agg = s2.radio("Rank by", ["mean", "min"], horizontal=True, help="Average hour, or the worst hour of the session")
+    daylight_only = s3.checkbox("Daylight only", value=True)
+
+    def rank_sessions():
+        daylight = timeline.frame["daylight"].to_numpy() if daylight_only else None
+        return best_sessions_forecast(marine_fc, scores, session_hours, top_n=3, agg=session_agg, daylight=daylight)
+
+    sessions = pipe.stage("sessions", (score_key, session_hours, session_agg, daylight_only), rank_sessions)
+    if sessions.empty:
+        st.caption("No session of that length fits the forecast window.")
+    else:
+        st.dataframe(sessions, use_container_width=True)
+
+elif view == "📈 Charts":
+    render_charts(pipe, score_key, df_scored)
+
+else:
+    # The next 48 hours from now (the forecast starts at local midnight)
+    start = now_row or 0
+    show = df_scored.iloc[start:start + 48].copy()
+    show["relation"] = show["wind_relation_color"].astype(str) + " " + show["wind_relation"].astype(str)
     st.dataframe(show, use_container_width=True)
 
 
@@ -316,43 +533,45 @@ st.divider()
 st.subheader("🏆 Surf Legends (extra) — powered by Wikipedia")
 
 
-@st.cache_data(ttl=86400)
+@st.cache_resource
+def get_wiki_cache() -> ForecastCache:
+    return ForecastCache(WIKI_CACHE_FILE)
+
+
+# Short TTL is cheap: unchanged pages revalidate with a 304 (ETag)
+@st.cache_data(ttl=3600)
 def fetch_surfers_cards():
-    cards = []
-    for s in build_top_surfers():
-        data = get_wiki_summary(s["wiki_title"])
-        thumb = None
-        if isinstance(data.get("thumbnail"), dict):
-            thumb = data["thumbnail"].get("source")
-
-        cards.append(
-            {
-                "name": s["name"],
-                "known_for": s["known_for"],
-                "extract": data.get("extract", "No summary available."),
-                "thumb": thumb,
-                "wiki_url": data.get("content_urls", {}).get("desktop", {}).get("page"),
-            }
-        )
-    return cards
+    return fetch_surfer_cards(build_top_surfers(), max_workers=8, cache=get_wiki_cache())
 
 
 try:
     cards = fetch_surfers_cards()
-    cols = st.columns(3)
-    for i, card in enumerate(cards):
-        with cols[i]:
-            if card["thumb"]:
-                st.image(card["thumb"], use_container_width=True)
-            st.markdown(f"### 🏄 {card['name']}")
-            st.caption(card["known_for"])
-            st.write(card["extract"])
-            if card["wiki_url"]:
-                # If link_button is not supported in older Streamlit, replace with markdown link
-                try:
-                    st.link_button("Open Wikipedia", card["wiki_url"])
-                except Exception:
-                    st.markdown(f"[Open Wikipedia]({card['wiki_url']})")
+    if cards and all(card["error"] for card in cards):
+        st.warning("Could not load surfers info from Wikipedia right now.")
+        st.caption(cards[0]["error"])
+        fetch_surfers_cards.clear()  # don't keep a fully failed result for an hour
+    else:
+        per_row = 3
+        for row_start in range(0, len(cards), per_row):
+            cols = st.columns(per_row)
+            for col, card in zip(cols, cards[row_start:row_start + per_row]):
+                with col:
+                    if card["thumb"]:
+                        st.image(card["thumb"], use_container_width=True)
+                    st.markdown(f"### 🏄 {card['name']}")
+                    st.caption(card["known_for"])
+                    st.write(card["extract"])
+                    if card["error"]:
+                        st.caption("⚠️ Wikipedia summary unavailable right now.")
+                    if card["wiki_url"]:
+                        # If link_button is not supported in older Streamlit, replace with markdown link
+                        try:
+                            st.link_button("Open Wikipedia", card["wiki_url"])
+                        except Exception:
+                            st.markdown(f"[Open Wikipedia]({card['wiki_url']})")
 except SurferAPIError as e:
     st.warning("Could not load surfers info from Wikipedia right now.")
     st.caption(str(e))
+
+
+finish_run()
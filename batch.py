@@ -0,0 +1,136 @@
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+
+import pandas as pd
+
+from forecast import marine_to_df, upcoming
+from marine_api import get_marine_hourly_batch
+from scoring import add_scores, best_hours
+from utils import chunked
+
+LEVELS = ["Beginner", "Intermediate", "Advanced"]
+OUTPUT_FORMATS = ("json", "csv", "parquet")
+
+
+def fetch_marine_for_spots(spots: list[dict], chunk_size: int = 50, max_workers: int = 4) -> dict[str, dict]:
+    """
+    Marine payloads for every spot: one batch request per chunk, chunks in parallel.
+    """
+    chunks = chunked(spots, chunk_size)
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="batch-fetch") as pool:
+        parts = pool.map(lambda c: get_marine_hourly_batch(c, chunk_size=chunk_size), chunks)
+        return {name: payload for part in parts for name, payload in part.items()}
+
+
+def score_spot(spot: dict, marine_json: dict, levels: list[str] = LEVELS, top_n: int = 6,
+               now: float | None = None) -> list[dict]:
+    """
+    Best upcoming hours of one spot for each level, as flat records (one per spot/level/rank).
+    Hours that ended before `now` (default: the current time) are not ranked.
+    Top-level so it can run in a process pool.
+    """
+    df = marine_to_df(marine_json, spot.get("beach_facing_deg", 270))
+    if df.empty:
+        return []
+    df = upcoming(df, int(marine_json.get("utc_offset_seconds", 0)), now)
+    if df.empty:
+        return []
+
+    rows = []
+    for level in levels:
+        best = best_hours(add_scores(df, level=level), top_n=top_n)
+        for rank, rec in enumerate(best.to_dict("records"), start=1):
+            rows.append(
+                {
+                    "spot": spot["name"],
+                    "country": spot.get("country", ""),
+                    "lat": spot["lat"],
+                    "lon": spot["lon"],
+                    "level": level,
+                    "rank": rank,
+                    **{k: (str(v) if k in ("wave_dir", "wind_dir", "wind_relation") else v) for k, v in rec.items()},
+                }
+            )
+    return rows
+
+
+def _score_star(args) -> list[dict]:
+    return score_spot(*args)
+
+
+def run_batch(spots: list[dict], levels: list[str] = LEVELS, top_n: int = 6,
+              processes: int | None = None, chunk_size: int = 50) -> tuple[pd.DataFrame, dict]:
+    """
+    Fetch (threads) then score (process pool) every spot for every level.
+    Returns (results frame, stats with timings and spots/second).
+    """
+    t0 = time.perf_counter()
+    payloads = fetch_marine_for_spots(spots, chunk_size=chunk_size)
+    t_fetch = time.perf_counter() - t0
+
+    jobs = [(s, payloads[s["name"]], levels, top_n) for s in spots if s["name"] in payloads]
+    t1 = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        results = list(pool.map(_score_star, jobs, chunksize=max(1, len(jobs) // 32)))
+    t_score = time.perf_counter() - t1
+
+    df = pd.DataFrame([row for rows in results for row in rows])
+    total = time.perf_counter() - t0
+    stats = {
+        "spots": len(spots),
+        "fetched": len(payloads),
+        "failed": len(spots) - len(payloads),
+        "fetch_s": t_fetch,
+        "score_s": t_score,
+        "total_s": total,
+        "spots_per_s": len(jobs) / total if total else 0.0,
+        "score_spots_per_s": len(jobs) / t_score if t_score else 0.0,
+    }
+    return df, stats
+
+
+def write_results(df: pd.DataFrame, path: Path | str, fmt: str | None = None) -> Path:
+    """
+    Write results as json (records), csv or parquet (needs pyarrow); fmt defaults to the file suffix.
+    """
+    path = Path(path)
+    fmt = (fmt or path.suffix.lstrip(".")).lower()
+    if fmt not in OUTPUT_FORMATS:
+        raise ValueError(f"Unsupported output format: {fmt!r} (choose from {', '.join(OUTPUT_FORMATS)})")
+
+    out = df.copy()
+    if fmt == "json":
+        if "time" in out:
+            out["time"] = out["time"].dt.strftime("%Y-%m-%dT%H:%M")
+        out.to_json(path, orient="records", force_ascii=False, indent=2)
+    elif fmt == "csv":
+        out.to_csv(path, index=False)
+    else:
+        out.to_parquet(path, index=False)
+    return path
+
+
+def read_results(path: Path | str) -> pd.DataFrame:
+    """
+    Read a file written by write_results (format from the suffix).
+    """
+    path = Path(path)
+    fmt = path.suffix.lstrip(".").lower()
+    if fmt == "json":
+        return pd.read_json(path, orient="records")
+    if fmt == "csv":
+        return pd.read_csv(path)
+    if fmt == "parquet":
+        return pd.read_parquet(path)
+    raise ValueError(f"Unsupported results format: {fmt!r} (choose from {', '.join(OUTPUT_FORMATS)})")
+
+
+def best_scores(df: pd.DataFrame, level: str) -> dict[str, float]:
+    """
+    {spot: best upcoming surf_score} for one level of a results frame.
+    """
+    if df.empty:
+        return {}
+    rows = df[df["level"] == level]
+    return rows.groupby("spot")["surf_score"].max().astype(float).to_dict()
@@ -0,0 +1,52 @@
+"""
+Four px.line figures vs one downsampled subplot figure: JSON payload and build time.
+
+Run from the repo root:
+    python -m benchmarks.bench_charts
+"""
+import time
+
+import numpy as np
+import pandas as pd
+
+from charts import forecast_figure
+
+HORIZONS = {"7 days": 24 * 7, "16 days": 24 * 16, "1 year": 24 * 365}
+
+
+def make_scored(n: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    t = np.arange(n)
+    return pd.DataFrame(
+        {
+            "time": pd.date_range("2026-01-01", periods=n, freq="h"),
+            "wave_height": 1 + 0.6 * np.sin(t / 30) + rng.normal(0, 0.1, n),
+            "wave_period": 9 + 2 * np.sin(t / 50) + rng.normal(0, 0.3, n),
+            "wind_speed": np.abs(5 + 3 * np.sin(t / 12) + rng.normal(0, 1, n)),
+            "surf_score": rng.integers(0, 100, n),
+        }
+    )
+
+
+def four_px_lines(df: pd.DataFrame) -> list:
+    import plotly.express as px
+
+    return [px.line(df, x="time", y=col) for col in ("wave_height", "wave_period", "wind_speed", "surf_score")]
+
+
+if __name__ == "__main__":
+    for label, n in HORIZONS.items():
+        df = make_scored(n)
+
+        t0 = time.perf_counter()
+        old_bytes = sum(len(fig.to_json()) for fig in four_px_lines(df))
+        old_t = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        new_bytes = len(forecast_figure(df).to_json())
+        new_t = time.perf_counter() - t0
+
+        print(
+            f"{label:>8} ({n:>5} h)  4x px.line {old_bytes / 1024:8.0f} KB {old_t * 1000:6.0f} ms   "
+            f"subplots+LTTB {new_bytes / 1024:6.0f} KB {new_t * 1000:6.0f} ms"
+        )
@@ -0,0 +1,46 @@
+"""
+Per-spot memory and best-hours speed: raw JSON + object-heavy DataFrame vs CompactForecast.
+
+Run from the repo root:
+    python -m benchmarks.bench_compact
+"""
+import time
+
+import numpy as np
+
+from benchmarks.bench_marine import make_marine
+from forecast import CompactForecast, marine_to_df
+from memory_cache import estimate_bytes
+from scoring import add_scores, best_hours, best_hours_forecast, score_forecast, surf_scores
+
+HORIZONS = {"7 days": 24 * 7, "16 days": 24 * 16, "1 year": 24 * 365}
+REPEAT = 50
+
+
+def _time(fn) -> float:
+    t0 = time.perf_counter()
+    for _ in range(REPEAT):
+        fn()
+    return (time.perf_counter() - t0) / REPEAT
+
+
+if __name__ == "__main__":
+    for label, n in HORIZONS.items():
+        marine = make_marine(n)
+        df = marine_to_df(marine, 270)
+        fc = CompactForecast.from_marine_json(marine, 270)
+
+        # Same scores either way (float32 values bin like their float64 source)
+        assert np.array_equal(surf_scores(df, "Intermediate"), score_forecast(fc, "Intermediate"))
+
+        raw_kb = estimate_bytes(marine) / 1024
+        df_kb = df.memory_usage(deep=True).sum() / 1024
+        fc_kb = fc.nbytes / 1024
+
+        old = _time(lambda: best_hours(add_scores(df, "Intermediate")))
+        new = _time(lambda: best_hours_forecast(fc, score_forecast(fc, "Intermediate")))
+
+        print(
+            f"{label:>8}: raw JSON {raw_kb:7.0f} KB  DataFrame {df_kb:6.0f} KB  compact {fc_kb:5.0f} KB"
+            f"  | score+best_hours  DataFrame {old * 1000:6.2f} ms  compact {new * 1000:6.2f} ms  x{old / new:.1f}"
+        )
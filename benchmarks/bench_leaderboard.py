@@ -0,0 +1,40 @@
+"""
+Leaderboard scoring at catalog scale: a cold update of every spot x three levels,
+inline vs over a process pool, then a warm update where only a few forecasts changed.
+
+Run from the repo root:
+    python -m benchmarks.bench_leaderboard
+"""
+import os
+import time
+
+from benchmarks.recorded import marine, synthetic_spots
+from leaderboard import Leaderboard
+
+N_SPOTS = 500
+CHANGED = 0.05
+
+
+def timed_update(board: Leaderboard, spots: list[dict], payloads: dict) -> tuple[float, dict]:
+    t0 = time.perf_counter()
+    result = board.update(spots, payloads)
+    return time.perf_counter() - t0, result
+
+
+if __name__ == "__main__":
+    spots = synthetic_spots(N_SPOTS)
+    payload = marine(168)
+    payloads = {s["name"]: (payload, 1.0) for s in spots}
+    cpus = os.cpu_count() or 1
+
+    for processes in (1, cpus):
+        board = Leaderboard(processes=processes)
+        # Warm up the pool on older forecasts, so the timed update still re-scores every spot
+        board.update(spots[:64], {s["name"]: (payload, 0.0) for s in spots[:64]})
+        secs, _ = timed_update(board, spots, payloads)
+        print(f"cold, {processes:>2} process(es): {secs:6.2f} s  ({N_SPOTS / secs:7.0f} spots/s)")
+
+        changed = {s["name"]: (payload, 2.0) for s in spots[: int(N_SPOTS * CHANGED)]}
+        secs, result = timed_update(board, spots, {**payloads, **changed})
+        print(f"warm, {processes:>2} process(es): {secs:6.2f} s  ({result['scored']} re-scored, {result['reused']} reused)")
+        board.close()
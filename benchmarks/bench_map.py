@@ -0,0 +1,73 @@
+"""
+Spot map payload size and render time at 10k spots: the old per-rerun DataFrame +
+.apply colors + full records vs spot_map.SpotMapData / build_deck (all points,
+clustered, clustered + score colors). "Render" is deck build + the JSON encoding
+Streamlit sends to the browser.
+
+Run from the repo root:
+    python -m benchmarks.bench_map
+"""
+import statistics
+import time
+
+import numpy as np
+import pandas as pd
+import pydeck as pdk
+
+from benchmarks.recorded import synthetic_spots
+from spot_map import SpotMapData, build_deck
+
+N_SPOTS = 10_000
+RUNS = 7
+MAP_COLUMNS = ["name", "lat", "lon", "country", "beach_facing_deg"]
+
+
+def legacy_deck(spots: list[dict], selected_name: str, favs: tuple[str, ...], lat: float, lon: float):
+    df_map = pd.DataFrame(spots, columns=MAP_COLUMNS)
+    df_map["is_selected"] = df_map["name"].eq(selected_name)
+    df_map["is_fav"] = df_map["name"].isin(favs)
+    df_map["base_color"] = df_map["is_selected"].apply(lambda x: [255, 0, 0, 220] if x else [0, 120, 255, 170])
+    df_fav = df_map[df_map["is_fav"]].copy()
+    layers = [
+        pdk.Layer("ScatterplotLayer", data=df_map, get_position="[lon, lat]", get_radius=260,
+                  get_fill_color="base_color", get_line_color="[255,255,255]", line_width_min_pixels=1,
+                  pickable=True),
+        pdk.Layer("ScatterplotLayer", data=df_fav, get_position="[lon, lat]", get_radius=330,
+                  get_fill_color="[255, 215, 0, 220]", get_line_color="[255,255,255]", line_width_min_pixels=1,
+                  pickable=False),
+    ]
+    return pdk.Deck(layers=layers, initial_view_state=pdk.ViewState(latitude=lat, longitude=lon, zoom=9),
+                    tooltip={"text": "{name}"})
+
+
+def measure(make_deck) -> tuple[float, int]:
+    times, size = [], 0
+    for _ in range(RUNS):
+        t0 = time.perf_counter()
+        size = len(make_deck().to_json().encode("utf-8"))
+        times.append(time.perf_counter() - t0)
+    return statistics.median(times), size
+
+
+if __name__ == "__main__":
+    spots = synthetic_spots(N_SPOTS)
+    selected = spots[0]
+    favs = tuple(s["name"] for s in spots[1:50])
+    lat, lon = selected["lat"], selected["lon"]
+
+    t0 = time.perf_counter()
+    data = SpotMapData(spots)
+    t_build = time.perf_counter() - t0
+    scores = data.score_array({s["name"]: float(v) for s, v in zip(spots, np.random.default_rng(0).integers(0, 100, N_SPOTS))})
+
+    cases = {
+        "legacy (DataFrame + apply)": lambda: legacy_deck(spots, selected["name"], favs, lat, lon),
+        "SpotMapData, all points": lambda: build_deck(data, selected["name"], favs, lat, lon, cluster=False),
+        "SpotMapData, clustered": lambda: build_deck(data, selected["name"], favs, lat, lon, cluster=True),
+        "clustered + score colors": lambda: build_deck(data, selected["name"], favs, lat, lon, cluster=True,
+                                                       scores=scores),
+    }
+    print(f"{N_SPOTS} spots (SpotMapData built once in {t_build * 1000:.0f} ms)")
+    for label, make in cases.items():
+        secs, size = measure(make)
+        print(f"{label:<28} render {secs * 1000:7.1f} ms   payload {size / 1024:8.0f} KB")
@@ -0,0 +1,81 @@
+"""
+Row-wise vs vectorized marine_to_df.
+
+Run from the repo root:
+    python -m benchmarks.bench_marine
+"""
+import time
+
+import numpy as np
+import pandas as pd
+
+from forecast import marine_to_df
+from utils import deg_to_compass, wind_relation_to_beach
+
+SIZES = [168, 10_000, 200_000]
+
+
+def make_marine(n: int, seed: int = 0) -> dict:
+    rng = np.random.default_rng(seed)
+    times = pd.date_range("2026-01-01", periods=n, freq="h").strftime("%Y-%m-%dT%H:%M")
+    wind_dir = rng.uniform(0, 360, n).round(0).tolist()
+    wind_dir[::97] = [None] * len(wind_dir[::97])
+    return {
+        "hourly": {
+            "time": list(times),
+            "wave_height": rng.uniform(0, 3, n).round(2).tolist(),
+            "wave_period": rng.uniform(3, 16, n).round(1).tolist(),
+            "wave_direction": rng.uniform(0, 360, n).round(0).tolist(),
+            "wind_speed_10m": rng.uniform(0, 15, n).round(1).tolist(),
+            "wind_direction_10m": wind_dir,
+        }
+    }
+
+
+def marine_to_df_rowwise(marine_json: dict, beach_facing_deg: float) -> pd.DataFrame:
+    # The previous app.py implementation, with NaN treated like None
+    h = marine_json.get("hourly", {})
+    df = pd.DataFrame(
+        {
+            "time": pd.to_datetime(h.get("time", [])),
+            "wave_height": h.get("wave_height", []),
+            "wave_period": h.get("wave_period", []),
+            "wave_dir_deg": h.get("wave_direction", []),
+            "wind_speed": h.get("wind_speed_10m", []),
+            "wind_dir_deg": h.get("wind_direction_10m", []),
+        }
+    )
+    ok = lambda d: d is not None and d == d
+    df["wave_dir"] = df["wave_dir_deg"].apply(lambda d: deg_to_compass(float(d)) if ok(d) else "")
+    df["wind_dir"] = df["wind_dir_deg"].apply(lambda d: deg_to_compass(float(d)) if ok(d) else "")
+    rels = df["wind_dir_deg"].apply(lambda d: wind_relation_to_beach(float(d), beach_facing_deg) if ok(d) else ("", ""))
+    df["wind_relation"] = rels.apply(lambda t: t[0])
+    df["wind_relation_color"] = rels.apply(lambda t: t[1])
+    return df
+
+
+def check_parity() -> None:
+    marine = make_marine(5_000)
+    for facing in (0, 270, 300):
+        fast = marine_to_df(marine, facing)
+        slow = marine_to_df_rowwise(marine, facing)
+        for col in ("wave_dir", "wind_dir", "wind_relation", "wind_relation_color"):
+            assert (fast[col].astype(str) == slow[col]).all(), f"parity failed for {col} facing={facing}"
+    print("parity: OK")
+
+
+def bench(n: int) -> None:
+    marine = make_marine(n)
+    t0 = time.perf_counter()
+    marine_to_df(marine, 270)
+    fast = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    marine_to_df_rowwise(marine, 270)
+    slow = time.perf_counter() - t0
+    print(f"{n:>9} rows  row-wise {slow * 1000:9.1f} ms  vectorized {fast * 1000:8.2f} ms  x{slow / fast:,.1f}")
+
+
+if __name__ == "__main__":
+    check_parity()
+    for n in SIZES:
+        bench(n)
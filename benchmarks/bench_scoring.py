@@ -0,0 +1,64 @@
+"""
+Row-wise vs vectorized surf scoring (parity is checked in tests/test_scoring.py).
+
+Run from the repo root:
+    python -m benchmarks.bench_scoring
+"""
+import time
+
+import numpy as np
+import pandas as pd
+
+from scoring import add_scores, surf_score_row
+
+LEVELS = ["Beginner", "Intermediate", "Advanced"]
+SIZES = [168, 10_000, 1_000_000]
+
+
+def make_frame(n: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame(
+        {
+            "wave_height": rng.uniform(0, 3, n).round(2),
+            "wave_period": rng.uniform(3, 16, n).round(1),
+            "wind_speed": rng.uniform(0, 15, n).round(1),
+            "wind_relation": rng.choice(["Offshore", "Onshore", "Cross", ""], n),
+        }
+    )
+    # Sprinkle missing values and exact threshold hits
+    df.loc[df.sample(frac=0.01, random_state=seed).index, "wave_height"] = np.nan
+    df.loc[df.sample(frac=0.01, random_state=seed + 1).index, "wind_speed"] = np.nan
+    df.loc[df.sample(frac=0.01, random_state=seed + 2).index, "wave_period"] = 9.0
+    return df
+
+
+def add_scores_rowwise(df: pd.DataFrame, level: str) -> pd.DataFrame:
+    df = df.copy()
+    df["surf_score"] = df.apply(
+        lambda r: surf_score_row(
+            r.get("wave_height"), r.get("wave_period"), r.get("wind_speed"), r.get("wind_relation"), level
+        ),
+        axis=1,
+    )
+    return df
+
+
+def bench(n: int) -> None:
+    df = make_frame(n)
+    t0 = time.perf_counter()
+    add_scores(df, "Intermediate")
+    fast = time.perf_counter() - t0
+
+    # Row-wise at 1M rows takes minutes; time a slice and extrapolate
+    sample = df if n <= 10_000 else df.head(10_000)
+    t0 = time.perf_counter()
+    add_scores_rowwise(sample, "Intermediate")
+    slow = (time.perf_counter() - t0) * n / len(sample)
+
+    note = "" if len(sample) == n else " (extrapolated)"
+    print(f"{n:>9} rows  row-wise {slow * 1000:10.1f} ms{note}  vectorized {fast * 1000:8.2f} ms  x{slow / fast:,.0f}")
+
+
+if __name__ == "__main__":
+    for n in SIZES:
+        bench(n)
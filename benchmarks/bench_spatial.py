@@ -0,0 +1,59 @@
+"""
+Grid SpotIndex vs brute-force haversine scan.
+
+Run from the repo root:
+    python -m benchmarks.bench_spatial
+"""
+import time
+
+import numpy as np
+
+from spatial import SpotIndex
+from utils import haversine_km
+
+N_SPOTS = 100_000
+N_QUERIES = 500
+K = 5
+RADIUS_KM = 100
+
+
+def make_spots(n: int, seed: int = 0) -> list[dict]:
+    rng = np.random.default_rng(seed)
+    lat = np.degrees(np.arcsin(rng.uniform(-1, 1, n)))  # uniform on the sphere
+    lon = rng.uniform(-180, 180, n)
+    return [{"name": f"spot-{i}", "lat": float(a), "lon": float(b)} for i, (a, b) in enumerate(zip(lat, lon))]
+
+
+def brute_force(spots, lat, lon, k, radius_km):
+    found = [(haversine_km(lat, lon, s["lat"], s["lon"]), i) for i, s in enumerate(spots)]
+    found = sorted(x for x in found if x[0] <= radius_km)[:k]
+    return [i for _, i in found]
+
+
+if __name__ == "__main__":
+    spots = make_spots(N_SPOTS)
+    t0 = time.perf_counter()
+    index = SpotIndex(spots)
+    print(f"build: {(time.perf_counter() - t0) * 1000:.1f} ms for {N_SPOTS:,} spots")
+
+    rng = np.random.default_rng(1)
+    queries = list(zip(np.degrees(np.arcsin(rng.uniform(-1, 1, N_QUERIES))), rng.uniform(-180, 180, N_QUERIES)))
+    # Include the awkward places: poles and the antimeridian
+    queries += [(89.9, 0.0), (-89.9, 120.0), (0.0, 179.95), (10.0, -179.95)]
+
+    for lat, lon in queries[:20] + queries[-4:]:
+        got = index.query(lat, lon, k=K, radius_km=RADIUS_KM)[0].tolist()
+        assert got == brute_force(spots, lat, lon, K, RADIUS_KM), (lat, lon)
+    print("parity: OK")
+
+    t0 = time.perf_counter()
+    for lat, lon in queries:
+        index.query(lat, lon, k=K, radius_km=RADIUS_KM)
+    indexed = (time.perf_counter() - t0) / len(queries)
+
+    t0 = time.perf_counter()
+    for lat, lon in queries[:5]:
+        brute_force(spots, lat, lon, K, RADIUS_KM)
+    brute = (time.perf_counter() - t0) / 5
+
+    print(f"indexed query: {indexed * 1e6:8.1f} us   brute force: {brute * 1e3:8.1f} ms   x{brute / indexed:,.0f}")
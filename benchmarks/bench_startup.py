@@ -0,0 +1,65 @@
+"""
+Cold-start cost: import time and time-to-first-paint of app.py, with plotly and
+pydeck imported eagerly (the old top-of-file imports) vs lazily. Only those two are
+deferred: pandas is still imported at startup by catalog, forecast, scoring and
+memory_cache, so it is paid in both runs and the difference is plotly + pydeck alone.
+
+Each measurement runs in a fresh interpreter inside a scratch directory (the app's
+cache files are relative paths). HTTP is answered locally from the recorded
+fixtures so the numbers don't depend on the network.
+
+Run from the repo root:
+    python -m benchmarks.bench_startup
+"""
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+RUNS = 5
+REPO_DIR = Path(__file__).resolve().parent.parent
+EAGER_IMPORTS = "import plotly.express, pydeck"
+
+IMPORT_SNIPPET = """
+import time
+t0 = time.perf_counter()
+import streamlit
+{extra}
+import fetcher, forecast, scoring, catalog, favorites, geocoder, spatial, surfers_api
+print(time.perf_counter() - t0)
+"""
+
+PAINT_SNIPPET = """
+import time
+t0 = time.perf_counter()
+{extra}
+from streamlit.testing.v1 import AppTest
+from benchmarks.recorded import APP_PATH, install_fake_http
+install_fake_http()
+at = AppTest.from_file(str(APP_PATH), default_timeout=60)
+at.secrets["api_key"] = "bench"
+at.run()
+assert not at.exception, at.exception
+print(time.perf_counter() - t0)
+"""
+
+
+def _time(snippet: str) -> float:
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, [str(REPO_DIR), os.environ.get("PYTHONPATH")]))}
+    with tempfile.TemporaryDirectory() as cwd:
+        out = subprocess.run([sys.executable, "-c", snippet], capture_output=True, text=True, check=True,
+                             cwd=cwd, env=env)
+    return float(out.stdout.strip().splitlines()[-1])
+
+
+def _median(snippet: str) -> float:
+    return statistics.median(_time(snippet) for _ in range(RUNS))
+
+
+if __name__ == "__main__":
+    for label, extra in (("eager", EAGER_IMPORTS), ("lazy", "")):
+        imports = _median(IMPORT_SNIPPET.format(extra=extra))
+        paint = _median(PAINT_SNIPPET.format(extra=extra))
+        print(f"{label:>5}: imports {imports * 1000:7.0f} ms   first paint {paint * 1000:7.0f} ms")
@@ -0,0 +1,146 @@
+"""
+Load harness: N concurrent simulated sessions, each repeatedly running the full
+fetch -> parse -> score -> rank path against benchmarks.mock_server, so load tests
+cost no provider quota. Reports throughput, end-to-end latency percentiles and
+where the time went per stage.
+
+Run from the repo root (starts its own mock server unless --base-url is given):
+    python -m benchmarks.load_test --sessions 16 --duration 20 --latency-ms 80 --error-rate 0.02
+    python -m benchmarks.load_test --base-url http://127.0.0.1:8765 --sessions 64
+"""
+import argparse
+import os
+import threading
+import time
+
+import numpy as np
+
+from benchmarks import mock_server, recorded
+
+LEVELS = ["Beginner", "Intermediate", "Advanced"]
+
+
+def _session(sid: int, spots: list[dict], deadline: float, iterations: int | None, results: list, lock):
+    # Imported here so the *_BASE_URL overrides set in main() are already in place
+    import metrics
+    from fetcher import fetch_spot
+    from forecast import CompactForecast
+    from scoring import best_hours_forecast, score_forecast
+
+    i = 0
+    while (iterations is None and time.perf_counter() < deadline) or (iterations is not None and i < iterations):
+        spot = spots[(sid + i * 7919) % len(spots)]
+        level = LEVELS[i % len(LEVELS)]
+        run = metrics.start_run()
+        t0 = time.perf_counter()
+        error = None
+        try:
+            # No caches: every pipeline exercises the fetch path, not cache hits
+            _, marine, _, _ = fetch_spot(spot["lat"], spot["lon"], "load-test", cache=None, quota=None)
+            fc = CompactForecast.from_marine_json(marine, spot["beach_facing_deg"])
+            best_hours_forecast(fc, score_forecast(fc, level), top_n=6)
+        except Exception as e:
+            error = type(e).__name__
+        elapsed = time.perf_counter() - t0
+        with lock:
+            results.append((elapsed, error, run))
+        i += 1
+
+
+def _percentiles(values: list[float]) -> dict:
+    if not values:
+        return {}
+    arr = np.asarray(values) * 1000
+    return {p: float(np.percentile(arr, q)) for p, q in (("p50", 50), ("p90", 90), ("p99", 99))} | {
+        "max": float(arr.max()),
+        "mean": float(arr.mean()),
+    }
+
+
+def report(results: list, wall: float, server_stats: dict | None = None) -> str:
+    ok = [r for r in results if r[1] is None]
+    errors: dict[str, int] = {}
+    for _, err, _ in results:
+        if err is not None:
+            errors[err] = errors.get(err, 0) + 1
+
+    lines = [
+        f"pipelines: {len(results)} ({len(ok)} ok, {len(results) - len(ok)} failed) in {wall:.1f} s",
+        f"throughput: {len(ok) / wall:.1f} pipelines/s",
+    ]
+    pct = _percentiles([r[0] for r in ok])
+    if pct:
+        lines.append("latency ms: " + "  ".join(f"{k} {v:.0f}" for k, v in pct.items()))
+    if errors:
+        lines.append("errors: " + ", ".join(f"{k} x{v}" for k, v in sorted(errors.items())))
+
+    per_stage: dict[str, list[float]] = {}
+    for _, _, run in ok:
+        for name, secs in run:
+            per_stage.setdefault(name, []).append(secs)
+    if per_stage:
+        lines.append("per stage (ms):")
+        for name, secs in sorted(per_stage.items(), key=lambda kv: -sum(kv[1])):
+            p = _percentiles(secs)
+            lines.append(f"  {name:<28} n={len(secs):<6} p50 {p['p50']:7.1f}  p99 {p['p99']:7.1f}")
+
+    import http_client
+    http = http_client.get_stats()
+    lines.append("http: " + "  ".join(f"{k} {v}" for k, v in http.items()))
+    if server_stats:
+        lines.append(f"server: {server_stats['requests']} requests, {server_stats['errors']} injected errors")
+    return "\n".join(lines)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Drive concurrent sessions through fetch-parse-score.")
+    parser.add_argument("--sessions", type=int, default=8, help="Concurrent simulated sessions.")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds to run (ignored with --iterations).")
+    parser.add_argument("--iterations", type=int, default=None, help="Pipelines per session instead of a duration.")
+    parser.add_argument("--spots", type=int, default=1000, help="Distinct synthetic spots to cycle through.")
+    parser.add_argument("--base-url", default=None, help="Use an already running mock server.")
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    parser.add_argument("--jitter-ms", type=float, default=20.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--hours", type=int, default=168, help="Hourly entries per Open-Meteo payload.")
+    parser.add_argument("--pool-size", type=int, default=None, help="Keep-alive connections per host.")
+    args = parser.parse_args()
+
+    server = None
+    base_url = args.base_url
+    if base_url is None:
+        config = mock_server.MockConfig(args.latency_ms, args.jitter_ms, args.error_rate, args.hours, seed=0)
+        server = mock_server.start_in_background(config)
+        base_url = server.base_url
+    os.environ.update(mock_server.base_url_env(base_url))
+
+    import http_client
+    if args.pool_size:
+        http_client.configure(args.pool_size)
+
+    spots = recorded.synthetic_spots(args.spots)
+    results: list = []
+    lock = threading.Lock()
+    t0 = time.perf_counter()
+    deadline = t0 + args.duration
+    threads = [
+        threading.Thread(target=_session, args=(sid, spots, deadline, args.iterations, results, lock))
+        for sid in range(args.sessions)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    wall = time.perf_counter() - t0
+
+    server_stats = None
+    if server is not None:
+        server_stats = {"requests": server.config.requests, "errors": server.config.errors}
+        server.shutdown()
+
+    print(f"{args.sessions} sessions against {base_url}")
+    print(report(results, wall, server_stats))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+"""
+Local stand-in for the providers the app calls (OpenWeather current + geocoding,
+Open-Meteo marine + forecast, Wikipedia summaries), answering from the recorded
+fixtures with configurable latency, error rate and payload size.
+
+Point the app at it with the *_BASE_URL variables, e.g.:
+    python -m benchmarks.mock_server --port 8765 --latency-ms 80 --error-rate 0.02
+    OPENWEATHER_BASE_URL=http://127.0.0.1:8765 OPEN_METEO_BASE_URL=http://127.0.0.1:8765 \\
+    OPEN_METEO_MARINE_BASE_URL=http://127.0.0.1:8765 WIKIPEDIA_BASE_URL=http://127.0.0.1:8765 \\
+    streamlit run app.py
+"""
+import argparse
+import copy
+import hashlib
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from benchmarks import recorded
+
+BASE_URL_ENV = (
+    "OPENWEATHER_BASE_URL",
+    "OPEN_METEO_BASE_URL",
+    "OPEN_METEO_MARINE_BASE_URL",
+    "WIKIPEDIA_BASE_URL",
+)
+
+# 1x1 transparent PNG served for every thumbnail
+THUMBNAIL = bytes.fromhex(
+    "89504e470d0a1a0a0000000d49484452000000010000000108060000001f15c489"
+    "0000000d49444154789c6360000002000154a24f5d0000000049454e44ae426082"
+)
+
+
+class MockConfig:
+    def __init__(self, latency_ms: float = 0.0, jitter_ms: float = 0.0, error_rate: float = 0.0,
+                 hours: int = 168, seed: int | None = None):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.hours = hours
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.errors = 0
+
+    def delay(self) -> float:
+        with self.lock:
+            jitter = self.rng.uniform(-self.jitter_ms, self.jitter_ms) if self.jitter_ms else 0.0
+        return max(0.0, self.latency_ms + jitter) / 1000
+
+    def should_fail(self) -> bool:
+        with self.lock:
+            self.requests += 1
+            failed = self.error_rate > 0 and self.rng.random() < self.error_rate
+            self.errors += failed
+        return failed
+
+
+def _encode(data) -> tuple[bytes, str]:
+    body = json.dumps(data, separators=(",", ":")).encode("utf-8")
+    return body, '"' + hashlib.sha1(body).hexdigest()[:16] + '"'
+
+
+class MockProviders:
+    """
+    Pre-encoded responses keyed by route, so serving costs no JSON work per request.
+    Open-Meteo batch requests (comma-separated latitude) get a list back, like the real API.
+    """
+
+    def __init__(self, hours: int, base_url: str):
+        self.current = _encode(recorded.load("openweather_current"))
+        self.geocode = _encode(recorded.load("openweather_geocode"))
+        self.marine = recorded.marine(hours)
+        self.extras = recorded.extras(hours)
+        self.marine_one = _encode(self.marine)
+        self.extras_one = _encode(self.extras)
+        wiki = copy.deepcopy(recorded.load("wikipedia_summary"))
+        if isinstance(wiki.get("thumbnail"), dict):
+            wiki["thumbnail"]["source"] = f"{base_url}/thumb/surfer.png"
+        self.wiki = _encode(wiki)
+
+    def open_meteo(self, payload: dict, single: tuple[bytes, str], query: dict) -> tuple[bytes, str]:
+        n = len(query.get("latitude", [""])[0].split(","))
+        return single if n == 1 else _encode([payload] * n)
+
+    def route(self, path: str, query: dict) -> tuple[bytes, str, str] | None:
+        """
+        (body, etag, content type) for a path, or None for 404.
+        """
+        if path == "/data/2.5/weather":
+            return (*self.current, "application/json")
+        if path == "/geo/1.0/direct":
+            return (*self.geocode, "application/json")
+        if path == "/v1/marine":
+            return (*self.open_meteo(self.marine, self.marine_one, query), "application/json")
+        if path == "/v1/forecast":
+            return (*self.open_meteo(self.extras, self.extras_one, query), "application/json")
+        if path.startswith("/api/rest_v1/page/summary/"):
+            return (*self.wiki, "application/json")
+        if path.startswith("/thumb/"):
+            return THUMBNAIL, '"thumb"', "image/png"
+        return None
+
+
+def make_server(host: str = "127.0.0.1", port: int = 0, config: MockConfig | None = None) -> ThreadingHTTPServer:
+    """
+    Build (but don't start) a threaded mock server. port=0 picks a free port;
+    the bound address is server.server_address.
+    """
+    config = config or MockConfig()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        # Headers and body go out as separate writes; without this, keep-alive
+        # connections stall ~40 ms per response on Nagle + delayed ACK
+        disable_nagle_algorithm = True
+
+        def do_GET(self):
+            time.sleep(config.delay())
+            if config.should_fail():
+                self._send(503, b'{"message":"mock failure"}', "application/json")
+                return
+
+            parts = urlsplit(self.path)
+            found = server.providers.route(parts.path, parse_qs(parts.query))
+            if found is None:
+                self._send(404, b'{"message":"not found"}', "application/json")
+                return
+            body, etag, content_type = found
+            if self.headers.get("If-None-Match") == etag:
+                self._send(304, b"", content_type, etag)
+            else:
+                self._send(200, body, content_type, etag)
+
+        def _send(self, status: int, body: bytes, content_type: str, etag: str | None = None):
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            if etag:
+                self.send_header("ETag", etag)
+            self.end_headers()
+            if body:
+                self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    server.config = config
+    server.base_url = f"http://{host}:{server.server_address[1]}"
+    server.providers = MockProviders(config.hours, server.base_url)
+    return server
+
+
+def start_in_background(config: MockConfig | None = None, host: str = "127.0.0.1", port: int = 0) -> ThreadingHTTPServer:
+    server = make_server(host, port, config)
+    threading.Thread(target=server.serve_forever, name="mock-server", daemon=True).start()
+    return server
+
+
+def base_url_env(base_url: str) -> dict[str, str]:
+    """
+    Environment overrides that route every provider module to base_url.
+    They are read at import time, so set them before importing the API modules.
+    """
+    return {name: base_url for name in BASE_URL_ENV}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Serve recorded provider responses locally.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Mean added latency per request.")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="Uniform +/- jitter around the latency.")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with 503.")
+    parser.add_argument("--hours", type=int, default=168, help="Hourly entries per Open-Meteo payload.")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    config = MockConfig(args.latency_ms, args.jitter_ms, args.error_rate, args.hours, args.seed)
+    server = make_server(args.host, args.port, config)
+    print(f"Mock providers on {server.base_url}")
+    for name, value in base_url_env(server.base_url).items():
+        print(f"  export {name}={value}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
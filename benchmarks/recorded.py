@@ -0,0 +1,117 @@
+"""
+Recorded provider responses (benchmarks/fixtures/*.json), synthetic scale-ups of them,
+and a fake http_client.get that serves them.
+"""
+import copy
+import json
+import os
+from contextlib import contextmanager
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+FIXTURES_DIR = Path(__file__).with_name("fixtures")
+APP_PATH = Path(__file__).resolve().parent.parent / "app.py"
+
+
+def load(name: str) -> dict | list:
+    with (FIXTURES_DIR / f"{name}.json").open(encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _scale_hourly(payload: dict, hours: int) -> dict:
+    """
+    Tile the hourly arrays of an Open-Meteo payload to `hours` entries with continuing timestamps.
+    """
+    out = copy.deepcopy(payload)
+    hourly = out["hourly"]
+    start = pd.Timestamp(hourly["time"][0])
+    reps = -(-hours // len(hourly["time"]))
+    for key, values in hourly.items():
+        if key != "time":
+            hourly[key] = (values * reps)[:hours]
+    hourly["time"] = list(pd.date_range(start, periods=hours, freq="h").strftime("%Y-%m-%dT%H:%M"))
+    return out
+
+
+def marine(hours: int = 168) -> dict:
+    return _scale_hourly(load("open_meteo_marine"), hours)
+
+
+def extras(hours: int = 168) -> dict:
+    return _scale_hourly(load("open_meteo_extras"), hours)
+
+
+def synthetic_spots(n: int, seed: int = 0) -> list[dict]:
+    """
+    n spots spread over the globe, shaped like spots.SURF_SPOTS entries.
+    """
+    rng = np.random.default_rng(seed)
+    lat = np.degrees(np.arcsin(rng.uniform(-0.9, 0.9, n)))
+    lon = rng.uniform(-180, 180, n)
+    facing = rng.choice([0, 90, 180, 270, 300], n)
+    return [
+        {"name": f"Spot {i:05d}", "lat": round(float(a), 4), "lon": round(float(b), 4),
+         "country": "XX", "beach_facing_deg": int(f)}
+        for i, (a, b, f) in enumerate(zip(lat, lon, facing))
+    ]
+
+
+class FakeResponse:
+    def __init__(self, data, status_code: int = 200, headers: dict | None = None):
+        self._data = data
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.content = json.dumps(data).encode("utf-8")
+
+    def json(self):
+        return self._data
+
+    def raise_for_status(self):
+        pass
+
+
+def fake_get(hours: int = 168):
+    """
+    A drop-in for http_client.get answering every provider the app calls from the fixtures.
+    Comma-separated Open-Meteo coordinates get a list back, like the real batch API.
+    """
+    payloads = {
+        "api.openweathermap.org/data": load("openweather_current"),
+        "api.openweathermap.org/geo": load("openweather_geocode"),
+        "marine-api.open-meteo.com": marine(hours),
+        "api.open-meteo.com": extras(hours),
+        "wikipedia.org": load("wikipedia_summary"),
+    }
+
+    def get(url, **kwargs):
+        for prefix, data in payloads.items():
+            if prefix in url:
+                lats = str((kwargs.get("params") or {}).get("latitude", "")).split(",")
+                return FakeResponse([data] * len(lats) if len(lats) > 1 else data)
+        return FakeResponse({}, status_code=404)
+
+    return get
+
+
+def install_fake_http(hours: int = 168) -> None:
+    import http_client
+
+    http_client.get = fake_get(hours)
+
+
+@contextmanager
+def working_dir(path: Path | str):
+    """
+    Run the app with `path` as the working directory. Its caches (forecast_cache.sqlite,
+    wiki_cache.sqlite, geocode_cache.sqlite, thumb_cache/, favorites.json) use relative
+    paths, and fixture payloads must never land in the real ones, where
+    stale-while-revalidate would serve them to users.
+    """
+    previous = os.getcwd()
+    os.chdir(path)
+    try:
+        yield
+    finally:
+        os.chdir(previous)
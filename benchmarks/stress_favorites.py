@@ -0,0 +1,56 @@
+"""
+Many processes x threads toggling favorites in one file at the same time.
+Every name is toggled an even number of times, so the file must end up empty
+and must parse as JSON after every write.
+
+Run from the repo root:
+    python -m benchmarks.stress_favorites
+"""
+import json
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+
+from favorites import FavoritesStore
+
+PROCESSES = 4
+THREADS = 4
+NAMES = [f"Spot {i}" for i in range(20)]
+ROUNDS = 10  # each name toggled 2*ROUNDS times per worker thread
+
+
+def _worker(path: str) -> int:
+    store = FavoritesStore(path)
+
+    def run(_):
+        for _ in range(2 * ROUNDS):
+            for name in NAMES:
+                store.toggle(name)
+                json.loads(Path(path).read_text(encoding="utf-8"))  # never torn
+        return 2 * ROUNDS * len(NAMES)
+
+    with ThreadPoolExecutor(THREADS) as pool:
+        return sum(pool.map(run, range(THREADS)))
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as d:
+        path = str(Path(d) / "favorites.json")
+        FavoritesStore(path).save([])
+
+        t0 = time.perf_counter()
+        with ProcessPoolExecutor(PROCESSES) as pool:
+            toggles = sum(pool.map(_worker, [path] * PROCESSES))
+        elapsed = time.perf_counter() - t0
+
+        final = FavoritesStore(path).load()
+        assert final == [], f"lost or duplicated toggles: {final}"
+        print(f"{toggles:,} toggles in {elapsed:.2f}s ({toggles / elapsed:,.0f}/s) - final state OK")
+
+        store = FavoritesStore(path)
+        store.save(NAMES)
+        t0 = time.perf_counter()
+        for _ in range(10_000):
+            store.contains("Spot 7")
+        print(f"cached membership check: {(time.perf_counter() - t0) / 10_000 * 1e6:.1f} us")
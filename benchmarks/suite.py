@@ -0,0 +1,301 @@
+"""
+Benchmark suite over the recorded provider fixtures, scaled up to year-long
+horizons and 10k spots. Results are written as JSON and compared with a saved
+baseline; cases slower than the baseline by more than --threshold are flagged
+and the exit code is 1.
+
+Run from the repo root:
+    python -m benchmarks.suite                    # run + compare with baseline
+    python -m benchmarks.suite --save-baseline    # run + make this the baseline
+    python -m benchmarks.suite --only scoring     # cases whose name contains "scoring"
+"""
+import argparse
+import json
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from benchmarks import recorded
+
+RESULTS_DIR = Path(__file__).with_name("results")
+BASELINE_FILE = RESULTS_DIR / "baseline.json"
+DEFAULT_THRESHOLD = 0.20
+
+YEAR = 24 * 365
+N_SPOTS = 10_000
+
+CASES = {}
+
+
+def case(name: str, repeat: int = 7):
+    """
+    Register fn(setup) as a benchmark. fn is called once untimed as warm-up.
+    """
+    def register(fn):
+        CASES[name] = (fn, repeat)
+        return fn
+    return register
+
+
+# -------------------------
+# Parsing and scoring
+# -------------------------
+@case("parse.marine_to_df.week")
+def _(ctx):
+    from forecast import marine_to_df
+    return lambda: marine_to_df(ctx["marine_week"], 270)
+
+
+@case("parse.marine_to_df.year")
+def _(ctx):
+    from forecast import marine_to_df
+    return lambda: marine_to_df(ctx["marine_year"], 270)
+
+
+@case("scoring.add_scores.week")
+def _(ctx):
+    from scoring import add_scores
+    return lambda: add_scores(ctx["df_week"], "Intermediate")
+
+
+@case("scoring.add_scores.year")
+def _(ctx):
+    from scoring import add_scores
+    return lambda: add_scores(ctx["df_year"], "Intermediate")
+
+
+@case("scoring.add_scores.10k_spots_week", repeat=3)
+def _(ctx):
+    from scoring import add_scores
+    frame = pd.concat([ctx["df_week"]] * N_SPOTS, ignore_index=True)
+    return lambda: add_scores(frame, "Intermediate")
+
+
+@case("scoring.best_hours.year")
+def _(ctx):
+    from scoring import add_scores, best_hours
+    scored = add_scores(ctx["df_year"], "Intermediate")
+    return lambda: best_hours(scored, top_n=6)
+
+
+@case("derive.timeline.year")
+def _(ctx):
+    from forecast import CompactForecast
+    from timeline import Timeline
+    fc = CompactForecast.from_marine_json(ctx["marine_year"], 270)
+    extras = recorded.extras(YEAR)
+    current = recorded.load("openweather_current")
+    return lambda: Timeline.build(fc, extras, current)
+
+
+@case("derive.timeline.now_lookup", repeat=5)
+def _(ctx):
+    from forecast import CompactForecast
+    from timeline import Timeline
+    fc = CompactForecast.from_marine_json(ctx["marine_year"], 270)
+    timeline = Timeline.build(fc, recorded.extras(YEAR), recorded.load("openweather_current"))
+    return lambda: [timeline.value(col) for col in ("uv_index", "visibility", "cloud_cover", "wind_speed")]
+
+
+@case("render.map_deck.10k_spots", repeat=5)
+def _(ctx):
+    from spot_map import SpotMapData, build_deck
+    spots = ctx["spots_10k"]
+    data = SpotMapData(spots)
+    return lambda: build_deck(data, spots[0]["name"], (), spots[0]["lat"], spots[0]["lon"], cluster=False).to_json()
+
+
+@case("render.map_deck.10k_spots_clustered", repeat=5)
+def _(ctx):
+    from spot_map import SpotMapData, build_deck
+    spots = ctx["spots_10k"]
+    data = SpotMapData(spots)
+    return lambda: build_deck(data, spots[0]["name"], (), spots[0]["lat"], spots[0]["lon"], cluster=True).to_json()
+
+
+@case("scoring.best_sessions.year")
+def _(ctx):
+    from scoring import add_scores, best_sessions
+    scored = add_scores(ctx["df_year"], "Intermediate")
+    return lambda: best_sessions(scored, hours=3, top_n=3)
+
+
+@case("scoring.session_windows.10k_spots_week", repeat=3)
+def _(ctx):
+    # Array path a batch would take per spot: rolling window scores + non-overlapping top-k
+    from forecast import CompactForecast
+    from scoring import score_forecast, top_session_starts, window_scores
+    fc = CompactForecast.from_marine_json(ctx["marine_week"], 270)
+    scores = score_forecast(fc, "Intermediate")
+
+    def run():
+        for _ in range(N_SPOTS):
+            top_session_starts(window_scores(scores, 3, "mean", times=fc.time), 3, top_n=3)
+    return run
+
+
+# -------------------------
+# utils
+# -------------------------
+@case("utils.deg_to_compass.scalar_10k")
+def _(ctx):
+    from utils import deg_to_compass
+    degs = np.random.default_rng(0).uniform(0, 360, 10_000).tolist()
+    return lambda: [deg_to_compass(d) for d in degs]
+
+
+@case("utils.wind_relation_to_beach.scalar_10k")
+def _(ctx):
+    from utils import wind_relation_to_beach
+    degs = np.random.default_rng(1).uniform(0, 360, 10_000).tolist()
+    return lambda: [wind_relation_to_beach(d, 270) for d in degs]
+
+
+@case("utils.haversine_km.scalar_10k_spots")
+def _(ctx):
+    from utils import haversine_km
+    spots = ctx["spots_10k"]
+    return lambda: [haversine_km(32.09, 34.77, s["lat"], s["lon"]) for s in spots]
+
+
+@case("utils.haversine_km_array.10k_spots")
+def _(ctx):
+    from utils import haversine_km_array
+    lat = np.array([s["lat"] for s in ctx["spots_10k"]])
+    lon = np.array([s["lon"] for s in ctx["spots_10k"]])
+    return lambda: haversine_km_array(32.09, 34.77, lat, lon)
+
+
+# -------------------------
+# Favorites
+# -------------------------
+@case("favorites.load.cached")
+def _(ctx):
+    from favorites import FavoritesStore
+    store = FavoritesStore(ctx["tmp"] / "favorites_load.json")
+    store.save([s["name"] for s in ctx["spots_10k"][:200]])
+    return lambda: store.load()
+
+
+@case("favorites.toggle")
+def _(ctx):
+    from favorites import FavoritesStore
+    store = FavoritesStore(ctx["tmp"] / "favorites_toggle.json")
+    store.save([s["name"] for s in ctx["spots_10k"][:200]])
+    return lambda: store.toggle("Spot 00042")
+
+
+# -------------------------
+# End to end
+# -------------------------
+@case("e2e.app_rerun.mocked_http", repeat=3)
+def _(ctx):
+    # Full script run with every provider served from the fixtures. Streamlit's
+    # resource caches persist between runs, so this measures a warm rerun.
+    # Runs in a scratch directory: the app's cache files are relative paths.
+    from streamlit.testing.v1 import AppTest
+
+    recorded.install_fake_http()
+    app_dir = ctx["tmp"] / "app"
+    app_dir.mkdir(exist_ok=True)
+
+    def render():
+        with recorded.working_dir(app_dir):
+            at = AppTest.from_file(str(recorded.APP_PATH), default_timeout=120)
+            at.secrets["api_key"] = "bench"
+            at.run()
+        if at.exception:
+            raise RuntimeError(at.exception[0].message)
+
+    return render
+
+
+def _context(tmp: Path) -> dict:
+    from forecast import marine_to_df
+
+    ctx = {
+        "tmp": tmp,
+        "marine_week": recorded.marine(168),
+        "marine_year": recorded.marine(YEAR),
+        "spots_10k": recorded.synthetic_spots(N_SPOTS),
+    }
+    ctx["df_week"] = marine_to_df(ctx["marine_week"], 270)
+    ctx["df_year"] = marine_to_df(ctx["marine_year"], 270)
+    return ctx
+
+
+def run(only: str | None = None) -> dict:
+    results = {}
+    with tempfile.TemporaryDirectory() as d:
+        ctx = _context(Path(d))
+        for name, (factory, repeat) in CASES.items():
+            if only and only not in name:
+                continue
+            fn = factory(ctx)
+            fn()  # warm-up
+            times = []
+            for _ in range(repeat):
+                t0 = time.perf_counter()
+                fn()
+                times.append(time.perf_counter() - t0)
+            results[name] = {"median_ms": statistics.median(times) * 1000, "min_ms": min(times) * 1000, "runs": repeat}
+            print(f"{name:<45} {results[name]['median_ms']:10.3f} ms", flush=True)
+    return results
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list[str]:
+    regressions = []
+    for name, res in results.items():
+        base = baseline.get("cases", {}).get(name)
+        if not base:
+            continue
+        ratio = res["median_ms"] / base["median_ms"] if base["median_ms"] else 1.0
+        if ratio > 1 + threshold:
+            regressions.append(f"{name}: {base['median_ms']:.3f} -> {res['median_ms']:.3f} ms (x{ratio:.2f})")
+    return regressions
+
+
+def main(argv=None) -> int:
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    p.add_argument("--only", help="Run only cases whose name contains this")
+    p.add_argument("--save-baseline", action="store_true")
+    p.add_argument("--baseline", type=Path, default=BASELINE_FILE)
+    p.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="Allowed slowdown (0.2 = 20%%)")
+    args = p.parse_args(argv)
+
+    report = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "machine": platform.platform(),
+        "cases": run(args.only),
+    }
+    RESULTS_DIR.mkdir(exist_ok=True)
+    (RESULTS_DIR / "latest.json").write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps(report, indent=2), encoding="utf-8")
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+
+    if not args.baseline.exists():
+        print(f"No baseline at {args.baseline}; run with --save-baseline first.")
+        return 0
+
+    regressions = compare(report["cases"], json.loads(args.baseline.read_text(encoding="utf-8")), args.threshold)
+    if regressions:
+        print(f"\nRegressions (> {args.threshold:.0%} slower than baseline):")
+        for line in regressions:
+            print("  " + line)
+        return 1
+    print(f"\nNo regressions beyond {args.threshold:.0%}.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
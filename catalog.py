@@ -0,0 +1,154 @@
+import csv
+import json
+import os
+import threading
+from pathlib import Path
+
+import pandas as pd
+
+from spots import SURF_SPOTS
+
+# Point this at a spot file (.csv / .jsonl / .parquet) or a directory of per-country shards
+CATALOG_ENV = "SURF_SPOTS_PATH"
+SUPPORTED_SUFFIXES = (".csv", ".jsonl", ".parquet")
+
+
+class SpotCatalogError(Exception):
+    pass
+
+
+def validate_spot(rec: dict, shard_country: str | None = None) -> dict:
+    """
+    Normalize one raw record (strings from CSV are fine). Raises SpotCatalogError on bad data.
+    A record from a per-country shard without a country gets shard_country; one naming
+    another country is rejected, since spots(shard_country) would never list it.
+    """
+    try:
+        name = str(rec["name"]).strip()
+        lat = float(rec["lat"])
+        lon = float(rec["lon"])
+    except (KeyError, TypeError, ValueError) as e:
+        raise SpotCatalogError(f"Invalid spot record {rec!r}: {e}")
+
+    if not name:
+        raise SpotCatalogError(f"Spot without a name: {rec!r}")
+    if not -90 <= lat <= 90 or not -180 <= lon <= 180:
+        raise SpotCatalogError(f"Spot {name!r} has out-of-range coordinates ({lat}, {lon})")
+
+    facing = rec.get("beach_facing_deg")
+    facing = 270.0 if facing in (None, "") or pd.isna(facing) else float(facing) % 360
+    country = rec.get("country")
+    country = "" if country is None or pd.isna(country) else str(country).strip().upper()
+    if shard_country is not None:
+        if country and country != shard_country:
+            raise SpotCatalogError(f"Spot {name!r} is in the {shard_country} shard but has country {country!r}")
+        country = shard_country
+
+    return {"name": name, "lat": lat, "lon": lon, "country": country, "beach_facing_deg": facing}
+
+
+def read_spot_file(path: Path | str) -> list[dict]:
+    """
+    Raw records from a .csv, .jsonl or .parquet file (.parquet needs pyarrow).
+    """
+    path = Path(path)
+    suffix = path.suffix.lower()
+    if suffix == ".csv":
+        with path.open(newline="", encoding="utf-8") as f:
+            return list(csv.DictReader(f))
+    if suffix == ".jsonl":
+        with path.open(encoding="utf-8") as f:
+            return [json.loads(line) for line in f if line.strip()]
+    if suffix == ".parquet":
+        return pd.read_parquet(path).to_dict("records")
+    raise SpotCatalogError(f"Unsupported spot file type: {path.name}")
+
+
+class SpotCatalog:
+    """
+    Validated spot records with O(1) name and country indexes.
+    A catalog built from a shard directory (one <COUNTRY>.<ext> file per country)
+    only reads a shard the first time that country is asked for.
+    """
+
+    def __init__(self, spots: list[dict] | None = None, shards: dict[str, Path] | None = None):
+        self._by_name: dict[str, dict] = {}
+        self._by_country: dict[str, list[dict]] = {}
+        self._shards = dict(shards or {})
+        self.sharded = bool(self._shards)
+        self._lock = threading.Lock()  # shared across Streamlit sessions via cache_resource
+        self._add(spots or [])
+
+    @classmethod
+    def from_file(cls, path: Path | str) -> "SpotCatalog":
+        return cls(read_spot_file(path))
+
+    @classmethod
+    def from_shards(cls, directory: Path | str) -> "SpotCatalog":
+        directory = Path(directory)
+        shards = {
+            p.stem.upper(): p
+            for p in sorted(directory.iterdir())
+            if p.suffix.lower() in SUPPORTED_SUFFIXES
+        }
+        if not shards:
+            raise SpotCatalogError(f"No spot shards found in {directory}")
+        return cls(shards=shards)
+
+    @classmethod
+    def default(cls) -> "SpotCatalog":
+        """
+        SURF_SPOTS_PATH (file or shard directory) if set, otherwise the built-in spots.SURF_SPOTS.
+        """
+        path = os.environ.get(CATALOG_ENV)
+        if not path:
+            return cls(SURF_SPOTS)
+        return cls.from_shards(path) if Path(path).is_dir() else cls.from_file(path)
+
+    def _add(self, records: list[dict], shard_country: str | None = None) -> None:
+        for rec in records:
+            spot = validate_spot(rec, shard_country)
+            if spot["name"] in self._by_name:
+                raise SpotCatalogError(f"Duplicate spot name: {spot['name']!r}")
+            self._by_name[spot["name"]] = spot
+            self._by_country.setdefault(spot["country"], []).append(spot)
+
+    def _load_shard(self, country: str) -> None:
+        with self._lock:
+            path = self._shards.pop(country, None)
+            if path is not None:
+                self._add(read_spot_file(path), shard_country=country)
+
+    def countries(self) -> list[str]:
+        return sorted(set(self._by_country) | set(self._shards))
+
+    def spots(self, country: str | None = None) -> list[dict]:
+        if country is not None:
+            self._load_shard(country)
+            return list(self._by_country.get(country, []))
+        for c in list(self._shards):
+            self._load_shard(c)
+        return list(self._by_name.values())
+
+    def names(self, country: str | None = None) -> list[str]:
+        return [s["name"] for s in self.spots(country)]
+
+    def get(self, name: str, country: str | None = None) -> dict | None:
+        """
+        Spot by exact name. Unloaded shards are only read if the name isn't already known.
+        """
+        if name not in self._by_name:
+            if country is not None:
+                self._load_shard(country)
+            else:
+                for c in list(self._shards):
+                    self._load_shard(c)
+                    if name in self._by_name:
+                        break
+        return self._by_name.get(name)
+
+    def __contains__(self, name: str) -> bool:
+        return self.get(name) is not None
+
+    def __len__(self) -> int:
+        return len(self._by_name)
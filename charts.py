@@ -0,0 +1,100 @@
+import numpy as np
+import pandas as pd
+
+# Max points drawn per series before LTTB downsampling kicks in
+DEFAULT_POINT_BUDGET = 500
+
+FORECAST_SERIES = [
+    ("wave_height", "🌊 Wave height (m)"),
+    ("wave_period", "⏱️ Wave period (s)"),
+    ("wind_speed", "💨 Wind speed"),
+    ("surf_score", "🏄 Surf score (0-100)"),
+]
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets: indices of `threshold` points that keep the
+    visual shape (peaks and troughs) of the series. First and last points are kept.
+    NaN values in y are dropped before sampling (downsample puts the gaps back).
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    valid = np.flatnonzero(~np.isnan(y))
+    n = len(valid)
+    if threshold >= n or threshold < 3:
+        return valid
+
+    xs, ys = x[valid], y[valid]
+    out = np.empty(threshold, dtype=np.int64)
+    out[0], out[-1] = 0, n - 1
+
+    # Bucket edges over the interior points 1..n-2
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    a = 0
+    for i in range(threshold - 2):
+        lo, hi = edges[i], edges[i + 1]
+        # Average of the next bucket (or the last point for the final bucket)
+        nlo, nhi = (edges[i + 1], edges[i + 2]) if i + 2 < len(edges) else (n - 1, n)
+        avg_x, avg_y = xs[nlo:nhi].mean(), ys[nlo:nhi].mean()
+
+        area = np.abs((xs[a] - avg_x) * (ys[lo:hi] - ys[a]) - (xs[a] - xs[lo:hi]) * (avg_y - ys[a]))
+        a = lo + int(np.argmax(area))
+        out[i + 1] = a
+
+    return valid[out]
+
+
+def downsample(df: pd.DataFrame, x: str, y: str, budget: int = DEFAULT_POINT_BUDGET) -> pd.DataFrame:
+    """
+    Rows of df[[x, y]] picked by LTTB, at most `budget` of them, plus the first NaN
+    row of every gap between two picked rows, so a line breaks there instead of
+    joining across the missing hours.
+    """
+    xs = df[x]
+    if pd.api.types.is_datetime64_any_dtype(xs):
+        xs = xs.astype("int64")
+    ys = df[y].to_numpy(dtype=float)
+    idx = lttb_indices(xs.to_numpy(), ys, budget)
+
+    missing = np.flatnonzero(np.isnan(ys))
+    if len(idx) and len(missing):
+        # First NaN after each picked row, kept where it comes before the next pick
+        first = np.searchsorted(missing, idx[:-1], side="right")
+        nxt = missing[np.minimum(first, len(missing) - 1)]
+        breaks = nxt[(first < len(missing)) & (nxt < idx[1:])]
+        idx = np.sort(np.concatenate([idx, breaks]))
+    return df[[x, y]].iloc[idx]
+
+
+def forecast_figure(df_scored: pd.DataFrame, budget: int = DEFAULT_POINT_BUDGET,
+                    series: list[tuple[str, str]] = FORECAST_SERIES):
+    """
+    One figure with a shared time axis and one row per series, each downsampled
+    to `budget` points. Replaces four separate px.line charts (and four copies of the frame).
+    """
+    # Imported here so the app only pays for plotly when charts are drawn
+    import plotly.graph_objects as go
+    from plotly.subplots import make_subplots
+
+    series = [(col, title) for col, title in series if col in df_scored]
+    fig = make_subplots(
+        rows=len(series), cols=1, shared_xaxes=True, vertical_spacing=0.04,
+        subplot_titles=[title for _, title in series],
+    )
+    for row, (col, title) in enumerate(series, start=1):
+        part = downsample(df_scored, "time", col, budget)
+        # Plain lists of floats and ISO strings keep the JSON payload small; None breaks the line
+        y = part[col].astype(float).round(3)
+        fig.add_trace(
+            go.Scatter(
+                x=part["time"].dt.strftime("%Y-%m-%dT%H:%M").tolist(),
+                y=y.astype(object).where(y.notna(), None).tolist(),
+                mode="lines",
+                name=title,
+                showlegend=False,
+            ),
+            row=row, col=1,
+        )
+    fig.update_layout(height=220 * len(series), margin=dict(l=40, r=20, t=40, b=30), hovermode="x unified")
+    return fig
@@ -0,0 +1,234 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from utils import snap
+
+CACHE_FILE = Path("forecast_cache.sqlite")
+
+# Seconds before an entry is stale (it is still served while a refresh runs)
+PROVIDER_TTL = {
+    "openweather": 600,
+    "marine": 3600,
+    "extras": 3600,
+}
+
+# Coordinates are snapped to roughly the provider's own grid (degrees)
+PROVIDER_GRID = {
+    "openweather": 0.01,
+    "marine": 0.05,
+    "extras": 0.1,
+}
+
+# Seconds past the TTL a stale entry is still served; beyond that it is fetched synchronously
+PROVIDER_MAX_STALE = {
+    "openweather": 3600,
+    "marine": 6 * 3600,
+    "extras": 6 * 3600,
+}
+
+DEFAULT_TTL = 600
+DEFAULT_MAX_STALE = 3600
+DEFAULT_GRID = 0.01
+
+# Env vars that point a provider at another server (a mirror, benchmarks.mock_server).
+# Keys for data fetched through an override carry a hash of its URL, so mock payloads
+# are never served as real data and never overwrite it.
+BASE_URL_ENV = {
+    "openweather": "OPENWEATHER_BASE_URL",
+    "geocode": "OPENWEATHER_BASE_URL",
+    "marine": "OPEN_METEO_MARINE_BASE_URL",
+    "extras": "OPEN_METEO_BASE_URL",
+    "wiki": "WIKIPEDIA_BASE_URL",
+}
+
+
+def source_tag(provider: str) -> str:
+    """
+    "" for the provider's real API, "@<hash>" while its base URL is overridden.
+    """
+    url = os.environ.get(BASE_URL_ENV.get(provider, ""), "").rstrip("/")
+    return f"@{hashlib.sha1(url.encode('utf-8')).hexdigest()[:8]}" if url else ""
+
+
+class ForecastCache:
+    """
+    Persistent SQLite cache for provider payloads with stale-while-revalidate.
+    Expired entries are returned immediately and refreshed in the background, up to
+    PROVIDER_MAX_STALE past their TTL. Total payload size is capped; least recently
+    used entries are evicted first. Reads only note the access time in memory; it is
+    written with the next put, before anything is evicted.
+    Named counters (see increment) live in their own table: never evicted or cleared.
+    """
+
+    def __init__(self, path: Path | str = CACHE_FILE, max_bytes: int = 50 * 1024 * 1024):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+        self.expired = 0
+        self.evictions = 0
+
+        self._lock = threading.Lock()
+        self._touched: dict[str, float] = {}
+        self._refreshing: set[str] = set()
+        self._pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="cache-refresh")
+
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                payload TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                fetched_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+            """
+        )
+        self._db.execute("CREATE TABLE IF NOT EXISTS counters (name TEXT PRIMARY KEY, n INTEGER NOT NULL)")
+        self._db.commit()
+
+    @staticmethod
+    def make_key(provider: str, lat: float, lon: float, extra: str = "") -> str:
+        grid = PROVIDER_GRID.get(provider, DEFAULT_GRID)
+        return f"{provider}:{snap(lat, grid)}:{snap(lon, grid)}:{extra}{source_tag(provider)}"
+
+    def get(self, key: str):
+        """
+        Returns (payload, fetched_at) or None.
+        """
+        with self._lock:
+            row = self._db.execute("SELECT payload, fetched_at FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            # No write (and no fsync) per read: see _flush_touched
+            self._touched[key] = time.time()
+        return json.loads(row[0]), row[1]
+
+    def put(self, key: str, payload) -> float:
+        """
+        Store payload; returns the fetched_at recorded for it.
+        """
+        text = json.dumps(payload, ensure_ascii=False, separators=(",", ":"))
+        now = time.time()
+        with self._lock:
+            self._flush_touched()
+            self._db.execute(
+                "INSERT OR REPLACE INTO entries (key, payload, size, fetched_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                (key, text, len(text.encode("utf-8")), now, now),
+            )
+            self._evict()
+            self._db.commit()
+        return now
+
+    def _flush_touched(self) -> None:
+        # Caller holds the lock and commits
+        if self._touched:
+            self._db.executemany(
+                "UPDATE entries SET accessed_at = ? WHERE key = ?", [(t, k) for k, t in self._touched.items()]
+            )
+            self._touched.clear()
+
+    def _evict(self) -> None:
+        # Caller holds the lock
+        total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in self._db.execute("SELECT key, size FROM entries ORDER BY accessed_at").fetchall():
+            self._db.execute("DELETE FROM entries WHERE key = ?", (key,))
+            self.evictions += 1
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def counter(self, name: str) -> int:
+        with self._lock:
+            row = self._db.execute("SELECT n FROM counters WHERE name = ?", (name,)).fetchone()
+        return 0 if row is None else row[0]
+
+    def increment(self, name: str, by: int = 1, limit: int | None = None) -> int | None:
+        """
+        Add `by` to a named counter and return its new value, or None (and leave it alone)
+        if that would take it past `limit`. Check and add are one write transaction, so
+        processes sharing the file never lose or overshoot each other's counts.
+        """
+        with self._lock:
+            self._db.execute("INSERT OR IGNORE INTO counters (name, n) VALUES (?, 0)", (name,))
+            updated = self._db.execute(
+                "UPDATE counters SET n = n + ? WHERE name = ? AND (? IS NULL OR n + ? <= ?)",
+                (by, name, limit, by, limit),
+            ).rowcount
+            n = self._db.execute("SELECT n FROM counters WHERE name = ?", (name,)).fetchone()[0]
+            self._db.commit()
+        return n if updated else None
+
+    def _refresh(self, key: str, fetch) -> None:
+        try:
+            self.put(key, fetch())
+        except Exception:
+            # Keep serving the stale copy; the next read will try again
+            pass
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    def get_or_fetch(self, provider: str, lat: float, lon: float, fetch, extra: str = ""):
+        """
+        Return the cached payload for provider+coords, calling fetch() on a miss.
+        A stale entry is returned as-is and fetch() runs in the background; one more
+        than PROVIDER_MAX_STALE past its TTL is fetched synchronously, like a miss.
+        """
+        key = self.make_key(provider, lat, lon, extra)
+        found = self.get(key)
+        ttl = PROVIDER_TTL.get(provider, DEFAULT_TTL)
+        age = None if found is None else time.time() - found[1]
+
+        if found is not None and age < ttl:
+            with self._lock:
+                self.hits += 1
+            return found[0]
+
+        if found is None or age >= ttl + PROVIDER_MAX_STALE.get(provider, DEFAULT_MAX_STALE):
+            with self._lock:
+                if found is None:
+                    self.misses += 1
+                else:
+                    self.expired += 1
+            payload = fetch()
+            self.put(key, payload)
+            return payload
+
+        payload = found[0]
+        with self._lock:
+            self.stale += 1
+            start = key not in self._refreshing
+            self._refreshing.add(key)
+        if start:
+            self._pool.submit(self._refresh, key, fetch)
+        return payload
+
+    def stats(self) -> dict:
+        with self._lock:
+            entries, size = self._db.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries").fetchone()
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "stale": self.stale,
+                "expired": self.expired,
+                "evictions": self.evictions,
+                "entries": entries,
+                "bytes": size,
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._db.execute("DELETE FROM entries")
+            self._db.commit()
+            self._touched.clear()
@@ -1,21 +1,41 @@
-import requests
+import os
 
-BASE_FORECAST = "https://api.open-meteo.com/v1/forecast"
+import http_client
+from metrics import timed
+
+# Override with OPEN_METEO_BASE_URL to point at a mirror or benchmarks.mock_server
+OPEN_METEO_BASE_URL = os.environ.get("OPEN_METEO_BASE_URL", "https://api.open-meteo.com").rstrip("/")
+BASE_FORECAST = f"{OPEN_METEO_BASE_URL}/v1/forecast"
 
 
 class ExtrasAPIError(Exception):
     pass
 
 
-def get_extras(lat: float, lon: float) -> dict:
-    params = {
+def _params(lat, lon) -> dict:
+    # lat/lon may be comma-separated lists (batch requests)
+    return {
         "latitude": lat,
         "longitude": lon,
         "timezone": "auto",
         "hourly": "uv_index,shortwave_radiation,visibility,cloud_cover,precipitation,temperature_2m",
         "daily": "sunrise,sunset",
     }
-    r = requests.get(BASE_FORECAST, params=params, timeout=20)
+
+
+@timed("api.extras")
+def get_extras(lat: float, lon: float) -> dict:
+    r = http_client.get(BASE_FORECAST, params=_params(lat, lon), timeout=20)
     if r.status_code != 200:
         raise ExtrasAPIError("Extras API error")
     return r.json()
+
+
+@timed("api.extras.batch")
+def get_extras_batch(spots: list[dict], chunk_size: int = 50) -> dict[str, dict]:
+    """
+    Fetch many spots with one request per chunk. Returns {spot name: payload}, the same
+    payload get_extras would return for that spot.
+    If a chunk fails, its spots are fetched one by one; spots that still fail are left out.
+    """
+    return http_client.get_batched(BASE_FORECAST, spots, _params, get_extras, ExtrasAPIError, chunk_size)
@@ -1,39 +1,202 @@
 import json
+import os
+import re
+import stat
+import tempfile
+import threading
+from contextlib import contextmanager
 from pathlib import Path
 
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
 FAV_FILE = Path("favorites.json")
+# Mode for a new favorites file (mkstemp's temp files are 0600)
+NEW_FILE_MODE = 0o644
+
+
+def _lock_file(f, lock: bool) -> None:
+    if fcntl is not None:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX if lock else fcntl.LOCK_UN)
+    else:
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_LOCK if lock else msvcrt.LK_UNLCK, 1)
 
 
-def load_favorites() -> list[str]:
-    if not FAV_FILE.exists():
-        return []
+@contextmanager
+def _file_lock(path: Path):
+    """
+    Exclusive cross-process lock on a sidecar <file>.lock.
+    If the sidecar can't be opened or locked (e.g. a read-only disk), this is a no-op
+    and only the caller's in-process lock applies.
+    """
     try:
-        return json.loads(FAV_FILE.read_text(encoding="utf-8"))
-    except Exception:
-        return []
+        f = open(path.with_name(path.name + ".lock"), "a+b")
+    except OSError:
+        f = None
+    if f is not None:
+        try:
+            _lock_file(f, True)
+        except OSError:
+            f.close()
+            f = None
+
+    try:
+        yield
+    finally:
+        if f is not None:
+            try:
+                _lock_file(f, False)
+            finally:
+                f.close()
 
 
-def save_favorites(favs: list[str]) -> None:
+def _dedupe(favs) -> list[str]:
     seen = set()
     clean = []
     for x in favs:
         if x not in seen:
             clean.append(x)
             seen.add(x)
+    return clean
 
-    try:
-        FAV_FILE.write_text(json.dumps(clean, ensure_ascii=False, indent=2), encoding="utf-8")
-    except Exception:
-        # On Streamlit Cloud it may reset; it's ok for the project.
-        pass
 
+class FavoritesStore:
+    """
+    Favorites list backed by a JSON file.
+    Reads are served from memory until the file's inode/mtime/size changes; writes go to a
+    temp file that is renamed over the original, under a file lock.
+    """
+
+    def __init__(self, path: Path | str = FAV_FILE):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._stamp = None
+        self._favs: list[str] = []
+        self._set: set[str] = set()
+
+    def _file_stamp(self):
+        try:
+            st = self.path.stat()
+        except OSError:
+            return None
+        return st.st_ino, st.st_mtime_ns, st.st_size
+
+    def _refresh(self) -> None:
+        # Caller holds self._lock
+        stamp = self._file_stamp()
+        if stamp == self._stamp:
+            return
+        favs = []
+        if stamp is not None:
+            try:
+                data = json.loads(self.path.read_text(encoding="utf-8"))
+                favs = _dedupe(x for x in data if isinstance(x, str)) if isinstance(data, list) else []
+            except (OSError, ValueError):
+                favs = []
+        self._set_favs(favs, stamp)
+
+    def _set_favs(self, favs: list[str], stamp) -> None:
+        self._favs = favs
+        self._set = set(favs)
+        self._stamp = stamp
+
+    def _write(self, favs: list[str]) -> None:
+        # Caller holds both locks
+        text = json.dumps(favs, ensure_ascii=False, indent=2)
+        fd, tmp = tempfile.mkstemp(dir=self.path.parent or ".", prefix=self.path.name, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(text)
+                f.flush()
+                os.fsync(f.fileno())
+            # The rename keeps the temp file's mode: give it the one it replaces
+            try:
+                mode = stat.S_IMODE(self.path.stat().st_mode)
+            except FileNotFoundError:
+                mode = NEW_FILE_MODE
+            os.chmod(tmp, mode)
+            os.replace(tmp, self.path)
+        except OSError:
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+            raise
+
+    def load(self) -> list[str]:
+        with self._lock:
+            self._refresh()
+            return list(self._favs)
+
+    def contains(self, name: str) -> bool:
+        with self._lock:
+            self._refresh()
+            return name in self._set
+
+    def _update(self, change) -> list[str]:
+        with self._lock, _file_lock(self.path):
+            self._stamp = None  # always re-read under the file lock
+            self._refresh()
+            favs = change(list(self._favs))
+            favs = _dedupe(favs)
+            try:
+                self._write(favs)
+                self._set_favs(favs, self._file_stamp())
+            except OSError:
+                # On Streamlit Cloud the disk may be read-only; keep the change in memory
+                self._set_favs(favs, self._stamp)
+            return list(favs)
+
+    def save(self, favs: list[str]) -> None:
+        self._update(lambda _: list(favs))
+
+    def toggle(self, name: str) -> list[str]:
+        def change(favs):
+            if name in favs:
+                favs.remove(name)
+            else:
+                favs.insert(0, name)
+            return favs
+
+        return self._update(change)
+
+
+_stores: dict[str, FavoritesStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_store(namespace: str | None = None) -> FavoritesStore:
+    """
+    Store for a namespace (e.g. a user id). The default namespace uses favorites.json,
+    others use favorites.<namespace>.json next to it.
+    """
+    key = namespace or ""
+    with _stores_lock:
+        if key not in _stores:
+            if key:
+                safe = re.sub(r"[^A-Za-z0-9_.-]", "_", key)
+                path = FAV_FILE.with_name(f"{FAV_FILE.stem}.{safe}{FAV_FILE.suffix}")
+            else:
+                path = FAV_FILE
+            _stores[key] = FavoritesStore(path)
+        return _stores[key]
+
+
+def load_favorites(namespace: str | None = None) -> list[str]:
+    return get_store(namespace).load()
+
+
+def is_favorite(name: str, namespace: str | None = None) -> bool:
+    return get_store(namespace).contains(name)
+
+
+def save_favorites(favs: list[str], namespace: str | None = None) -> None:
+    get_store(namespace).save(favs)
 
-def toggle_favorite(name: str) -> list[str]:
-    favs = load_favorites()
-    if name in favs:
-        favs.remove(name)
-    else:
-        favs.insert(0, name)
-    save_favorites(favs)
-    return favs
 
+def toggle_favorite(name: str, namespace: str | None = None) -> list[str]:
+    return get_store(namespace).toggle(name)
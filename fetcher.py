@@ -0,0 +1,64 @@
+import contextvars
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from weather_api import get_current_by_coords
+from marine_api import get_marine_hourly
+from extras_api import get_extras
+from metrics import timed
+
+_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="fetch")
+
+
+def _timed(fn, *args, **kwargs):
+    t0 = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, time.perf_counter() - t0
+
+
+def _cached(cache, provider: str, lat: float, lon: float, fn, *args, extra: str = "", **kwargs):
+    if cache is None:
+        return fn(*args, **kwargs)
+    return cache.get_or_fetch(provider, lat, lon, lambda: fn(*args, **kwargs), extra=extra)
+
+
+@timed("fetch.spot")
+def fetch_spot(lat: float, lon: float, api_key: str, units: str = "metric", parallel: bool = True, cache=None,
+               quota=None):
+    """
+    Fetch current weather + marine + extras for one location.
+    Returns (current, marine, extras, timings) where timings holds seconds per provider
+    and the wall-clock "total". With parallel=True the three calls run at the same time,
+    so total is roughly the slowest single call.
+    Provider errors are re-raised in the same order as the sequential path.
+    With a disk_cache.ForecastCache, each provider is read through the cache.
+    With a quota.QuotaManager, OpenWeather goes through its budget and weather cells instead.
+    """
+    if quota is not None:
+        openweather = (quota.current, (lat, lon), {"units": units})
+    else:
+        openweather = (
+            _cached,
+            (cache, "openweather", lat, lon, get_current_by_coords, lat, lon, api_key),
+            {"units": units, "extra": units},
+        )
+    calls = {
+        "openweather": openweather,
+        "marine": (_cached, (cache, "marine", lat, lon, get_marine_hourly, lat, lon), {}),
+        "extras": (_cached, (cache, "extras", lat, lon, get_extras, lat, lon), {}),
+    }
+
+    t0 = time.perf_counter()
+    if parallel:
+        # Copied contexts keep per-run metrics attached to the calling session
+        futures = {
+            name: _pool.submit(contextvars.copy_context().run, _timed, fn, *args, **kw)
+            for name, (fn, args, kw) in calls.items()
+        }
+        done = {name: f.result() for name, f in futures.items()}
+    else:
+        done = {name: _timed(fn, *args, **kw) for name, (fn, args, kw) in calls.items()}
+
+    timings = {name: secs for name, (_, secs) in done.items()}
+    timings["total"] = time.perf_counter() - t0
+    return done["openweather"][0], done["marine"][0], done["extras"][0], timings
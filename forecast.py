@@ -0,0 +1,161 @@
+import time
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from metrics import timed
+from utils import COMPASS_POINTS, WIND_RELATIONS, WIND_RELATION_COLORS, compass_codes, wind_relation_codes
+
+MARINE_COLUMNS = {
+    "wave_height": "wave_height",
+    "wave_period": "wave_period",
+    "wave_dir_deg": "wave_direction",
+    "wind_speed": "wind_speed_10m",
+    "wind_dir_deg": "wind_direction_10m",
+}
+
+
+# Built once: validating categories on every decode is the expensive part of from_codes.
+# The trailing "" is where missing values (-1) go, so label columns never hold NaN.
+COMPASS_DTYPE = pd.CategoricalDtype(COMPASS_POINTS + [""])
+RELATION_DTYPE = pd.CategoricalDtype(WIND_RELATIONS + [""])
+RELATION_COLOR_DTYPE = pd.CategoricalDtype(WIND_RELATION_COLORS + [""])
+
+
+def _labels(codes: np.ndarray, dtype: pd.CategoricalDtype) -> pd.Categorical:
+    codes = np.where(codes < 0, len(dtype.categories) - 1, codes)
+    return pd.Categorical.from_codes(codes, dtype=dtype)
+
+
+@timed("parse.marine_to_df")
+def marine_to_df(marine_json: dict, beach_facing_deg: float) -> pd.DataFrame:
+    """
+    Open-Meteo marine JSON -> hourly DataFrame with compass and wind relation labels.
+    Label columns are categoricals; null degrees get an empty label.
+    """
+    h = marine_json.get("hourly", {})
+    data = {"time": pd.to_datetime(h.get("time", []), format="ISO8601")}
+    for col, key in MARINE_COLUMNS.items():
+        # dtype=float turns JSON nulls into NaN
+        data[col] = np.asarray(h.get(key, []), dtype=float)
+
+    df = pd.DataFrame(data)
+    if df.empty:
+        return df
+
+    rel = wind_relation_codes(df["wind_dir_deg"].to_numpy(), beach_facing_deg)
+
+    df["wave_dir"] = _labels(compass_codes(df["wave_dir_deg"].to_numpy()), COMPASS_DTYPE)
+    df["wind_dir"] = _labels(compass_codes(df["wind_dir_deg"].to_numpy()), COMPASS_DTYPE)
+    df["wind_relation"] = _labels(rel, RELATION_DTYPE)
+    df["wind_relation_color"] = _labels(rel, RELATION_COLOR_DTYPE)
+
+    return df
+
+
+def upcoming(df: pd.DataFrame, utc_offset_seconds: int, now: float | None = None) -> pd.DataFrame:
+    """
+    Rows of a marine_to_df frame whose hour hasn't ended yet at `now` (epoch seconds,
+    default: the current time). "time" is the spot's local time, hence the offset.
+    """
+    now = time.time() if now is None else now
+    utc = df["time"].to_numpy().astype("datetime64[s]").astype(np.int64) - utc_offset_seconds
+    return df[utc + 3600 > now]
+
+
+def daylight_mask(local_times: np.ndarray, extras_json: dict) -> np.ndarray:
+    """
+    True for hours that are mostly daylight (the half-hour mark falls between that
+    day's sunrise and sunset), from the daily sunrise/sunset of extras_api.get_extras.
+    local_times are wall-clock epoch seconds; marine and extras both use timezone=auto,
+    so their clocks agree. Days without sunrise/sunset (polar day/night) and hours
+    outside the days the extras cover count as dark.
+    """
+    daily = extras_json.get("daily", {})
+    times = np.asarray(local_times, dtype=np.int64)
+    rise_raw = pd.to_datetime(daily.get("sunrise", []), format="ISO8601", errors="coerce")
+    set_raw = pd.to_datetime(daily.get("sunset", []), format="ISO8601", errors="coerce")
+    known = ~(rise_raw.isna() | set_raw.isna())
+    if not known.any():
+        return np.zeros(len(times), dtype=bool)
+    rise = rise_raw[known].as_unit("s").asi8
+    sets = set_raw[known].as_unit("s").asi8
+
+    mid = times + 1800
+    day = np.searchsorted(rise, mid, side="right") - 1
+    return (day >= 0) & (mid < sets[np.maximum(day, 0)])
+
+
+@dataclass
+class CompactForecast:
+    """
+    Typed, compact hourly marine forecast: float32 per variable, int64 epoch
+    seconds (UTC) for time and int8 codes for the labels (-1 = missing).
+    Labels are only decoded by to_df(), i.e. at display time.
+    """
+
+    time: np.ndarray
+    utc_offset_seconds: int
+    wave_height: np.ndarray
+    wave_period: np.ndarray
+    wave_dir_deg: np.ndarray
+    wind_speed: np.ndarray
+    wind_dir_deg: np.ndarray
+    wave_dir: np.ndarray
+    wind_dir: np.ndarray
+    wind_relation: np.ndarray
+
+    @classmethod
+    @timed("parse.compact_forecast")
+    def from_marine_json(cls, marine_json: dict, beach_facing_deg: float) -> "CompactForecast":
+        h = marine_json.get("hourly", {})
+        offset = int(marine_json.get("utc_offset_seconds", 0) or 0)
+        # Open-Meteo times are local wall-clock (timezone=auto); store them as UTC epochs
+        local = pd.to_datetime(h.get("time", []), format="ISO8601")
+        epoch = np.asarray(local.as_unit("s").asi8, dtype=np.int64) - offset
+
+        cols = {col: np.asarray(h.get(key, []), dtype=float).astype(np.float32) for col, key in MARINE_COLUMNS.items()}
+        return cls(
+            time=epoch,
+            utc_offset_seconds=offset,
+            **cols,
+            wave_dir=compass_codes(cols["wave_dir_deg"]),
+            wind_dir=compass_codes(cols["wind_dir_deg"]),
+            wind_relation=wind_relation_codes(cols["wind_dir_deg"], beach_facing_deg),
+        )
+
+    def __len__(self) -> int:
+        return len(self.time)
+
+    @property
+    def local_time(self) -> np.ndarray:
+        """
+        Wall-clock epoch seconds at the spot (what the Open-Meteo strings said).
+        """
+        return self.time + self.utc_offset_seconds
+
+    @property
+    def nbytes(self) -> int:
+        return sum(v.nbytes for v in vars(self).values() if isinstance(v, np.ndarray))
+
+    def to_df(self, surf_score: np.ndarray | None = None, rows: np.ndarray | None = None,
+              columns: list[str] | None = None) -> pd.DataFrame:
+        """
+        Decode to the same columns as marine_to_df (plus surf_score if given).
+        rows selects a subset (e.g. the top hours) and columns limits what gets decoded.
+        """
+        sel = slice(None) if rows is None else rows
+        decoders = {
+            "time": lambda: pd.to_datetime(self.time[sel] + self.utc_offset_seconds, unit="s"),
+            # float32 -> float64 with the float32 noise rounded away for display
+            **{col: (lambda c=col: getattr(self, c)[sel].astype(float).round(4)) for col in MARINE_COLUMNS},
+            "wave_dir": lambda: _labels(self.wave_dir[sel], COMPASS_DTYPE),
+            "wind_dir": lambda: _labels(self.wind_dir[sel], COMPASS_DTYPE),
+            "wind_relation": lambda: _labels(self.wind_relation[sel], RELATION_DTYPE),
+            "wind_relation_color": lambda: _labels(self.wind_relation[sel], RELATION_COLOR_DTYPE),
+        }
+        if surf_score is not None:
+            decoders["surf_score"] = lambda: surf_score[sel]
+        # One constructor call; assigning columns one by one is much slower on small frames
+        return pd.DataFrame({col: decoders[col]() for col in (columns or decoders)})
@@ -0,0 +1,187 @@
+import bisect
+import csv
+import heapq
+import os
+import threading
+import time
+import unicodedata
+from collections import deque
+from pathlib import Path
+
+import numpy as np
+
+from disk_cache import ForecastCache, source_tag
+from weather_api import geocode_city
+
+GAZETTEER_FILE = Path(__file__).with_name("data") / "gazetteer.csv"
+GEOCODE_CACHE_FILE = Path("geocode_cache.sqlite")
+
+
+def normalize_name(name: str) -> str:
+    """
+    Case- and accent-insensitive form used for matching ("Nazaré" -> "nazare").
+    """
+    decomposed = unicodedata.normalize("NFKD", name)
+    plain = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return " ".join(plain.casefold().split())
+
+
+def read_gazetteer(path: Path | str) -> list[dict]:
+    """
+    Places from a CSV (name,state,country,lat,lon[,population]) or a GeoNames
+    cities dump (.txt, tab-separated). Records use OpenWeather's geocoding shape.
+    """
+    path = Path(path)
+    places = []
+    with path.open(newline="", encoding="utf-8") as f:
+        if path.suffix.lower() == ".csv":
+            for row in csv.DictReader(f):
+                places.append(
+                    {
+                        "name": row["name"],
+                        "state": row.get("state") or "",
+                        "country": row["country"],
+                        "lat": float(row["lat"]),
+                        "lon": float(row["lon"]),
+                        "population": int(row.get("population") or 0),
+                    }
+                )
+        else:
+            # GeoNames: name=1, lat=4, lon=5, country=8, admin1=10, population=14
+            for cols in csv.reader(f, delimiter="\t", quoting=csv.QUOTE_NONE):
+                places.append(
+                    {
+                        "name": cols[1],
+                        "state": cols[10],
+                        "country": cols[8],
+                        "lat": float(cols[4]),
+                        "lon": float(cols[5]),
+                        "population": int(cols[14] or 0),
+                    }
+                )
+    return places
+
+
+class Gazetteer:
+    """
+    Offline place index: names sorted once, prefix queries are two binary searches.
+    """
+
+    def __init__(self, places: list[dict]):
+        ranked = sorted(places, key=lambda p: (normalize_name(p["name"]), -p.get("population", 0)))
+        self.keys = [normalize_name(p["name"]) for p in ranked]
+        self.places = ranked
+
+    @classmethod
+    def from_file(cls, path: Path | str = GAZETTEER_FILE) -> "Gazetteer":
+        return cls(read_gazetteer(path))
+
+    def __len__(self) -> int:
+        return len(self.places)
+
+    def _range(self, prefix: str) -> tuple[int, int]:
+        lo = bisect.bisect_left(self.keys, prefix)
+        hi = bisect.bisect_left(self.keys, prefix + "\uffff", lo)
+        return lo, hi
+
+    def exact(self, name: str, limit: int = 5) -> list[dict]:
+        key = normalize_name(name)
+        lo = bisect.bisect_left(self.keys, key)
+        hi = bisect.bisect_right(self.keys, key, lo)
+        return self.places[lo:min(hi, lo + limit)]
+
+    def suggest(self, prefix: str, limit: int = 5) -> list[dict]:
+        """
+        Places whose name starts with prefix, most populous first.
+        """
+        key = normalize_name(prefix)
+        if not key:
+            return []
+        lo, hi = self._range(key)
+        # Same order as sorted(..., reverse=True)[:limit] (ties stay alphabetical), without sorting every match
+        return heapq.nlargest(limit, self.places[lo:hi], key=lambda p: p.get("population", 0))
+
+
+class Geocoder:
+    """
+    City name -> locations, trying the offline gazetteer, then the persistent
+    cache of past API answers, and only then OpenWeather's geocoding API.
+    """
+
+    def __init__(self, api_key: str, gazetteer: Gazetteer | None = None,
+                 cache: ForecastCache | None = None, latency_window: int = 1000, quota=None):
+        self.api_key = api_key
+        self.gazetteer = gazetteer
+        self.cache = cache
+        self.quota = quota  # quota.QuotaManager: API lookups count against the key's budget
+        self.lookups = 0
+        self.gazetteer_hits = 0
+        self.cache_hits = 0
+        self.api_calls = 0
+        self._latencies = deque(maxlen=latency_window)
+        self._lock = threading.Lock()  # shared across Streamlit sessions via cache_resource
+
+    def _count(self, counter: str) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    @classmethod
+    def default(cls, api_key: str, quota=None) -> "Geocoder":
+        path = os.environ.get("GAZETTEER_PATH", GAZETTEER_FILE)
+        gazetteer = Gazetteer.from_file(path) if Path(path).exists() else None
+        return cls(api_key, gazetteer=gazetteer, cache=ForecastCache(GEOCODE_CACHE_FILE), quota=quota)
+
+    def suggest(self, prefix: str, limit: int = 5) -> list[dict]:
+        if self.gazetteer is None:
+            return []
+        return self.gazetteer.suggest(prefix, limit=limit)
+
+    def geocode(self, city: str, limit: int = 5) -> list[dict]:
+        t0 = time.perf_counter()
+        self._count("lookups")
+        try:
+            if self.gazetteer is not None:
+                found = self.gazetteer.exact(city, limit=limit)
+                if found:
+                    self._count("gazetteer_hits")
+                    return found
+
+            key = f"geocode:{normalize_name(city)}:{limit}{source_tag('geocode')}"
+            if self.cache is not None:
+                cached = self.cache.get(key)
+                if cached is not None:
+                    self._count("cache_hits")
+                    return cached[0]
+
+            self._count("api_calls")
+            if self.quota is not None:
+                matches = self.quota.call(geocode_city, city, self.api_key, limit=limit)
+            else:
+                matches = geocode_city(city, self.api_key, limit=limit)
+            if self.cache is not None and matches:
+                self.cache.put(key, matches)
+            return matches
+        finally:
+            with self._lock:
+                self._latencies.append(time.perf_counter() - t0)
+
+    def stats(self) -> dict:
+        """
+        Lookup counts, the share answered without the API, and p50/p99 latency over the
+        last latency_window lookups (shown in the debug panel and exported as gauges).
+        """
+        with self._lock:
+            lat_ms = np.array(self._latencies) * 1000
+            counts = {
+                "lookups": self.lookups,
+                "gazetteer_hits": self.gazetteer_hits,
+                "cache_hits": self.cache_hits,
+                "api_calls": self.api_calls,
+            }
+        hits = counts["gazetteer_hits"] + counts["cache_hits"]
+        return {
+            **counts,
+            "hit_rate": hits / counts["lookups"] if counts["lookups"] else 0.0,
+            "p50_ms": float(np.percentile(lat_ms, 50)) if len(lat_ms) else 0.0,
+            "p99_ms": float(np.percentile(lat_ms, 99)) if len(lat_ms) else 0.0,
+        }
@@ -0,0 +1,290 @@
+import os
+import random
+import threading
+import time
+from concurrent.futures import Future
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from utils import chunked
+
+# Keep-alive connections kept per host (override with HTTP_POOL_SIZE)
+POOL_SIZE = int(os.environ.get("HTTP_POOL_SIZE", "10"))
+
+# Retries for connection errors and these statuses, with jittered exponential backoff
+MAX_RETRIES = 2
+BACKOFF_BASE = 0.3
+BACKOFF_MAX = 4.0
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# Circuit breaker: after this many consecutive failed calls a host is skipped for COOLDOWN seconds
+BREAKER_THRESHOLD = 5
+BREAKER_COOLDOWN = 30.0
+
+# Token buckets per host: (requests per second, burst). OpenWeather free tier is 60/min.
+RATE_LIMITS = {
+    "api.openweathermap.org": (1.0, 10),
+}
+
+_sessions: dict[str, requests.Session] = {}
+_lock = threading.Lock()
+
+stats = {
+    "requests": 0,
+    "retries": 0,
+    "short_circuits": 0,
+    "coalesced": 0,
+    "rate_limited": 0,
+}
+
+
+class CircuitOpenError(requests.RequestException):
+    """
+    Raised without touching the network while a host's circuit is open.
+    """
+
+
+class _Breaker:
+    """
+    Closed -> open after BREAKER_THRESHOLD failed calls in a row. Once COOLDOWN has
+    passed it goes half-open: one probe call is let through, and its outcome closes
+    or re-opens the circuit. Everything else is short-circuited meanwhile.
+    """
+
+    def __init__(self):
+        self.failures = 0
+        self.opened_at = None
+        self.probe_started = None
+        self.lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self.lock:
+            if self.opened_at is None:
+                return True
+            now = time.monotonic()
+            if now - self.opened_at < BREAKER_COOLDOWN:
+                return False
+            # Half-open: one probe at a time (a probe that never reports back expires)
+            if self.probe_started is not None and now - self.probe_started < BREAKER_COOLDOWN:
+                return False
+            self.probe_started = now
+            return True
+
+    def record(self, ok: bool) -> None:
+        with self.lock:
+            if ok:
+                self.failures = 0
+                self.opened_at = None
+            else:
+                self.failures += 1
+                if self.probe_started is not None or self.failures >= BREAKER_THRESHOLD:
+                    self.opened_at = time.monotonic()
+            self.probe_started = None
+
+
+class _TokenBucket:
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.capacity = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """
+        Take one token, sleeping until one is available.
+        """
+        waited = False
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            if not waited:
+                _count("rate_limited")
+                waited = True
+            time.sleep(wait)
+
+
+_breakers: dict[str, _Breaker] = {}
+_buckets: dict[str, _TokenBucket] = {}
+_inflight: dict[tuple, Future] = {}
+
+
+def _count(name: str) -> None:
+    with _lock:
+        stats[name] += 1
+
+
+def get_stats() -> dict:
+    with _lock:
+        return dict(stats)
+
+
+def configure(pool_size: int) -> None:
+    """
+    Change the per-host pool size. Existing sessions are closed and rebuilt lazily.
+    """
+    global POOL_SIZE
+    with _lock:
+        POOL_SIZE = pool_size
+        for s in _sessions.values():
+            s.close()
+        _sessions.clear()
+
+
+def _host_key(url: str) -> tuple[str, str]:
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}", parts.hostname or ""
+
+
+def get_session(url: str) -> requests.Session:
+    """
+    Shared keep-alive session for the host of `url` (one per scheme+host).
+    """
+    key, _ = _host_key(url)
+    s = _sessions.get(key)
+    if s is not None:
+        return s
+
+    with _lock:
+        s = _sessions.get(key)
+        if s is None:
+            s = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=POOL_SIZE)
+            s.mount(f"{urlsplit(url).scheme}://", adapter)
+            _sessions[key] = s
+        return s
+
+
+def _guards(url: str) -> tuple[_Breaker, _TokenBucket | None]:
+    key, host = _host_key(url)
+    with _lock:
+        breaker = _breakers.setdefault(key, _Breaker())
+        bucket = _buckets.get(host)
+        if bucket is None and host in RATE_LIMITS:
+            bucket = _buckets[host] = _TokenBucket(*RATE_LIMITS[host])
+        return breaker, bucket
+
+
+def _backoff(attempt: int) -> float:
+    # "Full jitter": uniform in [0, min(cap, base * 2^attempt)]
+    return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt))
+
+
+def _get_with_retries(url: str, **kwargs) -> requests.Response:
+    breaker, bucket = _guards(url)
+    if not breaker.allow():
+        _count("short_circuits")
+        raise CircuitOpenError(f"Circuit open for {_host_key(url)[1]}")
+    session = get_session(url)
+
+    # The breaker counts calls, not attempts: one outcome is recorded after the retries
+    ok = False
+    try:
+        for attempt in range(MAX_RETRIES + 1):
+            if bucket is not None:
+                bucket.acquire()
+
+            _count("requests")
+            try:
+                r = session.get(url, **kwargs)
+            except requests.RequestException:
+                if attempt == MAX_RETRIES:
+                    raise
+            else:
+                failed = r.status_code in RETRY_STATUSES
+                if not failed or attempt == MAX_RETRIES:
+                    # 429 is the provider throttling us, not the provider being down
+                    ok = not failed or r.status_code == 429
+                    return r
+
+            _count("retries")
+            time.sleep(_backoff(attempt))
+    finally:
+        breaker.record(ok)
+
+
+def _pairs(value) -> tuple:
+    # params/headers as requests accepts them: a mapping, a list of (key, value) pairs, or a string
+    if not value:
+        return ()
+    if isinstance(value, (str, bytes)):
+        return (value,)
+    items = value.items() if hasattr(value, "items") else value
+    return tuple(sorted((str(k), str(v)) for k, v in items))
+
+
+def _flight_key(url: str, kwargs: dict) -> tuple:
+    return url, _pairs(kwargs.get("params")), _pairs(kwargs.get("headers"))
+
+
+def get(url: str, **kwargs) -> requests.Response:
+    """
+    Drop-in for requests.get with pooled connections, retries, a per-host circuit
+    breaker, per-host rate limits, and single-flight: identical concurrent GETs
+    (same url, params and headers) share one request and its response.
+    """
+    key = _flight_key(url, kwargs)
+    with _lock:
+        future = _inflight.get(key)
+        leader = future is None
+        if leader:
+            future = _inflight[key] = Future()
+        else:
+            stats["coalesced"] += 1
+
+    if not leader:
+        return future.result()
+
+    try:
+        r = _get_with_retries(url, **kwargs)
+        r.content  # read the body once so followers can share it
+        future.set_result(r)
+        return r
+    except BaseException as e:
+        future.set_exception(e)
+        raise
+    finally:
+        with _lock:
+            _inflight.pop(key, None)
+
+
+def get_batched(url: str, spots: list[dict], params, fetch_one, error: type[Exception],
+                chunk_size: int = 50, timeout: float = 30) -> dict[str, dict]:
+    """
+    Fetch many spots with one GET per chunk (Open-Meteo accepts comma-separated
+    coordinates and answers with a list). `params(lat, lon)` is the single-spot query,
+    called with the chunk's joined coordinates. Returns {spot name: payload}.
+    If a chunk fails, its spots go through fetch_one(lat, lon); spots that still
+    fail are left out.
+    """
+    out = {}
+    for chunk in chunked(spots, chunk_size):
+        try:
+            r = get(
+                url,
+                params=params(",".join(str(s["lat"]) for s in chunk), ",".join(str(s["lon"]) for s in chunk)),
+                timeout=timeout,
+            )
+            if r.status_code != 200:
+                raise error(f"Batch error {r.status_code}")
+            data = r.json()
+            payloads = data if isinstance(data, list) else [data]
+            if len(payloads) != len(chunk):
+                raise error("Batch size mismatch")
+            for s, payload in zip(chunk, payloads):
+                out[s["name"]] = payload
+        except (error, requests.RequestException, ValueError):
+            for s in chunk:
+                try:
+                    out[s["name"]] = fetch_one(s["lat"], s["lon"])
+                except (error, requests.RequestException, ValueError):
+                    pass
+    return out
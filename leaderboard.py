@@ -0,0 +1,187 @@
+import atexit
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from batch import LEVELS, score_spot
+from disk_cache import PROVIDER_TTL, ForecastCache
+from marine_api import get_marine_hourly_batch
+from metrics import timed
+
+LEADERBOARD_COLUMNS = [
+    "rank",
+    "spot",
+    "country",
+    "surf_score",
+    "time",
+    "wave_height",
+    "wave_period",
+    "wind_speed",
+    "wind_relation",
+    "age_min",
+]
+
+# Below this many spots to re-score, a process pool costs more than it saves
+MIN_PARALLEL_SPOTS = 16
+
+
+@timed("leaderboard.fetch")
+def fetch_marine_with_timestamps(spots: list[dict], cache: ForecastCache | None = None,
+                                 chunk_size: int = 50) -> dict[str, tuple[dict, float]]:
+    """
+    {spot name: (marine payload, fetched_at)}. Fresh entries in the disk cache are reused
+    (the single-spot view fills the same keys); missing or stale spots are fetched in
+    batched requests. A spot whose refresh fails keeps its stale payload.
+    """
+    out = {}
+    missing = []
+    now = time.time()
+    for s in spots:
+        found = cache.get(ForecastCache.make_key("marine", s["lat"], s["lon"])) if cache is not None else None
+        if found is not None and now - found[1] < PROVIDER_TTL["marine"]:
+            out[s["name"]] = found
+        else:
+            missing.append((s, found))
+
+    if missing:
+        fetched = get_marine_hourly_batch([s for s, _ in missing], chunk_size=chunk_size)
+        for s, stale in missing:
+            payload = fetched.get(s["name"])
+            if payload is not None:
+                # The cache's own timestamp, so the next read keys the same result
+                fetched_at = time.time() if cache is None else cache.put(
+                    ForecastCache.make_key("marine", s["lat"], s["lon"]), payload
+                )
+                out[s["name"]] = (payload, fetched_at)
+            elif stale is not None:
+                out[s["name"]] = stale
+    return out
+
+
+def _score_job(args) -> tuple[str, list[dict]]:
+    spot, marine_json, levels, now = args
+    return spot["name"], score_spot(spot, marine_json, levels, top_n=1, now=now)
+
+
+def _valid_until(rows: list[dict], marine_json: dict) -> float:
+    """
+    When the earliest best hour among rows ends (epoch seconds): until then the ranking holds.
+    """
+    offset = int(marine_json.get("utc_offset_seconds", 0))
+    # "time" is the spot's local time
+    ends = [pd.Timestamp(r["time"]).timestamp() - offset + 3600 for r in rows]
+    return min(ends, default=float("inf"))
+
+
+class Leaderboard:
+    """
+    Best upcoming hour of every spot for every level (marine_to_df -> add_scores ->
+    best_hours over the hours still ahead, per spot). Results are kept per spot with the
+    fetched_at of the forecast they came from and the time their best hour ends, so an
+    update only re-scores spots whose forecast changed or whose best hour has passed;
+    those fan out over a process pool, all levels per task.
+    """
+
+    def __init__(self, levels: list[str] = LEVELS, processes: int | None = None):
+        self.levels = list(levels)
+        self.processes = processes or os.cpu_count() or 1
+        self.version = 0
+        self._results: dict[str, tuple[float, float, list[dict]]] = {}  # name -> (fetched_at, valid_until, rows)
+        self._lock = threading.Lock()
+        self._pool: ProcessPoolExecutor | None = None
+
+    def _executor(self) -> ProcessPoolExecutor:
+        # Started on first use and kept: worker start-up is paid once, not per update.
+        # Spawned, not forked: the app runs this from a multithreaded server, and a forked
+        # worker can inherit locks held by other threads at fork time.
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.processes, mp_context=multiprocessing.get_context("spawn"))
+            atexit.register(self.close)
+        return self._pool
+
+    def _stale(self, name: str, fetched_at: float, now: float) -> bool:
+        # Caller holds the lock
+        found = self._results.get(name)
+        return found is None or found[0] != fetched_at or now >= found[1]
+
+    @timed("leaderboard.update")
+    def update(self, spots: list[dict], payloads: dict[str, tuple[dict, float]], now: float | None = None) -> dict:
+        """
+        Re-score spots whose payload's fetched_at differs from the cached result, or whose
+        best hour ended before `now`. Returns {"scored", "reused", "missing", "score_s"}.
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            jobs = [
+                (s, payloads[s["name"]][0], self.levels, now)
+                for s in spots
+                if s["name"] in payloads and self._stale(s["name"], payloads[s["name"]][1], now)
+            ]
+        t0 = time.perf_counter()
+        if len(jobs) >= MIN_PARALLEL_SPOTS and self.processes > 1:
+            chunksize = max(1, len(jobs) // (4 * self.processes))
+            results = list(self._executor().map(_score_job, jobs, chunksize=chunksize))
+        else:
+            results = [_score_job(job) for job in jobs]
+        score_s = time.perf_counter() - t0
+
+        with self._lock:
+            for name, rows in results:
+                payload, fetched_at = payloads[name]
+                self._results[name] = (fetched_at, _valid_until(rows, payload), rows)
+            if results:
+                self.version += 1
+        return {
+            "scored": len(jobs),
+            "reused": sum(1 for s in spots if s["name"] in payloads) - len(jobs),
+            "missing": sum(1 for s in spots if s["name"] not in payloads),
+            "score_s": score_s,
+        }
+
+    def table(self, level: str, spots: list[dict] | None = None) -> pd.DataFrame:
+        """
+        Spots ranked by best upcoming surf_score at `level` (ties: earlier hour first).
+        """
+        names = None if spots is None else {s["name"] for s in spots}
+        now = time.time()
+        with self._lock:
+            rows = [
+                {**row, "age_min": round((now - fetched_at) / 60)}
+                for name, (fetched_at, _, spot_rows) in self._results.items()
+                if names is None or name in names
+                for row in spot_rows
+                if row["level"] == level
+            ]
+        if not rows:
+            return pd.DataFrame(columns=LEADERBOARD_COLUMNS)
+
+        df = pd.DataFrame(rows)
+        order = np.lexsort((df["time"].to_numpy(), -df["surf_score"].to_numpy()))
+        df = df.iloc[order].reset_index(drop=True)
+        df["rank"] = np.arange(1, len(df) + 1)
+        return df[LEADERBOARD_COLUMNS]
+
+    def scores(self, level: str) -> dict[str, float]:
+        """
+        {spot: best upcoming surf_score} from the results already computed (no fetching).
+        """
+        with self._lock:
+            return {
+                name: float(row["surf_score"])
+                for name, (_, _, spot_rows) in self._results.items()
+                for row in spot_rows
+                if row["level"] == level
+            }
+
+    def __len__(self) -> int:
+        return len(self._results)
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
@@ -1,49 +1,55 @@
-import streamlit as st
-
-st.title('Weather App')
-
-name = st.text_input('Enter your name', '')
-if name:
-    st.write(f'Hello {name}, welcome to the weather app!')
-    # Weather Checker App 🌤️
-
-    Streamlit
-    app
-    that
-    fetches
-    current
-    weather + 5 - day
-    forecast
-    from OpenWeatherMap
-    and displays
-    an
-    interactive
-    temperature
-    forecast
-    graph.
-
-    ## Features
-    - REST
-    API
-    calls
-    to
-    OpenWeatherMap
-    - Current
-    weather(temp, feels_like, humidity, wind, description + icon)
-    - 5 - day
-    forecast + interactive
-    Plotly
-    graph
-    - Secrets
-    stored
-    safely in `.streamlit / secrets.toml
-    `
-
-    ## Run locally
-    1.
-    Install
-    dependencies:
-    ```bash
-    pip
-    install - r
-    requirements.txt
+"""
+Headless batch scoring: fetch every spot, score it for each level, write the best hours.
+Only hours that haven't ended yet are ranked (the best upcoming hours as of the run).
+
+    python main.py --output results.json
+    python main.py --catalog spots.csv --levels Beginner Advanced --output results.parquet
+"""
+import argparse
+import sys
+from pathlib import Path
+
+from batch import LEVELS, OUTPUT_FORMATS, run_batch, write_results
+from catalog import SpotCatalog
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    p = argparse.ArgumentParser(description="Score every surf spot for every level (no UI).")
+    p.add_argument("--catalog", help="Spot file (.csv/.jsonl/.parquet) or shard directory; default: built-in spots")
+    p.add_argument("--levels", nargs="+", choices=LEVELS, default=LEVELS)
+    p.add_argument("--top", type=int, default=6, help="Best hours kept per spot and level")
+    p.add_argument("--output", "-o", required=True, help="Output file")
+    p.add_argument("--format", choices=OUTPUT_FORMATS, help="Default: taken from the output suffix")
+    p.add_argument("--processes", type=int, default=None, help="Scoring processes (default: CPU count)")
+    p.add_argument("--chunk-size", type=int, default=50, help="Spots per Open-Meteo batch request")
+    return p.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    if args.catalog:
+        path = Path(args.catalog)
+        catalog = SpotCatalog.from_shards(path) if path.is_dir() else SpotCatalog.from_file(path)
+    else:
+        catalog = SpotCatalog.default()
+
+    df, stats = run_batch(
+        catalog.spots(), levels=args.levels, top_n=args.top,
+        processes=args.processes, chunk_size=args.chunk_size,
+    )
+    if df.empty:
+        print("No spots could be fetched.", file=sys.stderr)
+        return 1
+
+    out_path = write_results(df, args.output, args.format)
+    print(
+        f"{stats['fetched']}/{stats['spots']} spots • fetch {stats['fetch_s']:.2f}s • "
+        f"score {stats['score_s']:.2f}s • {stats['spots_per_s']:.1f} spots/s overall "
+        f"({stats['score_spots_per_s']:.0f} spots/s scoring) -> {out_path}",
+        file=sys.stderr,
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
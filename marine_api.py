@@ -1,12 +1,30 @@
-import requests
+import os
 
-BASE_MARINE = "https://marine-api.open-meteo.com/v1/marine"
+import http_client
+from metrics import timed
+
+# Override with OPEN_METEO_MARINE_BASE_URL to point at a mirror or benchmarks.mock_server
+OPEN_METEO_MARINE_BASE_URL = os.environ.get(
+    "OPEN_METEO_MARINE_BASE_URL", "https://marine-api.open-meteo.com"
+).rstrip("/")
+BASE_MARINE = f"{OPEN_METEO_MARINE_BASE_URL}/v1/marine"
 
 
 class MarineAPIError(Exception):
     pass
 
 
+def _params(lat, lon) -> dict:
+    # lat/lon may be comma-separated lists (batch requests)
+    return {
+        "latitude": lat,
+        "longitude": lon,
+        "hourly": "wave_height,wave_period,wave_direction,wind_speed_10m,wind_direction_10m",
+        "timezone": "auto",
+    }
+
+
+@timed("api.marine")
 def get_marine_hourly(lat: float, lon: float) -> dict:
     """
     Fetch hourly marine forecast:
@@ -17,15 +35,18 @@ def get_marine_hourly(lat: float, lon: float) -> dict:
     - wind direction
     From Open-Meteo Marine API (no API key required)
     """
-    params = {
-        "latitude": lat,
-        "longitude": lon,
-        "hourly": "wave_height,wave_period,wave_direction,wind_speed_10m,wind_direction_10m",
-        "timezone": "auto",
-    }
-
-    r = requests.get(BASE_MARINE, params=params, timeout=20)
+    r = http_client.get(BASE_MARINE, params=_params(lat, lon), timeout=20)
     if r.status_code != 200:
         raise MarineAPIError("Marine API error")
 
     return r.json()
+
+
+@timed("api.marine.batch")
+def get_marine_hourly_batch(spots: list[dict], chunk_size: int = 50) -> dict[str, dict]:
+    """
+    Fetch many spots with one request per chunk. Returns {spot name: payload}, the same
+    payload get_marine_hourly would return for that spot.
+    If a chunk fails, its spots are fetched one by one; spots that still fail are left out.
+    """
+    return http_client.get_batched(BASE_MARINE, spots, _params, get_marine_hourly, MarineAPIError, chunk_size)
@@ -0,0 +1,141 @@
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+import pandas as pd
+
+from utils import snap
+
+
+def estimate_bytes(obj) -> int:
+    """
+    Rough deep size of a payload (JSON-like containers, DataFrames, arrays, plotly
+    Figures, pydeck Decks).
+    """
+    if isinstance(obj, pd.DataFrame):
+        return int(obj.memory_usage(deep=True).sum())
+    if hasattr(obj, "nbytes"):
+        return int(obj.nbytes)
+    if hasattr(obj, "to_plotly_json"):
+        # Figures keep their traces as dicts of arrays
+        return sys.getsizeof(obj) + estimate_bytes(obj.to_plotly_json())
+    if callable(getattr(obj, "to_json", None)):
+        # Decks hold their layer data as records; the JSON they render to is the closest measure
+        return sys.getsizeof(obj) + len(obj.to_json())
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(estimate_bytes(k) + estimate_bytes(v) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set)):
+        size += sum(estimate_bytes(x) for x in obj)
+    return size
+
+
+class BoundedCache:
+    """
+    In-process cache bounded by entry count and estimated bytes.
+    policy="lru" evicts the least recently used entry, "lfu" the least frequently used.
+    Entries older than ttl seconds (if set) are treated as missing.
+    """
+
+    def __init__(self, max_entries: int = 256, max_bytes: int = 64 * 1024 * 1024,
+                 policy: str = "lru", ttl: float | None = None):
+        if policy not in ("lru", "lfu"):
+            raise ValueError(f"Unknown eviction policy: {policy}")
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.policy = policy
+        self.ttl = ttl
+
+        self._data: OrderedDict = OrderedDict()  # key -> (value, size, stored_at)
+        self._uses: dict = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            item = self._data.get(key)
+            if item is not None and self.ttl is not None and time.time() - item[2] > self.ttl:
+                self._remove(key)
+                item = None
+            if item is None:
+                self.misses += 1
+                return default
+            self.hits += 1
+            self._data.move_to_end(key)
+            self._uses[key] += 1
+            return item[0]
+
+    def put(self, key, value) -> int:
+        """
+        Store value and return its estimated size (values bigger than max_bytes are not kept).
+        """
+        size = estimate_bytes(value)
+        with self._lock:
+            if key in self._data:
+                self._remove(key)
+            if size > self.max_bytes:
+                return size
+            self._data[key] = (value, size, time.time())
+            self._uses[key] = 1
+            self._bytes += size
+            while len(self._data) > self.max_entries or self._bytes > self.max_bytes:
+                self._remove(self._victim(exclude=key))
+                self.evictions += 1
+        return size
+
+    def get_or_compute(self, key, compute):
+        sentinel = object()
+        value = self.get(key, sentinel)
+        if value is sentinel:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def _victim(self, exclude):
+        # Caller holds the lock
+        if self.policy == "lru":
+            return next(k for k in self._data if k != exclude)
+        # Ties go to the older entry (OrderedDict keeps recency order)
+        return min((k for k in self._data if k != exclude), key=lambda k: self._uses[k])
+
+    def _remove(self, key) -> None:
+        _, size, _ = self._data.pop(key)
+        self._uses.pop(key, None)
+        self._bytes -= size
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._uses.clear()
+            self._bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key) -> bool:
+        return key in self._data
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "policy": self.policy,
+                "entries": len(self._data),
+                "max_entries": self.max_entries,
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+def coord_key(lat: float, lon: float, *extra, grid: float = 0.01) -> tuple:
+    """
+    Cache key with coordinates snapped to `grid` degrees, so nearby floats share an entry.
+    """
+    return (snap(lat, grid), snap(lon, grid), *extra)
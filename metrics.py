@@ -0,0 +1,152 @@
+import contextvars
+import functools
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+# Set SURF_METRICS_DIR to have export() write one file per worker process there
+METRICS_DIR_ENV = "SURF_METRICS_DIR"
+METRICS_FORMAT_ENV = "SURF_METRICS_FORMAT"  # "prom" (default) or "jsonl"
+# Accepted format names -> file suffix
+FORMATS = {"prom": "prom", "jsonl": "jsonl", "json": "jsonl"}
+
+_lock = threading.Lock()
+_timers: dict[str, dict] = {}  # name -> {"count", "sum", "max"}
+_gauges: dict[str, float] = {}
+_run: contextvars.ContextVar[list | None] = contextvars.ContextVar("metrics_run", default=None)
+
+
+class timed:
+    """
+    Time a block or a function under `name`:
+
+        with timed("render.chart"):
+            ...
+
+        @timed("api.marine")
+        def get_marine_hourly(...): ...
+
+    Totals are kept per process; the current run (see start_run) also gets each timing.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self):
+        self._t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        record(self.name, time.perf_counter() - self._t0)
+        return False
+
+    def __call__(self, fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with timed(self.name):
+                return fn(*args, **kwargs)
+        return wrapper
+
+
+def record(name: str, seconds: float) -> None:
+    with _lock:
+        t = _timers.setdefault(name, {"count": 0, "sum": 0.0, "max": 0.0})
+        t["count"] += 1
+        t["sum"] += seconds
+        t["max"] = max(t["max"], seconds)
+    run = _run.get()
+    if run is not None:
+        run.append((name, seconds))
+
+
+def set_gauge(name: str, value: float) -> None:
+    with _lock:
+        _gauges[name] = float(value)
+
+
+def start_run() -> list:
+    """
+    Begin collecting this run's timings (per context, so concurrent sessions don't mix).
+    Threads started from here only report into it if they run in a copied context.
+    """
+    run = []
+    _run.set(run)
+    return run
+
+
+def run_breakdown(run: list) -> list[dict]:
+    """
+    Per-name totals for one run, slowest first.
+    """
+    totals: dict[str, list] = {}
+    for name, secs in run:
+        t = totals.setdefault(name, [0, 0.0])
+        t[0] += 1
+        t[1] += secs
+    rows = [{"stage": n, "calls": c, "ms": round(s * 1000, 2)} for n, (c, s) in totals.items()]
+    return sorted(rows, key=lambda r: -r["ms"])
+
+
+def snapshot() -> dict:
+    with _lock:
+        return {
+            "timers": {k: dict(v) for k, v in _timers.items()},
+            "gauges": dict(_gauges),
+        }
+
+
+def hit_ratio(hits: int, misses: int) -> float:
+    total = hits + misses
+    return hits / total if total else 0.0
+
+
+def to_prometheus(snap: dict, pid: int | None = None) -> str:
+    pid = os.getpid() if pid is None else pid
+    lines = [
+        "# HELP surf_stage_seconds Time spent per instrumented stage.",
+        "# TYPE surf_stage_seconds summary",
+    ]
+    for name, t in sorted(snap["timers"].items()):
+        labels = f'stage="{name}",pid="{pid}"'
+        lines.append(f"surf_stage_seconds_sum{{{labels}}} {t['sum']:.6f}")
+        lines.append(f"surf_stage_seconds_count{{{labels}}} {t['count']}")
+    lines.append("# HELP surf_stage_seconds_max Slowest single call per stage.")
+    lines.append("# TYPE surf_stage_seconds_max gauge")
+    for name, t in sorted(snap["timers"].items()):
+        lines.append(f'surf_stage_seconds_max{{stage="{name}",pid="{pid}"}} {t["max"]:.6f}')
+    lines.append("# TYPE surf_gauge gauge")
+    for name, value in sorted(snap["gauges"].items()):
+        lines.append(f'surf_gauge{{name="{name}",pid="{pid}"}} {value}')
+    return "\n".join(lines) + "\n"
+
+
+def export(directory: Path | str | None = None, fmt: str | None = None) -> Path | None:
+    """
+    Write this process's metrics to <dir>/surf-<pid>.prom (Prometheus textfile collector)
+    or append a line to <dir>/surf-<pid>.jsonl. No-op unless a directory is given or set
+    via SURF_METRICS_DIR. Raises ValueError for a format other than prom/jsonl (json).
+    """
+    directory = directory or os.environ.get(METRICS_DIR_ENV)
+    if not directory:
+        return None
+    fmt = fmt or os.environ.get(METRICS_FORMAT_ENV, "prom")
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown metrics format {fmt!r}; use one of {sorted(FORMATS)}")
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    snap = snapshot()
+    pid = os.getpid()
+
+    if FORMATS[fmt] == "jsonl":
+        path = directory / f"surf-{pid}.jsonl"
+        with path.open("a", encoding="utf-8") as f:
+            f.write(json.dumps({"ts": time.time(), "pid": pid, **snap}) + "\n")
+        return path
+
+    path = directory / f"surf-{pid}.prom"
+    tmp = path.with_suffix(".prom.tmp")
+    tmp.write_text(to_prometheus(snap, pid), encoding="utf-8")
+    tmp.replace(path)  # the collector never sees a half-written file
+    return path
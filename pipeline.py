@@ -0,0 +1,58 @@
+import time
+
+from memory_cache import BoundedCache
+
+_MISSING = object()
+
+
+class Pipeline:
+    """
+    Memoized stages for one script run (fetch -> parse -> derive -> score -> rank, plus views).
+    Each stage result is cached under (stage name, key), where the key holds everything
+    the stage depends on; a rerun only recomputes stages whose inputs changed.
+    The cache is shared across runs and sessions; the log belongs to this run.
+    """
+
+    def __init__(self, cache: BoundedCache):
+        self.cache = cache
+        self.log: list[dict] = []
+
+    def stage(self, name: str, key, compute, cache: BoundedCache | None = None):
+        """
+        Cached value of stage `name` for `key`, computing it on a miss.
+        `cache` overrides the pipeline cache (e.g. one with a TTL for network data).
+        """
+        cache = self.cache if cache is None else cache
+        t0 = time.perf_counter()
+        value = cache.get((name, key), _MISSING)
+        status, size = "reused", None
+        if value is _MISSING:
+            value = compute()
+            size = cache.put((name, key), value)
+            status = "ran"
+        self._record(name, status, t0, size)
+        return value
+
+    def run(self, name: str, compute):
+        """
+        Uncached stage (memoized elsewhere, e.g. the disk cache behind fetching); always runs.
+        """
+        t0 = time.perf_counter()
+        value = compute()
+        self._record(name, "ran", t0)
+        return value
+
+    def _record(self, name: str, status: str, t0: float, size: int | None = None) -> None:
+        # size: what a computed result counts against its cache's byte cap
+        self.log.append({
+            "stage": name,
+            "status": status,
+            "ms": round((time.perf_counter() - t0) * 1000, 2),
+            "kb": None if size is None else round(size / 1024, 1),
+        })
+
+    def report(self) -> list[dict]:
+        return list(self.log)
+
+    def ran(self) -> list[str]:
+        return [e["stage"] for e in self.log if e["status"] == "ran"]
@@ -0,0 +1,223 @@
+import hashlib
+import os
+import threading
+import time
+from collections import deque
+
+import requests
+
+from disk_cache import PROVIDER_TTL, ForecastCache
+from utils import snap
+from weather_api import WeatherAPIError, get_current_by_coords
+
+# OpenWeather budgets per API key (free tier: 60 calls/minute). Override per deployment.
+CALLS_PER_MINUTE = int(os.environ.get("OPENWEATHER_CALLS_PER_MINUTE", "60"))
+CALLS_PER_DAY = int(os.environ.get("OPENWEATHER_CALLS_PER_DAY", "1000"))
+
+# Spots in the same cell share one current-weather response (0.1 deg is ~11 km)
+WEATHER_CELL_DEG = 0.1
+
+# Share of each budget kept back once it runs low: refreshes stop and cached
+# data is served, so the reserve is only spent on cells with nothing cached.
+RESERVE_FRACTION = 0.1
+
+
+class QuotaExceededError(WeatherAPIError):
+    """
+    Raised when the OpenWeather budget is spent and there is no cached response to fall back on.
+    """
+
+
+class QuotaManager:
+    """
+    Per-key OpenWeather budget (calls per minute and per UTC day) in front of
+    get_current_by_coords. Coordinates map to a weather cell, so nearby spots share
+    one response. Responses are kept in `store` (a disk_cache.ForecastCache) or in memory.
+    The per-minute window is counted per process. With a store, the day's count is one of
+    its counters: shared by every process using the file, never evicted, and not reset
+    by a restart.
+    """
+
+    def __init__(self, api_key: str, per_minute: int = CALLS_PER_MINUTE, per_day: int = CALLS_PER_DAY,
+                 cell_deg: float = WEATHER_CELL_DEG, reserve: float = RESERVE_FRACTION,
+                 ttl: float = PROVIDER_TTL["openweather"], store: ForecastCache | None = None):
+        self.api_key = api_key
+        self.key_id = hashlib.sha1(api_key.encode("utf-8")).hexdigest()[:8]
+        self.per_minute = per_minute
+        self.per_day = per_day
+        self.cell_deg = cell_deg
+        self.ttl = ttl
+        self.store = store
+        self._reserve_minute = max(1, int(per_minute * reserve))
+        self._reserve_day = max(1, int(per_day * reserve))
+
+        self._lock = threading.Lock()
+        self._key_locks: dict[str, threading.Lock] = {}
+        self._local: dict[str, tuple[dict, float]] = {}
+        self._minute: deque = deque()
+        self._day = self._utc_day()
+        self._day_calls = 0
+
+        self.requests = 0
+        self.calls = 0
+        self.cell_hits = 0
+        self.degraded = 0
+        self.rejected = 0
+        self._coords: set = set()
+        self._cells: set = set()
+
+    @staticmethod
+    def _utc_day() -> int:
+        return int(time.time() // 86400)
+
+    def _day_key(self, day: int) -> str:
+        return f"quota:{self.key_id}:{day}"
+
+    def _used(self, now: float) -> tuple[int, int]:
+        # Caller holds the lock
+        while self._minute and now - self._minute[0] >= 60:
+            self._minute.popleft()
+        if self._utc_day() != self._day:
+            self._day = self._utc_day()
+            self._day_calls = 0
+        if self.store is not None:
+            # Other processes count against the same key
+            self._day_calls = self.store.counter(self._day_key(self._day))
+        return len(self._minute), self._day_calls
+
+    def _acquire(self, use_reserve: bool) -> bool:
+        """
+        Take one call from both budgets. Without use_reserve, the reserve is left alone.
+        """
+        now = time.monotonic()
+        with self._lock:
+            minute, day = self._used(now)
+            keep_minute = 0 if use_reserve else self._reserve_minute
+            keep_day = 0 if use_reserve else self._reserve_day
+            if minute >= self.per_minute - keep_minute or day >= self.per_day - keep_day:
+                return False
+            if self.store is not None:
+                # Checked again as part of the increment: another process may have just counted
+                calls = self.store.increment(self._day_key(self._day), limit=self.per_day - keep_day)
+                if calls is None:
+                    return False
+                self._day_calls = calls
+            else:
+                self._day_calls += 1
+            self._minute.append(now)
+        return True
+
+    def near_exhaustion(self) -> bool:
+        """
+        True once either budget is into its reserve (cached data is being preferred).
+        """
+        with self._lock:
+            minute, day = self._used(time.monotonic())
+        return minute >= self.per_minute - self._reserve_minute or day >= self.per_day - self._reserve_day
+
+    def cell(self, lat: float, lon: float) -> tuple[float, float]:
+        return snap(lat, self.cell_deg), snap(lon, self.cell_deg)
+
+    def _get(self, key: str):
+        if self.store is not None:
+            return self.store.get(key)
+        with self._lock:
+            return self._local.get(key)
+
+    def _put(self, key: str, payload: dict) -> None:
+        if self.store is not None:
+            self.store.put(key, payload)
+        else:
+            with self._lock:
+                self._local[key] = (payload, time.time())
+
+    def _key_lock(self, key: str) -> threading.Lock:
+        with self._lock:
+            return self._key_locks.setdefault(key, threading.Lock())
+
+    def call(self, fn, *args, **kwargs):
+        """
+        Spend one call on fn(*args, **kwargs) (e.g. geocoding), or raise QuotaExceededError.
+        """
+        if not self._acquire(use_reserve=True):
+            with self._lock:
+                self.rejected += 1
+            raise QuotaExceededError("OpenWeather call budget exhausted")
+        with self._lock:
+            self.calls += 1
+        return fn(*args, **kwargs)
+
+    def current(self, lat: float, lon: float, units: str = "metric") -> dict:
+        """
+        Current weather for the cell containing lat/lon.
+        A fresh cached cell response costs nothing; a stale one is refreshed while the
+        budget allows, and served as-is once it runs low or when the refresh fails.
+        """
+        cell_lat, cell_lon = self.cell(lat, lon)
+        key = ForecastCache.make_key("openweather", cell_lat, cell_lon, extra=units)
+        with self._lock:
+            self.requests += 1
+            self._coords.add((lat, lon, units))
+            self._cells.add(key)
+
+        # One caller per cell refreshes; the others wait and reuse its response
+        with self._key_lock(key):
+            found = self._get(key)
+            if found is not None and time.time() - found[1] < self.ttl:
+                with self._lock:
+                    self.cell_hits += 1
+                return found[0]
+
+            if self._acquire(use_reserve=found is None):
+                with self._lock:
+                    self.calls += 1
+                try:
+                    payload = get_current_by_coords(cell_lat, cell_lon, self.api_key, units=units)
+                except (WeatherAPIError, requests.RequestException, ValueError):
+                    if found is None:
+                        raise
+                else:
+                    self._put(key, payload)
+                    return payload
+
+        if found is not None:
+            with self._lock:
+                self.degraded += 1
+            return found[0]
+        with self._lock:
+            self.rejected += 1
+        raise QuotaExceededError("OpenWeather call budget exhausted and nothing cached for this area")
+
+    def report(self) -> dict:
+        with self._lock:
+            minute, day = self._used(time.monotonic())
+            return {
+                "key": self.key_id,
+                "calls_last_minute": minute,
+                "calls_today": day,
+                "per_minute": self.per_minute,
+                "per_day": self.per_day,
+                "requests": self.requests,
+                "calls": self.calls,
+                "cell_hits": self.cell_hits,
+                "degraded": self.degraded,
+                "rejected": self.rejected,
+                "calls_saved": self.cell_hits + self.degraded,
+                "coordinates": len(self._coords),
+                "cells": len(self._cells),
+            }
+
+
+_managers: dict[str, QuotaManager] = {}
+_managers_lock = threading.Lock()
+
+
+def quota_manager(api_key: str, store: ForecastCache | None = None) -> QuotaManager:
+    """
+    The process-wide QuotaManager for an API key (budgets are per key, not per session).
+    """
+    with _managers_lock:
+        manager = _managers.get(api_key)
+        if manager is None:
+            manager = _managers[api_key] = QuotaManager(api_key, store=store)
+        return manager
@@ -1,5 +1,8 @@
+import numpy as np
 import pandas as pd
 
+from metrics import timed
+
 
 def surf_score_row(
     wave_h: float,
@@ -121,34 +124,260 @@ def surf_score_row(
     return max(0, min(100, score))
 
 
+# -------------------------
+# Vectorized scoring tables
+# -------------------------
+# Same thresholds as surf_score_row, as (upper bounds, points) per level.
+# A value falls in bin i when it is below edges[i] (np.searchsorted side="right"),
+# so NaN lands in the last bin exactly like the chain of "<" checks above.
+WAVE_TABLES = {
+    "Beginner": ([0.2, 0.4, 0.8, 1.2], [5, 25, 55, 45, 15]),
+    "Intermediate": ([0.3, 0.6, 1.0, 1.5], [5, 20, 40, 60, 75]),
+    "Advanced": ([0.4, 0.8, 1.2, 2.0], [5, 25, 55, 75, 65]),
+}
+PERIOD_TABLE = ([6, 9, 12], [5, 15, 25, 30])
+WIND_TABLES = {
+    "Beginner": ([3, 6, 9], [20, 10, -10, -20]),
+    "Intermediate": ([4, 7, 10], [20, 10, -5, -15]),
+    "Advanced": ([4, 8, 12], [15, 5, -5, -12]),
+}
+RELATION_POINTS = {"Offshore": 10, "Onshore": -10}
+# Same points by utils.WIND_RELATIONS code (Offshore, Cross, Onshore); code -1 picks the trailing 0
+RELATION_CODE_POINTS = np.array([10, 0, -10, 0], dtype=np.int64)
+
+
+def _lookup(values: np.ndarray, table) -> np.ndarray:
+    edges, points = table
+    # Compare in the values' own precision so float32 inputs bin like their float64 source
+    ix = np.searchsorted(np.asarray(edges, dtype=values.dtype), values, side="right")
+    return np.asarray(points, dtype=np.int64)[ix]
+
+
+def _column(df: pd.DataFrame, name: str):
+    """
+    Returns (float values, None-mask) for a column.
+    None only survives in object columns; a missing column counts as all None.
+    """
+    n = len(df)
+    if name not in df:
+        return np.full(n, np.nan), np.ones(n, dtype=bool)
+    col = df[name]
+    if col.dtype == object:
+        is_none = np.equal(col.to_numpy(), None)
+        values = pd.to_numeric(col, errors="coerce").to_numpy(dtype=float)
+        return values, is_none
+    return col.to_numpy(dtype=float), np.zeros(n, dtype=bool)
+
+
+def _score_arrays(wave_h, period, wind, relation_points, level, wave_none=None, period_none=None, wind_none=None):
+    if level not in WAVE_TABLES:
+        level = "Intermediate"
+
+    score = _lookup(wave_h, WAVE_TABLES[level])
+    period_points = _lookup(period, PERIOD_TABLE)
+    wind_points = _lookup(wind, WIND_TABLES[level])
+    score += period_points if period_none is None else np.where(period_none, 0, period_points)
+    score += wind_points if wind_none is None else np.where(wind_none, 0, wind_points)
+    score += relation_points
+
+    score = np.clip(score, 0, 100)
+    if wave_none is not None:
+        score[wave_none] = 0
+    return score
+
+
+def surf_scores(df: pd.DataFrame, level: str = "Intermediate") -> np.ndarray:
+    """
+    Vectorized surf_score_row over a whole frame.
+    Returns an int64 array identical to applying surf_score_row row by row.
+    """
+    wave_h, wave_none = _column(df, "wave_height")
+    period, period_none = _column(df, "wave_period")
+    wind, wind_none = _column(df, "wind_speed")
+
+    relation_points = np.zeros(len(df), dtype=np.int64)
+    if "wind_relation" in df:
+        rel = df["wind_relation"]
+        for name, points in RELATION_POINTS.items():
+            relation_points += np.where(rel.eq(name).to_numpy(), points, 0)
+
+    return _score_arrays(wave_h, period, wind, relation_points, level, wave_none, period_none, wind_none)
+
+
+@timed("scoring.score_forecast")
+def score_forecast(fc, level: str = "Intermediate") -> np.ndarray:
+    """
+    surf_scores for a forecast.CompactForecast, straight from its arrays and codes.
+    """
+    return _score_arrays(
+        fc.wave_height, fc.wave_period, fc.wind_speed, RELATION_CODE_POINTS[fc.wind_relation], level
+    )
+
+
+@timed("scoring.add_scores")
 def add_scores(df: pd.DataFrame, level: str = "Intermediate") -> pd.DataFrame:
     """
     Adds a 'surf_score' column based on level.
     """
     df = df.copy()
-    df["surf_score"] = df.apply(
-        lambda r: surf_score_row(
-            r.get("wave_height"),
-            r.get("wave_period"),
-            r.get("wind_speed"),
-            r.get("wind_relation"),
-            level,
-        ),
-        axis=1,
-    )
+    df["surf_score"] = surf_scores(df, level=level)
     return df
 
 
+BEST_HOURS_COLUMNS = [
+    "time",
+    "wave_height",
+    "wave_period",
+    "wind_speed",
+    "surf_score",
+    "wave_dir",
+    "wind_dir",
+    "wind_relation",
+]
+
+
+@timed("scoring.best_hours")
 def best_hours(df: pd.DataFrame, top_n: int = 6) -> pd.DataFrame:
-    cols = [
-        "time",
-        "wave_height",
-        "wave_period",
-        "wind_speed",
-        "surf_score",
-        "wave_dir",
-        "wind_dir",
-        "wind_relation",
-    ]
-    out = df.sort_values("surf_score", ascending=False).head(top_n)
-    return out[cols]
+    # Stable sort: tied scores keep forecast order (earlier hour first)
+    out = df.sort_values("surf_score", ascending=False, kind="stable").head(top_n)
+    return out[BEST_HOURS_COLUMNS]
+
+
+def top_hour_indices(scores: np.ndarray, top_n: int = 6) -> np.ndarray:
+    """
+    Row indices of the top_n scores, best first (ties: earlier hour first), the same
+    rows as best_hours. Only the candidates at or above the top_n-th score are sorted,
+    not the whole horizon.
+    """
+    if top_n <= 0:
+        return np.empty(0, dtype=np.int64)
+    idx = np.arange(len(scores))
+    if len(scores) > top_n:
+        kth = np.partition(-scores, top_n - 1)[top_n - 1]
+        # Every row tied with the top_n-th score competes, so the earliest ones win
+        if not np.isnan(kth):
+            idx = np.flatnonzero(-scores <= kth)
+    return idx[np.lexsort((idx, -scores[idx]))][:top_n]
+
+
+@timed("scoring.best_hours_forecast")
+def best_hours_forecast(fc, scores: np.ndarray, top_n: int = 6) -> pd.DataFrame:
+    """
+    best_hours for a forecast.CompactForecast: only the winning rows are decoded.
+    """
+    return fc.to_df(scores, rows=top_hour_indices(scores, top_n), columns=BEST_HOURS_COLUMNS)
+
+
+SESSION_AGGREGATES = ("mean", "min")
+SESSION_COLUMNS = [
+    "start",
+    "end",
+    "hours",
+    "score",
+    "min_score",
+    "max_score",
+    "wave_height",
+    "wave_period",
+    "wind_speed",
+]
+
+
+def window_scores(scores: np.ndarray, hours: int, agg: str = "mean", valid: np.ndarray | None = None,
+                  times: np.ndarray | None = None) -> np.ndarray:
+    """
+    Score of every `hours`-long window, by start row: rolling mean or min of scores.
+    Windows that touch a row where `valid` is False, or that span a gap in `times`
+    (epoch seconds, expected 1 h apart), get -inf. O(n) for the mean (prefix sums);
+    the min looks at `hours` values per window, which is tiny.
+    """
+    if hours < 1:
+        raise ValueError("Session length must be at least 1 hour")
+    if agg not in SESSION_AGGREGATES:
+        raise ValueError(f"Unknown session aggregate {agg!r}; expected one of {SESSION_AGGREGATES}")
+    x = np.asarray(scores, dtype=float)
+    if len(x) < hours:
+        return np.empty(0)
+
+    if agg == "mean":
+        c = np.concatenate(([0.0], np.cumsum(x)))
+        out = (c[hours:] - c[:-hours]) / hours
+    else:
+        out = np.lib.stride_tricks.sliding_window_view(x, hours).min(axis=1)
+
+    if valid is not None:
+        bad = np.concatenate(([0], np.cumsum(~np.asarray(valid, dtype=bool))))
+        out[bad[hours:] - bad[:-hours] > 0] = -np.inf
+    if times is not None and hours > 1:
+        gaps = np.concatenate(([0], np.cumsum(np.diff(np.asarray(times, dtype=np.int64)) != 3600)))
+        out[gaps[hours - 1:] - gaps[:-hours + 1] > 0] = -np.inf
+    return out
+
+
+def top_session_starts(window_values: np.ndarray, hours: int, top_n: int = 3) -> np.ndarray:
+    """
+    Start rows of the best non-overlapping windows, best first (ties: earlier first).
+    Each pick rules out at most 2*hours-1 starts, so the greedy answer always lies within
+    the top top_n*(2*hours-1) windows: those are found with a partition, not a full sort.
+    """
+    n = len(window_values)
+    if top_n <= 0 or n == 0:
+        return np.empty(0, dtype=np.int64)
+
+    m = top_n * (2 * hours - 1)
+    if n > m:
+        # Everything tied with the m-th best too, so ties break the same way as a full sort
+        threshold = np.partition(window_values, n - m)[n - m]
+        cand = np.flatnonzero(window_values >= threshold)
+    else:
+        cand = np.arange(n)
+    cand = cand[np.isfinite(window_values[cand])]
+    cand = cand[np.lexsort((cand, -window_values[cand]))]
+
+    picked: list[int] = []
+    for start in cand:
+        if all(abs(start - p) >= hours for p in picked):
+            picked.append(int(start))
+            if len(picked) == top_n:
+                break
+    return np.asarray(picked, dtype=np.int64)
+
+
+def _sessions(local_times: np.ndarray, scores: np.ndarray, columns: dict, hours: int, top_n: int,
+              agg: str, daylight: np.ndarray | None) -> pd.DataFrame:
+    values = window_scores(scores, hours, agg, valid=daylight, times=local_times)
+    starts = top_session_starts(values, hours, top_n)
+    rows = starts[:, None] + np.arange(hours)  # (sessions, hours) row indices
+    out = {
+        "start": pd.to_datetime(local_times[starts], unit="s"),
+        "end": pd.to_datetime(local_times[starts] + hours * 3600, unit="s"),
+        "hours": np.full(len(starts), hours),
+        "score": values[starts].round(1),
+        "min_score": scores[rows].min(axis=1),
+        "max_score": scores[rows].max(axis=1),
+    }
+    for col, arr in columns.items():
+        out[col] = np.asarray(arr, dtype=float)[rows].mean(axis=1).round(2)
+    return pd.DataFrame(out, columns=SESSION_COLUMNS)
+
+
+@timed("scoring.best_sessions")
+def best_sessions(df: pd.DataFrame, hours: int = 3, top_n: int = 3, agg: str = "mean",
+                  daylight: np.ndarray | None = None) -> pd.DataFrame:
+    """
+    Best non-overlapping `hours`-long sessions of a scored frame (see add_scores),
+    ranked by the rolling mean or min of surf_score. `daylight` (see forecast.daylight_mask)
+    keeps sessions within daylight hours.
+    """
+    local_times = df["time"].to_numpy(dtype="datetime64[s]").astype(np.int64)
+    columns = {col: df[col].to_numpy() for col in ("wave_height", "wave_period", "wind_speed")}
+    return _sessions(local_times, df["surf_score"].to_numpy(), columns, hours, top_n, agg, daylight)
+
+
+@timed("scoring.best_sessions_forecast")
+def best_sessions_forecast(fc, scores: np.ndarray, hours: int = 3, top_n: int = 3, agg: str = "mean",
+                           daylight: np.ndarray | None = None) -> pd.DataFrame:
+    """
+    best_sessions for a forecast.CompactForecast and its score_forecast scores.
+    """
+    columns = {"wave_height": fc.wave_height, "wave_period": fc.wave_period, "wind_speed": fc.wind_speed}
+    return _sessions(fc.local_time, scores, columns, hours, top_n, agg, daylight)
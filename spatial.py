@@ -0,0 +1,86 @@
+import math
+
+import numpy as np
+
+from utils import haversine_km_array
+
+EARTH_RADIUS_KM = 6371.0
+
+
+class SpotIndex:
+    """
+    Grid index over spot coordinates for "k nearest spots within R km".
+    Spots are bucketed into cell_deg x cell_deg cells and stored sorted by cell,
+    so a query only measures distances to spots in the cells its radius touches.
+    """
+
+    def __init__(self, spots: list[dict], cell_deg: float = 0.5):
+        self.spots = spots
+        self.cell_deg = cell_deg
+        self.lat = np.array([s["lat"] for s in spots], dtype=float)
+        self.lon = np.array([s["lon"] for s in spots], dtype=float)
+
+        self.n_lat = math.ceil(180 / cell_deg)
+        self.n_lon = math.ceil(360 / cell_deg)
+        cells = self._row(self.lat) * self.n_lon + self._col(self.lon)
+        self.order = np.argsort(cells, kind="stable")
+        self.cells = cells[self.order]
+
+    def _row(self, lat):
+        return np.clip(np.floor((np.asarray(lat) + 90) / self.cell_deg), 0, self.n_lat - 1).astype(np.int64)
+
+    def _col(self, lon):
+        return (np.floor((np.asarray(lon) + 180) / self.cell_deg) % self.n_lon).astype(np.int64)
+
+    def _candidates(self, lat: float, lon: float, radius_km: float) -> np.ndarray:
+        r = radius_km / EARTH_RADIUS_KM
+        lat_lo, lat_hi = lat - math.degrees(r), lat + math.degrees(r)
+
+        # Longitude half-width of the circle's bounding box (full circle if it reaches a pole)
+        full_row = lat_lo <= -90 or lat_hi >= 90 or math.sin(r) >= math.cos(math.radians(lat))
+        dlon = 180.0 if full_row else math.degrees(math.asin(math.sin(r) / math.cos(math.radians(lat))))
+
+        c0 = int(math.floor((lon - dlon + 180) / self.cell_deg))
+        c1 = int(math.floor((lon + dlon + 180) / self.cell_deg))
+        if full_row or c1 - c0 + 1 >= self.n_lon:
+            col_ranges = [(0, self.n_lon - 1)]
+        else:
+            c0 %= self.n_lon
+            c1 %= self.n_lon
+            col_ranges = [(c0, c1)] if c0 <= c1 else [(c0, self.n_lon - 1), (0, c1)]
+
+        parts = []
+        for row in range(int(self._row(max(lat_lo, -90))), int(self._row(min(lat_hi, 90))) + 1):
+            for a, b in col_ranges:
+                i0, i1 = np.searchsorted(self.cells, [row * self.n_lon + a, row * self.n_lon + b + 1])
+                if i1 > i0:
+                    parts.append(self.order[i0:i1])
+        return np.concatenate(parts) if parts else np.empty(0, dtype=np.int64)
+
+    def query(self, lat: float, lon: float, k: int = 5, radius_km: float | None = None):
+        """
+        Returns (indices, distances_km) of up to k spots, nearest first.
+        radius_km=None searches the whole catalog.
+        """
+        if radius_km is None:
+            idx = np.arange(len(self.spots))
+        else:
+            idx = self._candidates(lat, lon, radius_km)
+
+        dist = haversine_km_array(lat, lon, self.lat[idx], self.lon[idx])
+        if radius_km is not None:
+            keep = dist <= radius_km
+            idx, dist = idx[keep], dist[keep]
+
+        if len(idx) > k:
+            top = np.argpartition(dist, k - 1)[:k]
+            idx, dist = idx[top], dist[top]
+        ranked = np.argsort(dist, kind="stable")
+        return idx[ranked], dist[ranked]
+
+    def nearest(self, lat: float, lon: float, k: int = 5, radius_km: float | None = None) -> list[dict]:
+        """
+        Like query(), but returns the spot dicts with a "distance_km" field added.
+        """
+        idx, dist = self.query(lat, lon, k=k, radius_km=radius_km)
+        return [{**self.spots[i], "distance_km": float(d)} for i, d in zip(idx, dist)]
@@ -0,0 +1,216 @@
+import functools
+import json
+
+import numpy as np
+
+BASE_COLOR = [0, 120, 255, 170]
+SELECTED_COLOR = [255, 0, 0, 220]
+FAVORITE_COLOR = [255, 215, 0, 220]
+CLUSTER_COLOR = [0, 120, 255, 110]
+
+# Score ramp: 0 red -> 50 yellow -> 100 green
+SCORE_STOPS = [0, 50, 100]
+SCORE_RAMP = [[215, 48, 39], [254, 224, 139], [26, 152, 80]]
+
+# Catalogs bigger than this cluster the spots away from the view by default
+CLUSTER_THRESHOLD = 1000
+# Spots within this many degrees of the view centre are always drawn one by one
+DETAIL_RADIUS_DEG = 3.0
+CLUSTER_CELL_DEG = 1.0
+# Cells are doubled until the clusters fit this budget (sparse catalogs need coarse cells)
+MAX_CLUSTERS = 400
+
+# ~11 m; every extra digit is ~1 byte per coordinate in the JSON sent to the browser
+POSITION_DECIMALS = 4
+
+
+def score_colors(scores: np.ndarray) -> np.ndarray:
+    """
+    (n, 4) uint8 RGBA for surf scores on the red-yellow-green ramp; NaN gets BASE_COLOR.
+    """
+    scores = np.asarray(scores, dtype=float)
+    ramp = np.asarray(SCORE_RAMP, dtype=float)
+    rgb = np.column_stack([np.interp(scores, SCORE_STOPS, ramp[:, k]) for k in range(3)])
+    out = np.empty((len(scores), 4), dtype=np.uint8)
+    out[:, :3] = np.nan_to_num(rgb).round()
+    out[:, 3] = 210
+    out[np.isnan(scores)] = BASE_COLOR
+    return out
+
+
+class SpotMapData:
+    """
+    Map-ready columns for a spot catalog, built once: lat/lon arrays for the
+    vectorized view and cluster math, plus JSON-ready per-spot records
+    ({"p": [lon, lat], "n": name}) so a render only picks rows.
+    """
+
+    def __init__(self, spots: list[dict]):
+        self.names = [s["name"] for s in spots]
+        self.lat = np.array([s["lat"] for s in spots], dtype=float)
+        self.lon = np.array([s["lon"] for s in spots], dtype=float)
+        self._row = {name: i for i, name in enumerate(self.names)}
+        positions = np.round(np.column_stack([self.lon, self.lat]), POSITION_DECIMALS).tolist()
+        self._records = [{"p": p, "n": n} for p, n in zip(positions, self.names)]
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def rows(self, names) -> np.ndarray:
+        return np.array([self._row[n] for n in names if n in self._row], dtype=np.int64)
+
+    def score_array(self, scores: dict[str, float]) -> np.ndarray:
+        """
+        Scores by catalog row (NaN for spots without one).
+        """
+        out = np.full(len(self), np.nan)
+        rows = self.rows(scores)
+        out[rows] = [scores[self.names[i]] for i in rows]
+        return out
+
+    def records(self, rows: np.ndarray, scores: np.ndarray | None = None) -> list[dict]:
+        if scores is None:
+            return [self._records[i] for i in rows]
+        colors = score_colors(scores[rows]).tolist()
+        labels = [f"{self.names[i]} • {s:.0f}" if s == s else self.names[i] for i, s in zip(rows, scores[rows])]
+        return [{"p": self._records[i]["p"], "n": label, "c": c} for i, label, c in zip(rows, labels, colors)]
+
+    def near(self, lat: float, lon: float, radius_deg: float = DETAIL_RADIUS_DEG) -> np.ndarray:
+        """
+        Boolean mask of spots in the lat/lon box around the view centre (wraps the antimeridian).
+        """
+        dlon = (self.lon - lon + 180.0) % 360.0 - 180.0
+        return (np.abs(self.lat - lat) <= radius_deg) & (np.abs(dlon) <= radius_deg)
+
+    def clusters(self, mask: np.ndarray, cell_deg: float = CLUSTER_CELL_DEG, max_clusters: int = MAX_CLUSTERS,
+                 scores: np.ndarray | None = None) -> list[dict]:
+        """
+        One record per grid cell over the masked spots: centroid, count and (with scores)
+        the mean score's color. The cell size doubles until there are at most max_clusters.
+        """
+        rows = np.flatnonzero(mask)
+        if not len(rows):
+            return []
+        lat, lon = self.lat[rows], self.lon[rows]
+        while True:
+            cells = np.floor(lat / cell_deg).astype(np.int64) * 100_000 + np.floor(lon / cell_deg).astype(np.int64)
+            _, inverse, counts = np.unique(cells, return_inverse=True, return_counts=True)
+            if len(counts) <= max_clusters or cell_deg >= 180:
+                break
+            cell_deg *= 2
+        c_lat = np.bincount(inverse, weights=lat) / counts
+        c_lon = np.bincount(inverse, weights=lon) / counts
+        radius = np.minimum(4 + 3 * np.sqrt(counts), 40)
+
+        if scores is not None:
+            s = scores[rows]
+            known = ~np.isnan(s)
+            n_known = np.bincount(inverse, weights=known, minlength=len(counts))
+            total = np.bincount(inverse, weights=np.where(known, s, 0.0), minlength=len(counts))
+            mean = np.divide(total, n_known, out=np.full(len(counts), np.nan), where=n_known > 0)
+            colors = score_colors(mean)
+            colors[:, 3] = CLUSTER_COLOR[3]
+            colors = colors.tolist()
+        else:
+            mean = np.full(len(counts), np.nan)
+            colors = [CLUSTER_COLOR] * len(counts)
+
+        positions = np.round(np.column_stack([c_lon, c_lat]), POSITION_DECIMALS).tolist()
+        return [
+            {"p": p, "r": r, "c": c, "n": f"{k} spots" + (f" • avg {m:.0f}" if m == m else "")}
+            for p, r, c, k, m in zip(positions, radius.round(1).tolist(), colors, counts.tolist(), mean)
+        ]
+
+
+@functools.lru_cache(maxsize=None)
+def _compact_deck_class():
+    import pydeck as pdk
+    from pydeck.bindings.json_tools import default_serialize
+
+    class CompactDeck(pdk.Deck):
+        """
+        Deck whose JSON (what st.pydeck_chart sends) has no indentation: pydeck
+        indents by 2, which puts every coordinate on its own line and roughly
+        triples the payload of a big point layer.
+        """
+
+        def to_json(self):
+            return json.dumps(self, sort_keys=True, default=default_serialize, separators=(",", ":"))
+
+    return CompactDeck
+
+
+def build_deck(data: SpotMapData, selected_name: str, favs: tuple[str, ...], lat: float, lon: float,
+               zoom: int = 9, cluster: bool | None = None, scores: np.ndarray | None = None):
+    """
+    pydeck Deck for the spot map. Spots near the view are drawn individually, the
+    rest as grid clusters when `cluster` is on (default: for big catalogs). With
+    `scores` (SpotMapData.score_array), spots are colored by surf score.
+    Streamlit ships the deck as JSON (pydeck's binary transport is Jupyter-only),
+    so payload size is kept down with unindented JSON, short keys, rounded
+    positions and constant accessors wherever the color doesn't vary.
+    """
+    # pydeck is only imported once a map is actually drawn
+    import pydeck as pdk
+
+    if cluster is None:
+        cluster = len(data) > CLUSTER_THRESHOLD
+    detail = data.near(lat, lon) if cluster else np.ones(len(data), dtype=bool)
+
+    layers = []
+    if cluster:
+        layers.append(
+            pdk.Layer(
+                "ScatterplotLayer",
+                data=data.clusters(~detail, scores=scores),
+                get_position="p",
+                get_radius="r",
+                radius_units="pixels",
+                get_fill_color="c",
+                get_line_color=[255, 255, 255],
+                line_width_min_pixels=1,
+                pickable=True,
+            )
+        )
+    layers.append(
+        pdk.Layer(
+            "ScatterplotLayer",
+            data=data.records(np.flatnonzero(detail), scores),
+            get_position="p",
+            get_radius=260,
+            get_fill_color="c" if scores is not None else BASE_COLOR,
+            get_line_color=[255, 255, 255],
+            line_width_min_pixels=1,
+            pickable=True,
+        )
+    )
+    layers.append(
+        pdk.Layer(
+            "ScatterplotLayer",
+            data=data.records(data.rows(favs)),
+            get_position="p",
+            get_radius=330,
+            get_fill_color=FAVORITE_COLOR,
+            get_line_color=[255, 255, 255],
+            line_width_min_pixels=1,
+            pickable=False,
+        )
+    )
+    layers.append(
+        pdk.Layer(
+            "ScatterplotLayer",
+            data=data.records(data.rows([selected_name])),
+            get_position="p",
+            get_radius=260,
+            get_fill_color=SELECTED_COLOR,
+            get_line_color=[255, 255, 255],
+            line_width_min_pixels=1,
+            pickable=False,
+        )
+    )
+
+    return _compact_deck_class()(
+        layers=layers,
+        initial_view_state=pdk.ViewState(latitude=lat, longitude=lon, zoom=zoom),
+        tooltip={"text": "{n}"},
+    )
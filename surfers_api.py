@@ -1,6 +1,18 @@
+import contextvars
+import hashlib
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
 import requests
 
-WIKI_SUMMARY_URL = "https://en.wikipedia.org/api/rest_v1/page/summary/{title}"
+import http_client
+from disk_cache import ForecastCache, source_tag
+from metrics import timed
+
+# Override with WIKIPEDIA_BASE_URL to point at a mirror or benchmarks.mock_server
+WIKIPEDIA_BASE_URL = os.environ.get("WIKIPEDIA_BASE_URL", "https://en.wikipedia.org").rstrip("/")
+WIKI_SUMMARY_URL = WIKIPEDIA_BASE_URL + "/api/rest_v1/page/summary/{title}"
 
 # Wikipedia strongly prefers a real User-Agent:
 # https://meta.wikimedia.org/wiki/User-Agent_policy
@@ -10,23 +22,122 @@ HEADERS = {
 }
 
 
+THUMB_DIR = Path("thumb_cache")
+WIKI_CACHE_FILE = Path("wiki_cache.sqlite")
+
+
 class SurferAPIError(Exception):
     pass
 
 
+@timed("api.wikipedia")
 def get_wiki_summary(title: str) -> dict:
     """
     Fetches a Wikipedia summary + thumbnail (if available) for a given page title.
     """
     url = WIKI_SUMMARY_URL.format(title=title.replace(" ", "_"))
     try:
-        r = requests.get(url, headers=HEADERS, timeout=15)
+        r = http_client.get(url, headers=HEADERS, timeout=15)
         if r.status_code != 200:
             raise SurferAPIError(f"Wikipedia error {r.status_code} for {title}")
         return r.json()
+    except (requests.RequestException, ValueError) as e:
+        raise SurferAPIError(str(e))
+
+
+@timed("api.wikipedia")
+def get_wiki_summary_cached(title: str, cache: ForecastCache) -> dict:
+    """
+    Like get_wiki_summary, but revalidates a cached copy with If-None-Match,
+    so an unchanged page costs a 304 instead of a full download.
+    If Wikipedia can't be reached, the cached copy (if any) is returned as-is.
+    """
+    key = f"wiki:{title}{source_tag('wiki')}"
+    cached = cache.get(key)
+    headers = dict(HEADERS)
+    if cached is not None and cached[0].get("etag"):
+        headers["If-None-Match"] = cached[0]["etag"]
+
+    url = WIKI_SUMMARY_URL.format(title=title.replace(" ", "_"))
+    try:
+        r = http_client.get(url, headers=headers, timeout=15)
     except requests.RequestException as e:
+        # Can't revalidate: an old summary beats no card
+        if cached is not None:
+            return cached[0]["data"]
         raise SurferAPIError(str(e))
 
+    if r.status_code == 304 and cached is not None:
+        return cached[0]["data"]
+    if r.status_code != 200:
+        raise SurferAPIError(f"Wikipedia error {r.status_code} for {title}")
+
+    try:
+        data = r.json()
+    except ValueError as e:  # includes requests' JSONDecodeError
+        raise SurferAPIError(f"Wikipedia sent an unreadable summary for {title}: {e}")
+    cache.put(key, {"etag": r.headers.get("ETag"), "data": data})
+    return data
+
+
+def cache_thumbnail(url: str) -> str | None:
+    """
+    Download a thumbnail once into THUMB_DIR and return the local path.
+    Returns None if it can't be fetched (callers fall back to no image).
+    """
+    suffix = Path(url.split("?")[0]).suffix or ".img"
+    path = THUMB_DIR / (hashlib.sha1(url.encode("utf-8")).hexdigest() + suffix)
+    if path.exists():
+        return str(path)
+    try:
+        r = http_client.get(url, headers=HEADERS, timeout=15)
+        if r.status_code != 200:
+            return None
+        THUMB_DIR.mkdir(exist_ok=True)
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        tmp.write_bytes(r.content)
+        tmp.replace(path)
+        return str(path)
+    except (requests.RequestException, OSError):
+        return None
+
+
+def _build_card(surfer: dict, cache: ForecastCache | None) -> dict:
+    card = {
+        "name": surfer["name"],
+        "known_for": surfer["known_for"],
+        "extract": "No summary available.",
+        "thumb": None,
+        "wiki_url": None,
+        "error": None,
+    }
+    try:
+        if cache is not None:
+            data = get_wiki_summary_cached(surfer["wiki_title"], cache)
+        else:
+            data = get_wiki_summary(surfer["wiki_title"])
+    except SurferAPIError as e:
+        card["error"] = str(e)
+        return card
+
+    card["extract"] = data.get("extract", card["extract"])
+    card["wiki_url"] = data.get("content_urls", {}).get("desktop", {}).get("page")
+    if isinstance(data.get("thumbnail"), dict) and data["thumbnail"].get("source"):
+        card["thumb"] = cache_thumbnail(data["thumbnail"]["source"])
+    return card
+
+
+def fetch_surfer_cards(surfers: list[dict] | None = None, max_workers: int = 4,
+                       cache: ForecastCache | None = None) -> list[dict]:
+    """
+    Build legend cards concurrently (bounded pool), in the order of `surfers`.
+    A failed page yields a card with "error" set instead of failing the whole list.
+    """
+    surfers = build_top_surfers() if surfers is None else surfers
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="wiki") as pool:
+        futures = [pool.submit(contextvars.copy_context().run, _build_card, s, cache) for s in surfers]
+        return [f.result() for f in futures]
+
 
 def build_top_surfers() -> list[dict]:
     """
@@ -0,0 +1,106 @@
+import json
+
+import pandas as pd
+import pytest
+
+import batch
+import main
+from batch import LEVELS, read_results, score_spot, write_results
+from benchmarks.recorded import marine
+
+SPOT = {"name": "Tel Aviv - Hilton", "lat": 32.09, "lon": 34.77, "country": "IL", "beach_facing_deg": 270}
+RECORD_KEYS = {"spot", "country", "lat", "lon", "level", "rank", "time", "wave_height", "wave_period",
+               "wind_speed", "surf_score", "wave_dir", "wind_dir", "wind_relation"}
+
+
+def _start(payload: dict) -> float:
+    # Epoch seconds at the start of the payload's first (local) hour
+    return pd.Timestamp(payload["hourly"]["time"][0]).timestamp() - payload["utc_offset_seconds"]
+
+
+def _current(payload: dict) -> dict:
+    """
+    The recorded payload moved so its first hour is the current one.
+    """
+    payload = dict(payload, hourly=dict(payload["hourly"]))
+    local_now = pd.Timestamp.now(tz="UTC").tz_localize(None) + pd.Timedelta(seconds=payload["utc_offset_seconds"])
+    times = pd.date_range(local_now.floor("h"), periods=len(payload["hourly"]["time"]), freq="h")
+    payload["hourly"]["time"] = list(times.strftime("%Y-%m-%dT%H:%M"))
+    return payload
+
+
+def test_score_spot_ranks_the_best_hours_per_level():
+    payload = marine(168)
+    rows = score_spot(SPOT, payload, top_n=3, now=_start(payload))
+
+    assert len(rows) == 3 * len(LEVELS)
+    assert all(set(r) == RECORD_KEYS for r in rows)
+    for level in LEVELS:
+        ranked = [r for r in rows if r["level"] == level]
+        assert [r["rank"] for r in ranked] == [1, 2, 3]
+        assert [r["surf_score"] for r in ranked] == sorted((r["surf_score"] for r in ranked), reverse=True)
+    assert {type(r["wind_relation"]) for r in rows} == {str}
+
+
+def test_score_spot_without_hourly_data_is_empty():
+    assert score_spot(SPOT, {"hourly": {}}) == []
+
+
+@pytest.mark.parametrize("fmt", ["json", "csv"])
+def test_results_round_trip(tmp_path, fmt):
+    payload = marine(168)
+    df = pd.DataFrame(score_spot(SPOT, payload, top_n=2, now=_start(payload)))
+    path = write_results(df, tmp_path / f"results.{fmt}")
+    back = read_results(path)
+
+    assert back.columns.tolist() == df.columns.tolist()
+    assert back[["spot", "level", "rank", "surf_score"]].equals(df[["spot", "level", "rank", "surf_score"]])
+    assert pd.to_datetime(back["time"]).tolist() == df["time"].tolist()
+
+
+def test_json_results_are_records_with_iso_times(tmp_path):
+    payload = marine(168)
+    df = pd.DataFrame(score_spot(SPOT, payload, top_n=1, now=_start(payload)))
+    records = json.loads(write_results(df, tmp_path / "out.json").read_text(encoding="utf-8"))
+
+    assert len(records) == len(LEVELS)
+    assert records[0]["time"] == df["time"][0].strftime("%Y-%m-%dT%H:%M")
+
+
+def test_unknown_output_format_is_rejected(tmp_path):
+    with pytest.raises(ValueError, match="Unsupported output format"):
+        write_results(pd.DataFrame(), tmp_path / "out.xlsx")
+
+
+def test_cli_scores_a_catalog_into_a_file(tmp_path, monkeypatch):
+    catalog = tmp_path / "spots.csv"
+    catalog.write_text(
+        "name,lat,lon,country,beach_facing_deg\n"
+        "Tel Aviv - Hilton,32.09,34.77,IL,270\n"
+        "Haifa - Bat Galim,32.83,34.98,IL,300\n",
+        encoding="utf-8",
+    )
+    payload = _current(marine(168))
+    monkeypatch.setattr(batch, "fetch_marine_for_spots", lambda spots, chunk_size=50: {s["name"]: payload for s in spots})
+
+    out = tmp_path / "results.csv"
+    assert main.main(["--catalog", str(catalog), "--levels", "Advanced", "--top", "2",
+                      "--processes", "1", "-o", str(out)]) == 0
+    df = read_results(out)
+    assert sorted(df["spot"].unique()) == ["Haifa - Bat Galim", "Tel Aviv - Hilton"]
+    assert set(df["level"]) == {"Advanced"}
+    assert len(df) == 4
+
+
+def test_score_spot_skips_hours_that_have_ended():
+    payload = marine(168)
+    # 30 minutes into hour 10: hours 0-9 are over, hour 10 is still on
+    now = _start(payload) + 10 * 3600 + 1800
+    rows = score_spot(SPOT, payload, top_n=168, now=now)
+    first = pd.Timestamp(payload["hourly"]["time"][10])
+
+    for level in LEVELS:
+        times = sorted(r["time"] for r in rows if r["level"] == level)
+        assert len(times) == 158
+        assert times[0] == first
+    assert score_spot(SPOT, payload, now=_start(payload) + 168 * 3600) == []
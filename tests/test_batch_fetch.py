@@ -0,0 +1,105 @@
+import pytest
+import requests
+
+import http_client
+from benchmarks.recorded import FakeResponse, load
+from extras_api import get_extras_batch
+from marine_api import get_marine_hourly_batch
+
+SPOTS = [{"name": f"Spot {i}", "lat": 30.0 + i, "lon": 34.0 + i} for i in range(5)]
+
+PROVIDERS = [
+    pytest.param(get_marine_hourly_batch, "open_meteo_marine", id="marine"),
+    pytest.param(get_extras_batch, "open_meteo_extras", id="extras"),
+]
+
+
+class RecordedProvider:
+    """
+    http_client.get stand-in answering from a recorded payload, tagged with the
+    request's latitude so each spot's payload can be told apart.
+    `fail(lats)` decides per request whether to raise, return an error status or answer.
+    """
+
+    def __init__(self, fixture: str, fail=lambda lats: None):
+        self.payload = load(fixture)
+        self.fail = fail
+        self.calls = []
+
+    def __call__(self, url, params=None, **kwargs):
+        lats = str(params["latitude"]).split(",")
+        self.calls.append(lats)
+        failure = self.fail(lats)
+        if isinstance(failure, Exception):
+            raise failure
+        if failure is not None:
+            return failure
+        answers = [{**self.payload, "latitude": float(lat)} for lat in lats]
+        return FakeResponse(answers if len(lats) > 1 else answers[0])
+
+
+@pytest.mark.parametrize("fetch_batch, fixture", PROVIDERS)
+def test_batch_splits_list_response_per_spot(monkeypatch, fetch_batch, fixture):
+    provider = RecordedProvider(fixture)
+    monkeypatch.setattr(http_client, "get", provider)
+
+    out = fetch_batch(SPOTS, chunk_size=2)
+
+    assert [len(c) for c in provider.calls] == [2, 2, 1]
+    assert list(out) == [s["name"] for s in SPOTS]
+    for s in SPOTS:
+        assert out[s["name"]]["latitude"] == s["lat"]
+        assert out[s["name"]]["hourly"] == load(fixture)["hourly"]
+
+
+@pytest.mark.parametrize("fetch_batch, fixture", PROVIDERS)
+def test_size_mismatch_falls_back_to_single_spots(monkeypatch, fetch_batch, fixture):
+    payload = load(fixture)
+    # The batch answer has one payload too few
+    provider = RecordedProvider(fixture, lambda lats: FakeResponse([payload] * (len(lats) - 1)) if len(lats) > 1 else None)
+    monkeypatch.setattr(http_client, "get", provider)
+
+    out = fetch_batch(SPOTS[:3], chunk_size=3)
+
+    assert [len(c) for c in provider.calls] == [3, 1, 1, 1]
+    assert {name: p["latitude"] for name, p in out.items()} == {s["name"]: s["lat"] for s in SPOTS[:3]}
+
+
+@pytest.mark.parametrize("fetch_batch, fixture", PROVIDERS)
+@pytest.mark.parametrize(
+    "failure",
+    [FakeResponse({"error": True}, status_code=500), requests.ConnectionError("reset")],
+    ids=["status", "connection"],
+)
+def test_failing_chunk_falls_back_and_drops_failed_spots(monkeypatch, fetch_batch, fixture, failure):
+    first_chunk = {str(s["lat"]) for s in SPOTS[:2]}
+    broken = str(SPOTS[1]["lat"])
+
+    def fail(lats):
+        if set(lats) == first_chunk or lats == [broken]:
+            return failure
+        return None
+
+    provider = RecordedProvider(fixture, fail)
+    monkeypatch.setattr(http_client, "get", provider)
+
+    out = fetch_batch(SPOTS, chunk_size=2)
+
+    # Chunk 1 failed and was retried spot by spot; chunks 2 and 3 went through as batches
+    assert [len(c) for c in provider.calls] == [2, 1, 1, 2, 1]
+    assert list(out) == [SPOTS[0]["name"], SPOTS[2]["name"], SPOTS[3]["name"], SPOTS[4]["name"]]
+
+
+@pytest.mark.parametrize("fetch_batch, fixture", PROVIDERS)
+def test_bad_body_falls_back(monkeypatch, fetch_batch, fixture):
+    class NotJSON(FakeResponse):
+        def json(self):
+            raise ValueError("not JSON")
+
+    provider = RecordedProvider(fixture, lambda lats: NotJSON(None) if len(lats) > 1 else None)
+    monkeypatch.setattr(http_client, "get", provider)
+
+    out = fetch_batch(SPOTS[:2], chunk_size=2)
+
+    assert [len(c) for c in provider.calls] == [2, 1, 1]
+    assert sorted(out) == sorted(s["name"] for s in SPOTS[:2])
@@ -0,0 +1,67 @@
+import pytest
+
+import catalog
+from catalog import SpotCatalog, SpotCatalogError
+
+
+def _write_shards(directory):
+    (directory / "IL.csv").write_text(
+        "name,lat,lon,beach_facing_deg\n"
+        "Tel Aviv - Hilton,32.09,34.77,270\n"
+        "Haifa - Bat Galim,32.83,34.98,300\n",
+        encoding="utf-8",
+    )
+    (directory / "pt.jsonl").write_text(
+        '{"name": "Portugal - Nazare", "lat": 39.6, "lon": -9.08, "country": "pt"}\n', encoding="utf-8"
+    )
+
+
+@pytest.fixture
+def reads(monkeypatch):
+    """
+    Paths catalog.read_spot_file was called with, in order.
+    """
+    calls = []
+    real = catalog.read_spot_file
+
+    def counting(path):
+        calls.append(path.name)
+        return real(path)
+
+    monkeypatch.setattr(catalog, "read_spot_file", counting)
+    return calls
+
+
+def test_countries_without_reading_any_shard(tmp_path, reads):
+    _write_shards(tmp_path)
+    cat = SpotCatalog.from_shards(tmp_path)
+
+    assert cat.countries() == ["IL", "PT"]
+    assert reads == []
+    assert len(cat) == 0
+
+
+def test_shard_is_read_once_on_first_access(tmp_path, reads):
+    _write_shards(tmp_path)
+    cat = SpotCatalog.from_shards(tmp_path)
+
+    assert cat.names("IL") == ["Tel Aviv - Hilton", "Haifa - Bat Galim"]
+    assert cat.names("IL") == ["Tel Aviv - Hilton", "Haifa - Bat Galim"]
+    assert cat.get("Haifa - Bat Galim", "IL")["lat"] == 32.83
+    assert reads == ["IL.csv"]
+
+    assert cat.get("Portugal - Nazare")["country"] == "PT"
+    assert reads == ["IL.csv", "pt.jsonl"]
+    assert cat.countries() == ["IL", "PT"]
+
+
+def test_shard_records_default_to_the_shard_country(tmp_path):
+    _write_shards(tmp_path)
+    spots = SpotCatalog.from_shards(tmp_path).spots("IL")
+    assert {s["country"] for s in spots} == {"IL"}
+
+
+def test_shard_record_for_another_country_is_rejected(tmp_path):
+    (tmp_path / "IL.csv").write_text("name,lat,lon,country\nNazare,39.6,-9.08,PT\n", encoding="utf-8")
+    with pytest.raises(SpotCatalogError, match="IL shard"):
+        SpotCatalog.from_shards(tmp_path).spots("IL")
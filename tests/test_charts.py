@@ -0,0 +1,74 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from charts import downsample, forecast_figure, lttb_indices
+
+
+def _series(n: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    return np.arange(n, dtype=float), np.cumsum(rng.normal(size=n))
+
+
+@pytest.mark.parametrize("n,threshold", [(1000, 100), (168, 50), (10, 3)])
+def test_lttb_keeps_the_ends_and_returns_threshold_points(n, threshold):
+    x, y = _series(n)
+    idx = lttb_indices(x, y, threshold)
+
+    assert len(idx) == threshold
+    assert idx[0] == 0 and idx[-1] == n - 1
+    assert np.all(np.diff(idx) > 0)
+
+
+def test_lttb_keeps_the_peak():
+    x, y = _series(1000)
+    y[437] = 100.0
+    assert 437 in lttb_indices(x, y, 50)
+
+
+def test_lttb_below_threshold_returns_every_point():
+    x, y = _series(20)
+    assert lttb_indices(x, y, 50).tolist() == list(range(20))
+
+
+def test_lttb_never_picks_nan():
+    x, y = _series(1000)
+    y[:5] = np.nan
+    y[400:450] = np.nan
+    y[-3:] = np.nan
+    idx = lttb_indices(x, y, 100)
+
+    assert len(idx) == 100
+    assert not np.isnan(y[idx]).any()
+    assert idx[0] == 5 and idx[-1] == 996
+
+
+def _frame(y: np.ndarray) -> pd.DataFrame:
+    return pd.DataFrame({"time": pd.date_range("2026-01-01", periods=len(y), freq="h"), "surf_score": y})
+
+
+def test_downsample_keeps_a_break_in_each_gap():
+    _, y = _series(1000)
+    y[400:450] = np.nan
+    y[700] = np.nan
+    part = downsample(_frame(y), "time", "surf_score", budget=100)
+
+    assert part["surf_score"].isna().sum() == 2
+    assert part.index[part["surf_score"].isna()].tolist() == [400, 700]
+    assert part.index.is_monotonic_increasing
+
+
+def test_downsample_without_gaps_is_plain_lttb():
+    _, y = _series(1000)
+    part = downsample(_frame(y), "time", "surf_score", budget=100)
+    assert part.index.tolist() == lttb_indices(np.arange(1000), y, 100).tolist()
+
+
+def test_forecast_figure_breaks_the_line_at_gaps():
+    _, y = _series(168)
+    y[50:60] = np.nan
+    fig = forecast_figure(_frame(y), budget=40, series=[("surf_score", "score")])
+
+    ys = list(fig.data[0].y)
+    assert ys.count(None) == 1
+    assert len(ys) == 41
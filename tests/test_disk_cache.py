@@ -0,0 +1,99 @@
+import threading
+import time
+
+import pytest
+import requests
+
+from disk_cache import PROVIDER_MAX_STALE, PROVIDER_TTL, ForecastCache
+
+
+def test_overridden_base_url_gets_its_own_keys(tmp_path, monkeypatch):
+    cache = ForecastCache(tmp_path / "forecast_cache.sqlite")
+    monkeypatch.delenv("OPEN_METEO_MARINE_BASE_URL", raising=False)
+    real_key = ForecastCache.make_key("marine", 32.1, 34.75)
+    cache.put(real_key, {"source": "real"})
+
+    monkeypatch.setenv("OPEN_METEO_MARINE_BASE_URL", "http://127.0.0.1:8765")
+    mock_key = ForecastCache.make_key("marine", 32.1, 34.75)
+    assert mock_key != real_key
+    assert cache.get_or_fetch("marine", 32.1, 34.75, lambda: {"source": "mock"}) == {"source": "mock"}
+
+    monkeypatch.delenv("OPEN_METEO_MARINE_BASE_URL")
+    assert cache.get(real_key)[0] == {"source": "real"}
+
+
+def _age(cache: ForecastCache, key: str, seconds: float) -> None:
+    cache._db.execute("UPDATE entries SET fetched_at = ? WHERE key = ?", (time.time() - seconds, key))
+    cache._db.commit()
+
+
+def _wait_for_refresh(cache: ForecastCache) -> None:
+    cache._pool.shutdown(wait=True)
+
+
+def _down():
+    raise requests.ConnectionError("down")
+
+
+def test_stale_hit_returns_the_old_payload_while_it_refreshes(tmp_path):
+    cache = ForecastCache(tmp_path / "forecast_cache.sqlite")
+    key = ForecastCache.make_key("marine", 32.1, 34.75)
+    cache.put(key, {"v": 1})
+    _age(cache, key, PROVIDER_TTL["marine"] + 60)
+
+    release = threading.Event()
+
+    def fetch():
+        release.wait(5)
+        return {"v": 2}
+
+    assert cache.get_or_fetch("marine", 32.1, 34.75, fetch) == {"v": 1}
+    # A second stale read doesn't start another refresh
+    assert cache.get_or_fetch("marine", 32.1, 34.75, lambda: {"v": 3}) == {"v": 1}
+    release.set()
+    _wait_for_refresh(cache)
+
+    assert cache.get(key)[0] == {"v": 2}
+    assert cache.stats()["stale"] == 2
+
+
+def test_failed_refresh_keeps_the_stale_entry(tmp_path):
+    cache = ForecastCache(tmp_path / "forecast_cache.sqlite")
+    key = ForecastCache.make_key("marine", 32.1, 34.75)
+    cache.put(key, {"v": 1})
+    _age(cache, key, PROVIDER_TTL["marine"] + 60)
+
+    assert cache.get_or_fetch("marine", 32.1, 34.75, _down) == {"v": 1}
+    _wait_for_refresh(cache)
+
+    assert cache.get(key)[0] == {"v": 1}
+    assert not cache._refreshing
+
+
+def test_entry_past_max_stale_is_fetched_synchronously(tmp_path):
+    cache = ForecastCache(tmp_path / "forecast_cache.sqlite")
+    key = ForecastCache.make_key("marine", 32.1, 34.75)
+    cache.put(key, {"v": 1})
+    _age(cache, key, PROVIDER_TTL["marine"] + PROVIDER_MAX_STALE["marine"] + 1)
+
+    assert cache.get_or_fetch("marine", 32.1, 34.75, lambda: {"v": 2}) == {"v": 2}
+    assert cache.stats()["expired"] == 1
+
+    # Nothing older to fall back on: the fetch error reaches the caller
+    _age(cache, key, PROVIDER_TTL["marine"] + PROVIDER_MAX_STALE["marine"] + 1)
+    with pytest.raises(requests.ConnectionError):
+        cache.get_or_fetch("marine", 32.1, 34.75, _down)
+
+
+def test_reads_are_recorded_for_eviction_without_writing(tmp_path):
+    cache = ForecastCache(tmp_path / "forecast_cache.sqlite", max_bytes=40)
+    cache.put("a", {"v": "x" * 10})
+    cache.put("b", {"v": "y" * 10})
+    changes = cache._db.total_changes
+    assert cache.get("a") is not None
+    assert cache._db.total_changes == changes
+
+    # "a" was read after "b" was written, so "b" is the least recently used
+    cache.put("c", {"v": "z" * 10})
+    assert cache.get("a") is not None
+    assert cache.get("b") is None
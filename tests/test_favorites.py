@@ -0,0 +1,45 @@
+import json
+import os
+import stat
+
+import pytest
+
+import favorites
+from favorites import FavoritesStore
+
+
+def test_toggle_on_read_only_disk_keeps_change_in_memory(tmp_path, monkeypatch):
+    path = tmp_path / "favorites.json"
+    path.write_text('["Hilton Beach"]', encoding="utf-8")
+    # The sidecar can't be opened and the temp file can't be created, as on a read-only disk
+    (tmp_path / "favorites.json.lock").mkdir()
+
+    def read_only(*args, **kwargs):
+        raise PermissionError("read-only file system")
+
+    monkeypatch.setattr(favorites.tempfile, "mkstemp", read_only)
+    store = FavoritesStore(path)
+
+    assert store.toggle("Maravilla") == ["Maravilla", "Hilton Beach"]
+    assert store.load() == ["Maravilla", "Hilton Beach"]
+    assert path.read_text(encoding="utf-8") == '["Hilton Beach"]'
+
+
+@pytest.mark.skipif(os.name == "nt", reason="POSIX file modes")
+@pytest.mark.parametrize("mode", [0o644, 0o600, 0o664])
+def test_save_keeps_the_file_mode(tmp_path, mode):
+    path = tmp_path / "favorites.json"
+    path.write_text("[]", encoding="utf-8")
+    os.chmod(path, mode)
+
+    FavoritesStore(path).toggle("Maravilla")
+
+    assert stat.S_IMODE(path.stat().st_mode) == mode
+    assert json.loads(path.read_text(encoding="utf-8")) == ["Maravilla"]
+
+
+@pytest.mark.skipif(os.name == "nt", reason="POSIX file modes")
+def test_new_file_is_not_private(tmp_path):
+    path = tmp_path / "favorites.json"
+    FavoritesStore(path).toggle("Maravilla")
+    assert stat.S_IMODE(path.stat().st_mode) == favorites.NEW_FILE_MODE
@@ -0,0 +1,38 @@
+import geocoder
+from disk_cache import ForecastCache
+from geocoder import Gazetteer, Geocoder
+
+PLACES = [
+    {"name": "Santa Cruz", "state": "CA", "country": "US", "lat": 36.97, "lon": -122.03, "population": 65_000},
+    {"name": "San Diego", "state": "CA", "country": "US", "lat": 32.72, "lon": -117.16, "population": 1_380_000},
+    {"name": "San Clemente", "state": "CA", "country": "US", "lat": 33.43, "lon": -117.61, "population": 64_000},
+    {"name": "Sagres", "state": "", "country": "PT", "lat": 37.01, "lon": -8.94, "population": 2_000},
+]
+
+
+def test_suggest_is_most_populous_first_below_the_limit():
+    names = [p["name"] for p in Gazetteer(PLACES).suggest("san", limit=5)]
+
+    assert names == ["San Diego", "Santa Cruz", "San Clemente"]
+
+
+def test_suggest_keeps_the_most_populous_at_the_limit():
+    names = [p["name"] for p in Gazetteer(PLACES).suggest("sa", limit=2)]
+
+    assert names == ["San Diego", "Santa Cruz"]
+
+
+def test_stats_count_where_lookups_were_answered(tmp_path, monkeypatch):
+    api = []
+    monkeypatch.setattr(geocoder, "geocode_city", lambda city, key, limit=5: api.append(city) or [{"name": city}])
+    geo = Geocoder("key", gazetteer=Gazetteer(PLACES), cache=ForecastCache(tmp_path / "geocode_cache.sqlite"))
+
+    geo.geocode("San Diego")
+    geo.geocode("Hossegor")
+    geo.geocode("Hossegor")
+    stats = geo.stats()
+
+    assert api == ["Hossegor"]
+    assert (stats["lookups"], stats["gazetteer_hits"], stats["cache_hits"], stats["api_calls"]) == (3, 1, 1, 1)
+    assert stats["hit_rate"] == 2 / 3
+    assert 0 < stats["p50_ms"] <= stats["p99_ms"]
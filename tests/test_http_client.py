@@ -0,0 +1,100 @@
+import itertools
+import threading
+
+import pytest
+import requests
+
+import http_client
+from benchmarks.recorded import FakeResponse
+
+_hosts = itertools.count()
+
+
+@pytest.fixture
+def host(monkeypatch):
+    """
+    A fresh host (own breaker) whose session answers from `host.responses`
+    (a status code, or an exception to raise), without backoff sleeps.
+    """
+    monkeypatch.setattr(http_client, "BACKOFF_BASE", 0.0)
+    url = f"http://provider-{next(_hosts)}.test/v1"
+
+    class Session:
+        responses = []
+        calls = 0
+
+        def get(self, url, **kwargs):
+            Session.calls += 1
+            answer = Session.responses.pop(0) if Session.responses else 200
+            if isinstance(answer, Exception):
+                raise answer
+            return FakeResponse({}, status_code=answer)
+
+    monkeypatch.setattr(http_client, "get_session", lambda url: Session())
+    Session.url = url
+    return Session
+
+
+def test_retries_count_as_one_failure(host):
+    host.responses = [503] * (http_client.MAX_RETRIES + 1)
+
+    assert http_client.get(host.url).status_code == 503
+    assert host.calls == http_client.MAX_RETRIES + 1
+    assert http_client._guards(host.url)[0].failures == 1
+
+
+def test_breaker_opens_after_threshold_calls(host):
+    host.responses = [requests.ConnectionError("down")] * (http_client.BREAKER_THRESHOLD * (http_client.MAX_RETRIES + 1))
+    for _ in range(http_client.BREAKER_THRESHOLD):
+        with pytest.raises(requests.ConnectionError):
+            http_client.get(host.url)
+
+    with pytest.raises(http_client.CircuitOpenError):
+        http_client.get(host.url)
+
+
+def test_half_open_admits_a_single_probe(host, monkeypatch):
+    breaker = http_client._guards(host.url)[0]
+    breaker.failures = http_client.BREAKER_THRESHOLD
+    breaker.opened_at = 0.0  # long past the cooldown
+
+    release = threading.Event()
+    probing = threading.Event()
+
+    def slow_get(url, **kwargs):
+        probing.set()
+        release.wait(5)
+        return FakeResponse({}, status_code=200)
+
+    monkeypatch.setattr(host, "get", lambda self, url, **kwargs: slow_get(url))
+    probe = threading.Thread(target=http_client.get, args=(host.url,), kwargs={"params": {"probe": 1}})
+    probe.start()
+    assert probing.wait(5)
+
+    # While the probe is out, other calls are short-circuited
+    with pytest.raises(http_client.CircuitOpenError):
+        http_client.get(host.url, params={"other": 1})
+
+    release.set()
+    probe.join(5)
+    assert breaker.opened_at is None
+    assert http_client.get(host.url).status_code == 200
+
+
+def test_failed_probe_reopens(host):
+    breaker = http_client._guards(host.url)[0]
+    breaker.failures = http_client.BREAKER_THRESHOLD
+    breaker.opened_at = 0.0
+    host.responses = [500] * (http_client.MAX_RETRIES + 1)
+
+    assert http_client.get(host.url).status_code == 500
+    with pytest.raises(http_client.CircuitOpenError):
+        http_client.get(host.url)
+
+
+def test_flight_key_accepts_pair_lists():
+    as_dict = http_client._flight_key("u", {"params": {"lat": 1, "lon": 2}})
+    as_pairs = http_client._flight_key("u", {"params": [("lon", 2), ("lat", 1)]})
+
+    assert as_dict == as_pairs
+    assert http_client._flight_key("u", {"params": "lat=1&lon=2"}) != as_dict
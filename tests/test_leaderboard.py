@@ -0,0 +1,58 @@
+import pandas as pd
+
+from benchmarks.recorded import marine, synthetic_spots
+from leaderboard import Leaderboard, _valid_until
+
+
+def _start(payload: dict) -> float:
+    # Epoch seconds at the start of the payload's first (local) hour
+    return pd.Timestamp(payload["hourly"]["time"][0]).timestamp() - payload["utc_offset_seconds"]
+
+
+def test_ranks_only_upcoming_hours_and_rescores_when_the_best_hour_ends():
+    payload = marine(168)
+    spots = synthetic_spots(8)
+    payloads = {s["name"]: (payload, 1.0) for s in spots}
+    board = Leaderboard(levels=["Intermediate"], processes=1)
+    now = _start(payload) + 30 * 3600
+
+    assert board.update(spots, payloads, now=now)["scored"] == 8
+    first = board.table("Intermediate")
+    cutoff = pd.Timestamp(payload["hourly"]["time"][30])
+    assert (pd.to_datetime(first["time"]) >= cutoff).all()
+
+    # Same forecast, best hours still ahead: nothing to re-score
+    assert board.update(spots, payloads, now=now + 60)["scored"] == 0
+
+    earliest = pd.Timestamp(first["time"].min())
+    ended = earliest.timestamp() - payload["utc_offset_seconds"] + 3600
+    result = board.update(spots, payloads, now=ended)
+    assert result["scored"] == (pd.to_datetime(first["time"]) == earliest).sum()
+    assert (pd.to_datetime(board.table("Intermediate")["time"]) > earliest).all()
+
+
+def test_valid_until_is_the_end_of_the_earliest_best_hour():
+    payload = marine(168)
+    times = payload["hourly"]["time"]
+    rows = [{"time": pd.Timestamp(times[7])}, {"time": pd.Timestamp(times[3])}]
+
+    assert _valid_until(rows, payload) == _start(payload) + 4 * 3600
+    assert _valid_until([], payload) == float("inf")
+
+
+def test_only_spots_whose_forecast_changed_or_best_hour_ended_are_rescored():
+    payload = marine(168)
+    spots = synthetic_spots(4)
+    board = Leaderboard(levels=["Advanced"], processes=1)
+    now = _start(payload)
+    board.update(spots, {s["name"]: (payload, 1.0) for s in spots}, now=now)
+
+    # One spot's forecast was refetched
+    payloads = {s["name"]: (payload, 2.0 if i == 0 else 1.0) for i, s in enumerate(spots)}
+    assert board.update(spots, payloads, now=now)["scored"] == 1
+
+    # Past every spot's valid_until: all of them are re-scored, once
+    later = max(until for _, until, _ in board._results.values())
+    result = board.update(spots, payloads, now=later)
+    assert (result["scored"], result["reused"]) == (4, 0)
+    assert board.update(spots, payloads, now=later)["scored"] == 0
@@ -0,0 +1,30 @@
+import numpy as np
+import pytest
+
+from memory_cache import BoundedCache, estimate_bytes
+
+
+def test_figure_is_measured_by_its_traces():
+    go = pytest.importorskip("plotly.graph_objects")
+    fig = go.Figure(go.Scatter(x=np.arange(20_000), y=np.random.default_rng(0).random(20_000)))
+
+    assert estimate_bytes(fig) >= 2 * 20_000 * 8
+
+
+def test_deck_is_measured_by_its_json():
+    pdk = pytest.importorskip("pydeck")
+    records = [{"p": [float(i), 0.0], "n": f"Spot {i}"} for i in range(5_000)]
+    deck = pdk.Deck(layers=[pdk.Layer("ScatterplotLayer", data=records, get_position="p")])
+
+    assert estimate_bytes(deck) >= len(deck.to_json())
+
+
+def test_byte_cap_evicts_figures():
+    go = pytest.importorskip("plotly.graph_objects")
+    figs = [go.Figure(go.Scatter(y=np.zeros(10_000))) for _ in range(3)]
+    cache = BoundedCache(max_entries=10, max_bytes=2 * estimate_bytes(figs[0]) + 1024)
+
+    for i, fig in enumerate(figs):
+        cache.put(i, fig)
+
+    assert len(cache) == 2 and 0 not in cache
@@ -0,0 +1,31 @@
+import json
+
+import pytest
+
+import metrics
+
+
+@pytest.mark.parametrize("fmt", ["jsonl", "json"])
+def test_export_jsonl(tmp_path, fmt):
+    metrics.record("test.stage", 0.25)
+
+    path = metrics.export(tmp_path, fmt=fmt)
+
+    assert path.suffix == ".jsonl"
+    line = json.loads(path.read_text(encoding="utf-8").splitlines()[-1])
+    assert line["timers"]["test.stage"]["count"] >= 1
+
+
+def test_export_prometheus_by_default(tmp_path, monkeypatch):
+    monkeypatch.delenv(metrics.METRICS_FORMAT_ENV, raising=False)
+    metrics.record("test.stage", 0.25)
+
+    path = metrics.export(tmp_path)
+
+    assert path.suffix == ".prom"
+    assert 'surf_stage_seconds_count{stage="test.stage"' in path.read_text(encoding="utf-8")
+
+
+def test_export_rejects_unknown_format(tmp_path):
+    with pytest.raises(ValueError):
+        metrics.export(tmp_path, fmt="csv")
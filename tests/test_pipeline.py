@@ -0,0 +1,19 @@
+import numpy as np
+import pytest
+
+from memory_cache import BoundedCache
+from pipeline import Pipeline
+
+
+def test_figure_stage_counts_against_the_byte_cap():
+    go = pytest.importorskip("plotly.graph_objects")
+    cache = BoundedCache(max_entries=10, max_bytes=1024 * 1024)
+    pipe = Pipeline(cache)
+
+    pipe.stage("chart", "a", lambda: go.Figure(go.Scatter(y=np.zeros(20_000))))
+    pipe.stage("chart", "a", lambda: pytest.fail("should be reused"))
+
+    ran, reused = pipe.report()
+    assert ran["status"] == "ran" and ran["kb"] >= 20_000 * 8 / 1024
+    assert reused["status"] == "reused" and reused["kb"] is None
+    assert cache.stats()["bytes"] / 1024 == pytest.approx(ran["kb"], abs=0.1)
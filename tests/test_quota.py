@@ -0,0 +1,103 @@
+import threading
+import time
+
+import pytest
+import requests
+
+import quota
+from disk_cache import ForecastCache
+from quota import QuotaManager
+
+PAYLOAD = {"cod": 200, "name": "Tel Aviv"}
+
+
+@pytest.fixture
+def store(tmp_path):
+    return ForecastCache(tmp_path / "forecast_cache.sqlite")
+
+
+def test_failed_refresh_serves_the_stale_cell(store, monkeypatch):
+    manager = QuotaManager("key", store=store, ttl=0.0)
+    monkeypatch.setattr(quota, "get_current_by_coords", lambda *a, **kw: PAYLOAD)
+    manager.current(32.08, 34.77)
+
+    def down(*args, **kwargs):
+        raise requests.ConnectionError("down")
+
+    monkeypatch.setattr(quota, "get_current_by_coords", down)
+    time.sleep(0.01)
+
+    assert manager.current(32.08, 34.77) == PAYLOAD
+    assert manager.report()["degraded"] == 1
+
+
+def test_failed_fetch_without_cache_raises(store, monkeypatch):
+    manager = QuotaManager("key", store=store)
+
+    def down(*args, **kwargs):
+        raise quota.WeatherAPIError("city not found")
+
+    monkeypatch.setattr(quota, "get_current_by_coords", down)
+
+    with pytest.raises(quota.WeatherAPIError):
+        manager.current(32.08, 34.77)
+
+
+def test_calls_today_survive_a_restart(store, monkeypatch):
+    monkeypatch.setattr(quota, "get_current_by_coords", lambda *a, **kw: PAYLOAD)
+    QuotaManager("key", store=store).current(32.08, 34.77)
+    QuotaManager("key", store=store).current(40.0, -8.0)
+
+    assert QuotaManager("key", store=store).report()["calls_today"] == 2
+    assert QuotaManager("other key", store=store).report()["calls_today"] == 0
+
+
+def test_two_cache_handles_never_lose_increments(tmp_path):
+    path = tmp_path / "forecast_cache.sqlite"
+    handles = [ForecastCache(path), ForecastCache(path)]
+
+    def bump(cache):
+        for _ in range(50):
+            cache.increment("quota:key:1")
+
+    threads = [threading.Thread(target=bump, args=(h,)) for h in handles for _ in range(3)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert handles[0].counter("quota:key:1") == handles[1].counter("quota:key:1") == 300
+
+
+def test_increment_stops_at_the_limit(store):
+    assert [store.increment("n", limit=2) for _ in range(3)] == [1, 2, None]
+    assert store.counter("n") == 2
+
+
+def test_managers_on_two_handles_share_one_day_budget(tmp_path, monkeypatch):
+    monkeypatch.setattr(quota, "get_current_by_coords", lambda *a, **kw: PAYLOAD)
+    path = tmp_path / "forecast_cache.sqlite"
+    managers = [QuotaManager("key", per_day=20, reserve=0.1, store=ForecastCache(path)) for _ in range(2)]
+
+    # The reserve (2 calls) is only spent on cells with nothing cached, so every call here may use it
+    served = 0
+    for i in range(30):
+        try:
+            managers[i % 2].current(10.0 + i, 20.0)
+            served += 1
+        except quota.QuotaExceededError:
+            pass
+
+    assert served == 20
+    assert [m.report()["calls_today"] for m in managers] == [20, 20]
+
+
+def test_day_count_survives_eviction(tmp_path, monkeypatch):
+    monkeypatch.setattr(quota, "get_current_by_coords", lambda *a, **kw: {"pad": "x" * 200})
+    store = ForecastCache(tmp_path / "forecast_cache.sqlite", max_bytes=300)
+    manager = QuotaManager("key", store=store)
+    for i in range(5):
+        manager.current(10.0 + i, 20.0)
+
+    assert store.stats()["evictions"] > 0
+    assert QuotaManager("key", store=store).report()["calls_today"] == 5
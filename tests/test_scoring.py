@@ -0,0 +1,152 @@
+import itertools
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.recorded import marine
+from forecast import CompactForecast, marine_to_df
+from scoring import (
+    PERIOD_TABLE,
+    WAVE_TABLES,
+    WIND_TABLES,
+    add_scores,
+    best_hours,
+    score_forecast,
+    surf_score_row,
+    top_hour_indices,
+    top_session_starts,
+    window_scores,
+)
+
+LEVELS = list(WAVE_TABLES) + ["Unknown"]
+
+
+def _around(edges) -> list[float]:
+    # Every bucket edge, a hair either side of it, NaN and a negative value
+    values = {-1.0, 0.0, float("nan")}
+    for e in edges:
+        values.update((float(e), np.nextafter(float(e), -np.inf), np.nextafter(float(e), np.inf)))
+    return sorted(values, key=lambda v: (v != v, v))
+
+
+def _edge_frame() -> pd.DataFrame:
+    wave = _around({e for edges, _ in WAVE_TABLES.values() for e in edges})
+    period = _around(PERIOD_TABLE[0])
+    wind = _around({e for edges, _ in WIND_TABLES.values() for e in edges})
+    rows = list(itertools.product(wave, period, wind, ["Offshore", "Onshore", "Cross", ""]))
+    return pd.DataFrame(rows, columns=["wave_height", "wave_period", "wind_speed", "wind_relation"])
+
+
+def _rowwise(df: pd.DataFrame, level: str) -> np.ndarray:
+    cols = [df[c].tolist() if c in df else [None] * len(df)
+            for c in ("wave_height", "wave_period", "wind_speed", "wind_relation")]
+    return np.array([surf_score_row(h, p, w, r, level) for h, p, w, r in zip(*cols)])
+
+
+@pytest.mark.parametrize("level", LEVELS)
+def test_add_scores_matches_surf_score_row_at_every_bucket_edge(level):
+    df = _edge_frame()
+    assert np.array_equal(add_scores(df, level)["surf_score"].to_numpy(), _rowwise(df, level))
+    no_relation = df.drop(columns=["wind_relation"])
+    assert np.array_equal(add_scores(no_relation, level)["surf_score"].to_numpy(), _rowwise(no_relation, level))
+
+
+@pytest.mark.parametrize("level", LEVELS)
+def test_add_scores_treats_none_like_surf_score_row(level):
+    # object columns keep real None values
+    df = pd.DataFrame(
+        {
+            "wave_height": [None, 0.5, 1.0, 2.5],
+            "wave_period": [10, None, 7, float("nan")],
+            "wind_speed": [2, 5, None, 12],
+            "wind_relation": ["Offshore", None, "Onshore", "Cross"],
+        },
+        dtype=object,
+    )
+    assert np.array_equal(add_scores(df, level)["surf_score"].to_numpy(), _rowwise(df, level))
+
+
+@pytest.mark.parametrize("level", LEVELS)
+def test_score_forecast_matches_add_scores_on_the_recorded_forecast(level):
+    payload = marine(168)
+    df = marine_to_df(payload, 270)
+    fc = CompactForecast.from_marine_json(payload, 270)
+    assert np.array_equal(score_forecast(fc, level), add_scores(df, level)["surf_score"].to_numpy())
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_top_hour_indices_matches_best_hours_on_ties(seed):
+    rng = np.random.default_rng(seed)
+    scores = rng.integers(0, 5, 168).astype(float)  # lots of ties at the cut
+    df = pd.DataFrame({"surf_score": scores})
+    df[["time", "wave_height", "wave_period", "wind_speed", "wave_dir", "wind_dir", "wind_relation"]] = 0
+
+    for top_n in (1, 6, 24):
+        expected = best_hours(df, top_n=top_n).index.to_numpy()
+        assert top_hour_indices(scores, top_n).tolist() == expected.tolist()
+        assert expected.tolist() == np.lexsort((np.arange(168), -scores))[:top_n].tolist()
+
+
+def _windows_naive(scores, hours, agg):
+    f = np.mean if agg == "mean" else np.min
+    return np.array([f(scores[i:i + hours]) for i in range(len(scores) - hours + 1)])
+
+
+@pytest.mark.parametrize("agg", ["mean", "min"])
+@pytest.mark.parametrize("hours", [1, 3, 5])
+def test_window_scores_match_a_naive_rolling_aggregate(agg, hours):
+    scores = np.random.default_rng(hours).integers(0, 100, 48).astype(float)
+    assert np.allclose(window_scores(scores, hours, agg), _windows_naive(scores, hours, agg))
+
+
+def test_window_scores_mask_invalid_hours_and_time_gaps():
+    scores = np.arange(10, dtype=float)
+    valid = np.ones(10, dtype=bool)
+    valid[4] = False
+    times = np.arange(10) * 3600
+    times[7:] += 3600  # hour 7 is missing from the forecast: rows 6 and 7 are 2 h apart
+
+    out = window_scores(scores, 3, valid=valid, times=times)
+
+    # Starts 2..4 touch row 4; starts 5 and 6 span the gap between rows 6 and 7
+    assert np.isneginf(out).tolist() == [False, False, True, True, True, True, True, False]
+    # One-hour windows never span a gap
+    assert np.isfinite(window_scores(scores, 1, times=times)).all()
+
+
+def test_window_scores_reject_bad_arguments():
+    with pytest.raises(ValueError):
+        window_scores(np.zeros(5), 0)
+    with pytest.raises(ValueError):
+        window_scores(np.zeros(5), 2, agg="median")
+    assert len(window_scores(np.zeros(2), 3)) == 0
+
+
+def _greedy_naive(values, hours, top_n):
+    picked = []
+    for start in sorted(range(len(values)), key=lambda i: (-values[i], i)):
+        if np.isfinite(values[start]) and all(abs(start - p) >= hours for p in picked):
+            picked.append(start)
+        if len(picked) == top_n:
+            break
+    return picked
+
+
+@pytest.mark.parametrize("seed", range(10))
+@pytest.mark.parametrize("hours", [1, 2, 4])
+def test_top_session_starts_is_greedy_and_non_overlapping(seed, hours):
+    rng = np.random.default_rng(seed)
+    values = rng.integers(0, 6, 60).astype(float)  # lots of ties
+    values[rng.choice(60, 10, replace=False)] = -np.inf
+
+    starts = top_session_starts(values, hours, top_n=4)
+
+    assert starts.tolist() == _greedy_naive(values, hours, 4)
+    assert all(abs(a - b) >= hours for i, a in enumerate(starts) for b in starts[i + 1:])
+
+
+def test_top_session_starts_skips_masked_windows():
+    values = np.array([-np.inf, 5.0, -np.inf, 4.0])
+    assert top_session_starts(values, 1, top_n=3).tolist() == [1, 3]
+    assert top_session_starts(np.full(4, -np.inf), 2).tolist() == []
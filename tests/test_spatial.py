@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+
+from spatial import SpotIndex
+from utils import haversine_km
+
+
+def _spots(seed: int = 0) -> list[dict]:
+    rng = np.random.default_rng(seed)
+    lat = np.degrees(np.arcsin(rng.uniform(-1, 1, 2000)))  # uniform on the sphere
+    lon = rng.uniform(-180, 180, 2000)
+    # Crowd the awkward places: both poles and either side of the antimeridian
+    lat = np.concatenate([lat, rng.uniform(85, 90, 300), rng.uniform(-90, -85, 300), rng.uniform(-5, 5, 400)])
+    lon = np.concatenate([lon, rng.uniform(-180, 180, 600), rng.choice([-1, 1], 400) * rng.uniform(178, 180, 400)])
+    return [{"name": f"spot-{i}", "lat": float(a), "lon": float(b)} for i, (a, b) in enumerate(zip(lat, lon))]
+
+
+SPOTS = _spots()
+
+
+def _brute_force(spots, lat, lon, k, radius_km):
+    found = [(haversine_km(lat, lon, s["lat"], s["lon"]), i) for i, s in enumerate(spots)]
+    found = sorted(x for x in found if radius_km is None or x[0] <= radius_km)[:k]
+    return [i for _, i in found]
+
+
+QUERIES = [
+    (89.9, 0.0),
+    (90.0, -45.0),
+    (-89.9, 120.0),
+    (-90.0, 0.0),
+    (0.0, 179.95),
+    (0.0, -179.95),
+    (3.0, 180.0),
+    (-3.0, -180.0),
+    (80.0, 179.0),
+    (32.1, 34.75),
+]
+
+
+@pytest.mark.parametrize("cell_deg", [0.5, 2.0])
+@pytest.mark.parametrize("radius_km", [50, 400, 2500, None])
+@pytest.mark.parametrize("lat,lon", QUERIES)
+def test_query_matches_brute_force(lat, lon, radius_km, cell_deg):
+    idx, dist = SpotIndex(SPOTS, cell_deg=cell_deg).query(lat, lon, k=8, radius_km=radius_km)
+
+    assert idx.tolist() == _brute_force(SPOTS, lat, lon, 8, radius_km)
+    assert np.all(np.diff(dist) >= 0)
+
+
+def test_nearest_adds_distances():
+    spots = [{"name": "a", "lat": 0.0, "lon": 179.9}, {"name": "b", "lat": 0.0, "lon": -179.9}]
+    found = SpotIndex(spots).nearest(0.0, 179.95, k=2, radius_km=50)
+    assert [s["name"] for s in found] == ["a", "b"]
+    assert found[0]["distance_km"] == pytest.approx(haversine_km(0.0, 179.95, 0.0, 179.9))
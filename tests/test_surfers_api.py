@@ -0,0 +1,42 @@
+import pytest
+import requests
+
+import http_client
+import surfers_api
+from benchmarks.recorded import FakeResponse, load
+from disk_cache import ForecastCache
+from surfers_api import fetch_surfer_cards, get_wiki_summary_cached
+
+SURFERS = [{"name": "Kelly Slater", "wiki_title": "Kelly Slater", "known_for": "11× World Champion (men)"}]
+
+
+class NotJSON(FakeResponse):
+    def json(self):
+        raise requests.exceptions.JSONDecodeError("Expecting value", "<html>", 0)
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(surfers_api, "THUMB_DIR", tmp_path / "thumbs")
+    return ForecastCache(tmp_path / "wiki_cache.sqlite")
+
+
+def test_non_json_summary_becomes_a_card_error(monkeypatch, cache):
+    monkeypatch.setattr(http_client, "get", lambda url, **kwargs: NotJSON(None))
+
+    cards = fetch_surfer_cards(SURFERS, cache=cache)
+
+    assert cards[0]["error"] and cards[0]["extract"] == "No summary available."
+
+
+def test_unreachable_wikipedia_serves_the_cached_summary(monkeypatch, cache):
+    summary = load("wikipedia_summary")
+    monkeypatch.setattr(http_client, "get", lambda url, **kwargs: FakeResponse(summary, headers={"ETag": "v1"}))
+    get_wiki_summary_cached("Kelly Slater", cache)
+
+    def unreachable(url, **kwargs):
+        raise requests.ConnectionError("no route to host")
+
+    monkeypatch.setattr(http_client, "get", unreachable)
+
+    assert get_wiki_summary_cached("Kelly Slater", cache) == summary
@@ -0,0 +1,91 @@
+import numpy as np
+import pandas as pd
+
+from benchmarks.recorded import extras, load, marine
+from forecast import CompactForecast
+from timeline import EXTRAS_COLUMNS, OBSERVATION_FIELDS, Timeline
+
+
+def _build(extras_json=None, current=None, hours: int = 48) -> Timeline:
+    fc = CompactForecast.from_marine_json(marine(hours), 270)
+    return Timeline.build(fc, extras(hours) if extras_json is None else extras_json,
+                          load("openweather_current") if current is None else current)
+
+
+def test_extras_align_on_the_marine_hours():
+    ex = extras(48)
+    tl = _build(ex)
+
+    assert len(tl) == len(tl.frame) == 48
+    assert tl.frame["uv_index"].tolist() == [float(v) for v in ex["hourly"]["uv_index"]]
+    assert str(tl.frame.index.tz) == ex["timezone"]
+
+
+def test_missing_extras_hours_are_nan():
+    ex = extras(48)
+    hourly = ex["hourly"]
+    # Extras start 5 hours later and skip hour 10 of what's left
+    keep = [i for i in range(5, 48) if i != 15]
+    ex["hourly"] = {k: [v[i] for i in keep] for k, v in hourly.items()}
+    tl = _build(ex)
+
+    uv = tl.frame["uv_index"].to_numpy()
+    assert np.isnan(uv[:5]).all() and np.isnan(uv[15])
+    rest = [i for i in range(48) if i >= 5 and i != 15]
+    assert uv[rest].tolist() == [float(hourly["uv_index"][i]) for i in rest]
+
+
+def test_without_extras():
+    current = load("openweather_current")
+    tl = _build({}, current)
+
+    assert len(tl.frame) == 48
+    assert tl.frame[EXTRAS_COLUMNS].isna().all().all()
+    assert not tl.frame["daylight"].any()
+    assert tl.sun() == (None, None)
+    assert tl.value("uv_index") is None
+    # Marine columns and the observation still line up
+    assert tl.now_position() == tl.position(current["dt"])
+    assert tl.value("wave_height") is not None
+
+
+def test_observation_lands_on_its_hour():
+    current = load("openweather_current")
+    tl = _build(current=current)
+    row = tl.now_position()
+
+    assert row == int(np.searchsorted(tl.epochs, current["dt"], side="right")) - 1
+    obs = tl.frame["obs_temp"].to_numpy()
+    assert obs[row] == current["main"]["temp"]
+    assert np.isnan(np.delete(obs, row)).all()
+
+
+def test_without_current_weather_now_is_the_clock():
+    payload = marine(48)
+    # Move the forecast so that it starts in the current hour
+    local_now = pd.Timestamp.now(tz="UTC").tz_localize(None) + pd.Timedelta(seconds=payload["utc_offset_seconds"])
+    payload["hourly"]["time"] = list(
+        pd.date_range(local_now.floor("h"), periods=48, freq="h").strftime("%Y-%m-%dT%H:%M")
+    )
+    tl = Timeline.build(CompactForecast.from_marine_json(payload, 270), {}, {})
+
+    assert tl.now_position() == 0
+    assert tl.frame[list(OBSERVATION_FIELDS)].isna().all().all()
+
+
+def test_positions_outside_the_forecast_are_none():
+    tl = _build()
+    assert tl.position(int(tl.epochs[0]) - 1) is None
+    assert tl.position(int(tl.epochs[-1]) + 3600) is None
+    assert tl.position(int(tl.epochs[-1]) + 3599) == len(tl) - 1
+    assert tl.at(int(tl.epochs[3]) + 1800)["wave_height"] == tl.frame["wave_height"].iat[3]
+
+
+def test_sun_by_local_day():
+    ex = extras(48)
+    tl = _build(ex)
+    first = int(tl.epochs[0])
+
+    assert tl.sun(first) == (ex["daily"]["sunrise"][0], ex["daily"]["sunset"][0])
+    assert tl.sun(first + 86400) == (ex["daily"]["sunrise"][1], ex["daily"]["sunset"][1])
+    assert tl.sun(first - 1) == (None, None)
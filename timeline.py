@@ -0,0 +1,165 @@
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pandas as pd
+
+from forecast import CompactForecast, daylight_mask
+from metrics import timed
+
+EXTRAS_COLUMNS = [
+    "uv_index",
+    "shortwave_radiation",
+    "visibility",
+    "cloud_cover",
+    "precipitation",
+    "temperature_2m",
+]
+
+# OpenWeather current observation -> column, filled on the hour it was observed in
+OBSERVATION_FIELDS = {
+    "obs_temp": ("main", "temp"),
+    "obs_feels_like": ("main", "feels_like"),
+    "obs_humidity": ("main", "humidity"),
+    "obs_wind_speed": ("wind", "speed"),
+    "obs_wind_deg": ("wind", "deg"),
+}
+
+
+def _utc_epochs(local_strings: list, utc_offset_seconds: int) -> np.ndarray:
+    local = pd.to_datetime(local_strings, format="ISO8601")
+    return np.asarray(local.as_unit("s").asi8, dtype=np.int64) - utc_offset_seconds
+
+
+def _spot_tz(extras: dict, utc_offset_seconds: int):
+    name = extras.get("timezone")
+    if name:
+        try:
+            pd.Timestamp(0, tz=name)
+            return name
+        except (ValueError, KeyError):
+            pass
+    return timezone(timedelta(seconds=utc_offset_seconds))
+
+
+def _to_epoch(when) -> int:
+    """
+    Epoch seconds from epoch seconds, a datetime or a Timestamp (naive means UTC).
+    """
+    if isinstance(when, (int, np.integer, float, np.floating)):
+        return int(when)
+    ts = pd.Timestamp(when)
+    if ts.tzinfo is None:
+        ts = ts.tz_localize("UTC")
+    return int(ts.timestamp())
+
+
+class Timeline:
+    """
+    Marine forecast, Open-Meteo extras and the OpenWeather observation joined on one
+    hourly, tz-aware index (the spot's timezone), built once per fetch.
+
+    Rows follow the marine hours, so row i is CompactForecast row i and score arrays
+    line up with the frame; extras hours are aligned onto them (NaN where missing).
+    Lookups by time are a binary search over the sorted epochs: O(log n).
+    """
+
+    def __init__(self, frame: pd.DataFrame, epochs: np.ndarray, current: dict,
+                 sunrise: list[str], sunset: list[str], day_starts: np.ndarray):
+        self.frame = frame
+        self.epochs = epochs
+        self.current = current
+        self._sunrise = sunrise
+        self._sunset = sunset
+        self._day_starts = day_starts
+
+    @classmethod
+    @timed("derive.timeline")
+    def build(cls, marine_fc: CompactForecast, extras: dict, current: dict) -> "Timeline":
+        epochs = marine_fc.time
+        frame = marine_fc.to_df()
+
+        eh = extras.get("hourly", {})
+        e_offset = int(extras.get("utc_offset_seconds", marine_fc.utc_offset_seconds) or 0)
+        e_epochs = _utc_epochs(eh.get("time", []), e_offset)
+        order = np.argsort(e_epochs, kind="stable")
+        e_epochs = e_epochs[order]
+        pos = np.minimum(np.searchsorted(e_epochs, epochs), max(len(e_epochs) - 1, 0))
+        matched = (e_epochs[pos] == epochs) if len(e_epochs) else np.zeros(len(epochs), dtype=bool)
+        for col in EXTRAS_COLUMNS:
+            values = np.asarray(eh.get(col, [None] * len(e_epochs)), dtype=float)[order]
+            frame[col] = np.where(matched, values[pos], np.nan) if len(values) else np.nan
+
+        frame["daylight"] = daylight_mask(marine_fc.local_time, extras)
+
+        obs_row = cls._position(epochs, current.get("dt"))
+        for col, (group, field) in OBSERVATION_FIELDS.items():
+            values = np.full(len(epochs), np.nan)
+            value = current.get(group, {}).get(field)
+            if obs_row is not None and value is not None:
+                values[obs_row] = value
+            frame[col] = values
+
+        tz = _spot_tz(extras, marine_fc.utc_offset_seconds)
+        frame.index = pd.DatetimeIndex(pd.to_datetime(epochs, unit="s", utc=True).tz_convert(tz), name="timestamp")
+
+        daily = extras.get("daily", {})
+        day_starts = _utc_epochs(daily.get("time", []), e_offset)
+        return cls(frame, epochs, current, daily.get("sunrise", []), daily.get("sunset", []), day_starts)
+
+    def __len__(self) -> int:
+        return len(self.epochs)
+
+    @property
+    def nbytes(self) -> int:
+        return int(self.frame.memory_usage(deep=True).sum()) + self.epochs.nbytes
+
+    @staticmethod
+    def _position(epochs: np.ndarray, when) -> int | None:
+        if when is None or not len(epochs):
+            return None
+        t = _to_epoch(when)
+        i = int(np.searchsorted(epochs, t, side="right")) - 1
+        # Inside the hour that starts at epochs[i]
+        if i < 0 or t >= epochs[i] + 3600:
+            return None
+        return i
+
+    def position(self, when) -> int | None:
+        """
+        Row of the hour containing `when`, or None outside the forecast.
+        """
+        return self._position(self.epochs, when)
+
+    def now_position(self) -> int | None:
+        """
+        Row of the hour containing the OpenWeather observation time (falls back to the clock).
+        """
+        return self.position(self.current.get("dt") or datetime.now(timezone.utc))
+
+    def at(self, when) -> dict | None:
+        i = self.position(when)
+        return None if i is None else self.frame.iloc[i].to_dict()
+
+    def now(self) -> dict | None:
+        i = self.now_position()
+        return None if i is None else self.frame.iloc[i].to_dict()
+
+    def value(self, column: str, when=None):
+        """
+        One value at `when` (default: now); None if out of range or missing.
+        """
+        i = self.now_position() if when is None else self.position(when)
+        if i is None:
+            return None
+        v = self.frame[column].iat[i]
+        return None if pd.isna(v) else v
+
+    def sun(self, when=None) -> tuple[str | None, str | None]:
+        """
+        (sunrise, sunset) of the local day containing `when` (default: now), as provided.
+        """
+        t = _to_epoch(self.current.get("dt") or datetime.now(timezone.utc)) if when is None else _to_epoch(when)
+        d = int(np.searchsorted(self._day_starts, t, side="right")) - 1
+        if d < 0 or d >= min(len(self._sunrise), len(self._sunset)) or t >= self._day_starts[d] + 86400:
+            return None, None
+        return self._sunrise[d], self._sunset[d]
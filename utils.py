@@ -2,6 +2,14 @@ from __future__ import annotations
 from datetime import datetime, timezone, timedelta
 import math
 
+import numpy as np
+
+COMPASS_POINTS = ["N","NNE","NE","ENE","E","ESE","SE","SSE","S","SSW","SW","WSW","W","WNW","NW","NNW"]
+
+# Codes returned by wind_relation_codes, index into these label lists
+WIND_RELATIONS = ["Offshore", "Cross", "Onshore"]
+WIND_RELATION_COLORS = ["🟢", "🟡", "🔴"]
+
 def israel_time_now() -> str:
     tz_israel = timezone(timedelta(hours=3))  # UTC+3 (good enough for project)
     return datetime.now(tz_israel).strftime("%A, %d %b %Y • %H:%M")
@@ -11,9 +19,16 @@ def time_from_utc_offset(offset_seconds: int) -> str:
     return datetime.now(tz).strftime("%A, %d %b %Y • %H:%M")
 
 def deg_to_compass(deg: float) -> str:
-    directions = ["N","NNE","NE","ENE","E","ESE","SE","SSE","S","SSW","SW","WSW","W","WNW","NW","NNW"]
     ix = int((deg % 360) / 22.5)
-    return directions[ix]
+    return COMPASS_POINTS[ix]
+
+def compass_codes(deg) -> np.ndarray:
+    """
+    Vectorized deg_to_compass: index into COMPASS_POINTS per degree, -1 where deg is NaN.
+    """
+    deg = np.asarray(deg, dtype=float)
+    ix = np.floor(np.mod(deg, 360) / 22.5)
+    return np.where(np.isnan(ix), -1, ix % 16).astype(np.int8)
 
 def safe_float(x, default=None):
     try:
@@ -21,6 +36,12 @@ def safe_float(x, default=None):
     except Exception:
         return default
 
+def snap(value: float, grid: float) -> float:
+    """
+    Round a coordinate to the nearest multiple of `grid` degrees.
+    """
+    return round(round(value / grid) * grid, 6)
+
 def haversine_km(lat1, lon1, lat2, lon2) -> float:
     R = 6371.0
     p1, p2 = math.radians(lat1), math.radians(lat2)
@@ -29,6 +50,17 @@ def haversine_km(lat1, lon1, lat2, lon2) -> float:
     a = math.sin(dphi/2)**2 + math.cos(p1)*math.cos(p2)*math.sin(dl/2)**2
     return 2 * R * math.asin(math.sqrt(a))
 
+def haversine_km_array(lat1, lon1, lat2, lon2) -> np.ndarray:
+    """
+    Vectorized haversine_km; arguments broadcast like NumPy arrays.
+    """
+    R = 6371.0
+    p1, p2 = np.radians(lat1), np.radians(lat2)
+    dphi = p2 - p1
+    dl = np.radians(np.asarray(lon2) - np.asarray(lon1))
+    a = np.sin(dphi / 2) ** 2 + np.cos(p1) * np.cos(p2) * np.sin(dl / 2) ** 2
+    return 2 * R * np.arcsin(np.sqrt(np.clip(a, 0, 1)))
+
 def _angle_diff(a: float, b: float) -> float:
     d = (a - b) % 360
     return min(d, 360 - d)
@@ -45,3 +77,22 @@ def wind_relation_to_beach(wind_from_deg: float, beach_facing_deg: float) -> tup
     if d_on <= 45:
         return "Onshore", "🔴"
     return "Cross", "🟡"
+
+def wind_relation_codes(wind_from_deg, beach_facing_deg: float) -> np.ndarray:
+    """
+    Vectorized wind_relation_to_beach: index into WIND_RELATIONS, -1 where the wind is NaN.
+    """
+    wind = np.asarray(wind_from_deg, dtype=float)
+
+    def diff(target):
+        d = np.mod(wind - target, 360)
+        return np.minimum(d, 360 - d)
+
+    d_off = diff((beach_facing_deg + 180) % 360)
+    d_on = diff(beach_facing_deg % 360)
+
+    codes = np.where(d_off <= 45, 0, np.where(d_on <= 45, 2, 1))
+    return np.where(np.isnan(wind), -1, codes).astype(np.int8)
+
+def chunked(items: list, size: int) -> list[list]:
+    return [items[i:i + size] for i in range(0, len(items), size)]
@@ -1,13 +1,19 @@
-import requests
+import os
 
-BASE_CURRENT = "https://api.openweathermap.org/data/2.5/weather"
-BASE_GEO = "https://api.openweathermap.org/geo/1.0/direct"
+import http_client
+from metrics import timed
+
+# Override with OPENWEATHER_BASE_URL to point at a mirror or benchmarks.mock_server
+OPENWEATHER_BASE_URL = os.environ.get("OPENWEATHER_BASE_URL", "https://api.openweathermap.org").rstrip("/")
+BASE_CURRENT = f"{OPENWEATHER_BASE_URL}/data/2.5/weather"
+BASE_GEO = f"{OPENWEATHER_BASE_URL}/geo/1.0/direct"
 
 
 class WeatherAPIError(Exception):
     pass
 
 
+@timed("api.openweather.geocode")
 def geocode_city(city: str, api_key: str, limit: int = 5) -> list[dict]:
     """
     Convert city name -> list of possible locations with lat/lon
@@ -17,11 +23,12 @@ def geocode_city(city: str, api_key: str, limit: int = 5) -> list[dict]:
         "appid": api_key,
         "limit": limit,
     }
-    r = requests.get(BASE_GEO, params=params, timeout=15)
+    r = http_client.get(BASE_GEO, params=params, timeout=15)
     r.raise_for_status()
     return r.json()
 
 
+@timed("api.openweather.current")
 def get_current_by_city(city: str, api_key: str, units: str = "metric") -> dict:
     """
     Current weather by city name
@@ -31,13 +38,14 @@ def get_current_by_city(city: str, api_key: str, units: str = "metric") -> dict:
         "appid": api_key,
         "units": units,
     }
-    r = requests.get(BASE_CURRENT, params=params, timeout=15)
+    r = http_client.get(BASE_CURRENT, params=params, timeout=15)
     data = r.json()
     if str(data.get("cod")) != "200":
         raise WeatherAPIError(data.get("message", "Weather API error"))
     return data
 
 
+@timed("api.openweather.current")
 def get_current_by_coords(lat: float, lon: float, api_key: str, units: str = "metric") -> dict:
     """
     Current weather by latitude / longitude
@@ -48,7 +56,7 @@ def get_current_by_coords(lat: float, lon: float, api_key: str, units: str = "me
         "appid": api_key,
         "units": units,
     }
-    r = requests.get(BASE_CURRENT, params=params, timeout=15)
+    r = http_client.get(BASE_CURRENT, params=params, timeout=15)
     data = r.json()
     if str(data.get("cod")) != "200":
         raise WeatherAPIError(data.get("message", "Weather API error"))